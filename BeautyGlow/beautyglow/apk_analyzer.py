@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+APK Content Size Analyzer for BeautyGlow
+Breaks an APK down by category (launcher icons, tip images, native libs, dex...)
+in compressed and uncompressed bytes and diffs it against the previous build
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import zipfile
+
+DEFAULT_APK_PATH = "build/app/outputs/flutter-apk/app-debug.apk"
+DEFAULT_BREAKDOWN_PATH = os.path.join('.icon_cache', 'apk_breakdown.json')
+DEFAULT_TOP = 10
+
+# Entry name patterns of each category; the first match wins
+CATEGORIES = [
+    ('launcher icons', ['res/mipmap-*']),
+    ('drawables', ['res/drawable*']),
+    ('other resources', ['res/*', 'resources.arsc']),
+    ('tip images', ['assets/flutter_assets/assets/images/tips/*']),
+    ('app images', ['assets/flutter_assets/assets/images/*']),
+    ('flutter assets', ['assets/flutter_assets/*']),
+    ('native libs', ['lib/*']),
+    ('dex', ['*.dex']),
+    ('signature', ['META-INF/*']),
+]
+OTHER_CATEGORY = 'other'
+
+KB = 1024
+
+
+def categorize(name):
+    """Category of an APK entry name"""
+    for category, patterns in CATEGORIES:
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+            return category
+    return OTHER_CATEGORY
+
+
+def analyze_apk(apk_path):
+    """Return the size breakdown of an APK (or any zip) as a JSON-serializable dict"""
+    categories = {}
+    entries = {}
+    with zipfile.ZipFile(apk_path) as apk:
+        for info in apk.infolist():
+            if info.is_dir():
+                continue
+            entries[info.filename] = [info.compress_size, info.file_size]
+            stats = categories.setdefault(categorize(info.filename),
+                                          {'files': 0, 'compressed': 0, 'uncompressed': 0})
+            stats['files'] += 1
+            stats['compressed'] += info.compress_size
+            stats['uncompressed'] += info.file_size
+    return {
+        'path': apk_path,
+        'size': os.path.getsize(apk_path),
+        'compressed': sum(stats['compressed'] for stats in categories.values()),
+        'uncompressed': sum(stats['uncompressed'] for stats in categories.values()),
+        'categories': categories,
+        'entries': entries,
+    }
+
+
+def load_breakdown(path):
+    """Load a breakdown saved as JSON, or analyze an APK; None if unavailable"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        if zipfile.is_zipfile(path):
+            return analyze_apk(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"⚠️ Could not read previous breakdown {path}: {e}")
+        return None
+
+
+def save_breakdown(breakdown, path):
+    """Save a breakdown as JSON for the next build to diff against"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(breakdown, f, indent=2, sort_keys=True)
+
+
+def _kb(size):
+    return f"{size / KB:,.1f} KB"
+
+
+def _category_order(category):
+    names = [name for name, _ in CATEGORIES] + [OTHER_CATEGORY]
+    return names.index(category) if category in names else len(names)
+
+
+def print_breakdown(breakdown, top=DEFAULT_TOP):
+    """Print the per-category sizes and the largest entries"""
+    print(f"\n📦 APK contents: {breakdown['path']}")
+    print(f"   File size {_kb(breakdown['size'])}, {len(breakdown['entries'])} entries, "
+          f"{_kb(breakdown['compressed'])} compressed / {_kb(breakdown['uncompressed'])} uncompressed")
+    print(f"   {'Category':<16} {'Files':>6} {'Compressed':>14} {'Uncompressed':>14} {'Share':>7}")
+    for category in sorted(breakdown['categories'], key=_category_order):
+        stats = breakdown['categories'][category]
+        share = stats['compressed'] / breakdown['compressed'] * 100 if breakdown['compressed'] else 0.0
+        print(f"   {category:<16} {stats['files']:>6} {_kb(stats['compressed']):>14} "
+              f"{_kb(stats['uncompressed']):>14} {share:>6.1f}%")
+
+    largest = sorted(breakdown['entries'].items(), key=lambda item: -item[1][0])[:top]
+    if largest:
+        print(f"\n   Largest {len(largest)} entries (compressed):")
+        for name, (compressed, uncompressed) in largest:
+            print(f"   {_kb(compressed):>14} {_kb(uncompressed):>14}  {name}")
+
+
+def print_diff(previous, current, top=DEFAULT_TOP):
+    """Print how each category and the most changed entries moved since previous"""
+    change = current['compressed'] - previous['compressed']
+    print(f"\n📊 Compared with previous build: {'+' if change >= 0 else '-'}{_kb(abs(change))} compressed")
+    categories = set(previous['categories']) | set(current['categories'])
+    for category in sorted(categories, key=_category_order):
+        before = previous['categories'].get(category, {}).get('compressed', 0)
+        after = current['categories'].get(category, {}).get('compressed', 0)
+        if before != after:
+            print(f"   {category:<16} {_kb(before):>14} → {_kb(after):>14}  "
+                  f"({'+' if after >= before else '-'}{_kb(abs(after - before))})")
+
+    names = set(previous['entries']) | set(current['entries'])
+    changes = []
+    for name in names:
+        before = previous['entries'].get(name, [0, 0])[0]
+        after = current['entries'].get(name, [0, 0])[0]
+        if before != after:
+            changes.append((after - before, name, name not in previous['entries'],
+                            name not in current['entries']))
+    if not changes:
+        print("   No entries changed size")
+        return
+    print("   Most changed entries:")
+    for delta, name, added, removed in sorted(changes, key=lambda item: -abs(item[0]))[:top]:
+        note = ' (new)' if added else (' (removed)' if removed else '')
+        print(f"   {'+' if delta >= 0 else '-'}{_kb(abs(delta)):>13}  {name}{note}")
+
+
+def report_apk(apk_path, breakdown_path=DEFAULT_BREAKDOWN_PATH, top=DEFAULT_TOP, against=None, save=True):
+    """Analyze an APK, diff it against the previous breakdown and save the new one"""
+    try:
+        breakdown = analyze_apk(apk_path)
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f"❌ Could not analyze {apk_path}: {e}")
+        return None
+
+    previous = load_breakdown(against or breakdown_path)
+    print_breakdown(breakdown, top)
+    if previous:
+        print_diff(previous, breakdown, top)
+    if save:
+        save_breakdown(breakdown, breakdown_path)
+    return breakdown
+
+
+def add_apk_arguments(parser):
+    """Add the APK analysis options to an argparse parser"""
+    parser.add_argument('--apk-top', type=int, default=DEFAULT_TOP,
+                        help='Number of largest APK entries to list')
+    parser.add_argument('--no-apk-analysis', action='store_true',
+                        help='Skip the APK content breakdown after the build')
+
+
+def main():
+    """Break down an APK and diff it against the previous build"""
+    parser = argparse.ArgumentParser(description="Analyze the contents of a BeautyGlow APK")
+    parser.add_argument('apk', nargs='?', default=DEFAULT_APK_PATH, help='APK (or any zip) to analyze')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='Number of largest entries to list')
+    parser.add_argument('--against', metavar='PATH',
+                        help='APK or saved JSON breakdown to diff against (default: previous build)')
+    parser.add_argument('--breakdown', default=DEFAULT_BREAKDOWN_PATH,
+                        help='JSON file holding the previous build breakdown')
+    parser.add_argument('--no-save', action='store_true',
+                        help='Do not replace the saved breakdown with this one')
+    args = parser.parse_args()
+
+    print("🔍 BeautyGlow APK Analyzer")
+    print("=" * 50)
+    if not os.path.exists(args.apk):
+        print(f"❌ APK not found: {args.apk}")
+        return 1
+    breakdown = report_apk(args.apk, args.breakdown, max(0, args.top), args.against, not args.no_save)
+    return 0 if breakdown else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
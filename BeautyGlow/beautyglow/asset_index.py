@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Asset Reference Index for BeautyGlow
+Scans the Dart sources for asset paths and image name lists, cross-references
+them with the assets pubspec.yaml bundles and reports unused and missing files
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+
+DEFAULT_INDEX_PATH = os.path.join('.icon_cache', 'asset_index.json')
+INDEX_VERSION = 1
+
+DART_DIR = 'lib'
+ASSET_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif', '.svg', '.json', '.ttf', '.otf')
+
+# Dart string literals and comments, so quotes inside comments or ''' blocks are not misread
+DART_TOKEN = re.compile(
+    r"'''.*?'''|\"\"\".*?\"\"\"|'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\"|//[^\n]*|/\*.*?\*/",
+    re.DOTALL)
+# A string assigned to a named constant or variable: const String _basePath = '...'
+CONSTANT_ASSIGNMENT = re.compile(r"(?:const|final)\s+(?:String\s+)?(\w+)\s*=\s*$")
+INTERPOLATION = re.compile(r"\$\{(\w+)\}|\$(\w+)")
+BARE_NAME = re.compile(r"^[\w\-. ]+$")
+
+
+def pubspec_asset_paths(pubspec_path='pubspec.yaml'):
+    """Asset files and directories listed under flutter: assets: in pubspec.yaml"""
+    paths = []
+    section = None
+    try:
+        with open(pubspec_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return paths
+
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        indent = len(line) - len(line.lstrip())
+        if indent == 0:
+            section = 'flutter' if stripped == 'flutter:' else None
+        elif section == 'flutter' and stripped == 'assets:':
+            section = 'assets'
+        elif section == 'assets':
+            if stripped.startswith('- '):
+                paths.append(stripped[2:].strip().strip('\'"'))
+            else:
+                section = 'flutter'
+    return paths
+
+
+def bundled_assets(root='.'):
+    """{path: bytes} of every file pubspec.yaml bundles (directory entries are not recursive)"""
+    assets = {}
+    for entry in pubspec_asset_paths(os.path.join(root, 'pubspec.yaml')):
+        full_path = os.path.join(root, entry)
+        if entry.endswith('/'):
+            if not os.path.isdir(full_path):
+                continue
+            with os.scandir(full_path) as entries:
+                for item in entries:
+                    if item.is_file() and not item.name.startswith('.'):
+                        assets[entry + item.name] = item.stat().st_size
+        elif os.path.isfile(full_path):
+            assets[entry] = os.path.getsize(full_path)
+    return assets
+
+
+def scan_dart_file(path):
+    """String literals (line, value) and string constants of one Dart file"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        source = f.read()
+
+    strings = []
+    constants = {}
+    for match in DART_TOKEN.finditer(source):
+        token = match.group(0)
+        if token.startswith('/') or token[:3] in ("'''", '"""'):
+            continue
+        value = token[1:-1]
+        strings.append([source.count('\n', 0, match.start()) + 1, value])
+        assignment = CONSTANT_ASSIGNMENT.search(source, max(0, match.start() - 200), match.start())
+        if assignment:
+            constants[assignment.group(1)] = value
+    return {'strings': strings, 'constants': constants}
+
+
+class AssetIndex:
+    """Per-file scan results of the Dart sources, cached by mtime and size"""
+
+    def __init__(self, index_path=DEFAULT_INDEX_PATH):
+        self.index_path = index_path
+        self.files = self._load()
+        self.scanned = 0
+        self.reused = 0
+
+    def _load(self):
+        if not self.index_path:
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return index.get('files', {}) if index.get('version') == INDEX_VERSION else {}
+
+    def update(self, dart_dir):
+        """Rescan the Dart files changed since the last run and drop deleted ones"""
+        seen = set()
+        for directory, dirs, names in os.walk(dart_dir):
+            dirs.sort()
+            for name in sorted(names):
+                if not name.endswith('.dart'):
+                    continue
+                path = os.path.join(directory, name)
+                seen.add(path)
+                stat = os.stat(path)
+                entry = self.files.get(path)
+                if entry and (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+                    self.reused += 1
+                    continue
+                self.files[path] = dict(scan_dart_file(path), mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                self.scanned += 1
+        for path in set(self.files) - seen:
+            del self.files[path]
+
+    def save(self):
+        """Persist the per-file results for the next scan"""
+        if not self.index_path:
+            return
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f)
+        os.replace(tmp_path, self.index_path)
+
+
+def _resolve(value, constants, depth=0):
+    """Substitute known string constants; unknown interpolations are left in place"""
+    def substitute(match):
+        name = match.group(1) or match.group(2)
+        if name in constants and depth < 8:
+            return _resolve(constants[name], constants, depth + 1)
+        return match.group(0)
+    return INTERPOLATION.sub(substitute, value)
+
+
+def collect_references(files, root='.'):
+    """Return ({asset path: [file:line]}, dynamic prefixes) found in the scanned Dart files
+
+    Fully resolved literals under a bundled top-level directory are direct
+    references. A literal with an unresolved interpolation, like
+    'assets/images/tips/$imageName', contributes its prefix; bare file names
+    (such as the image name lists) resolve against those prefixes.
+    """
+    global_constants = {}
+    for entry in files.values():
+        global_constants.update(entry['constants'])
+
+    references = {}
+    prefixes = set()
+    bare_names = []
+    for path, entry in sorted(files.items()):
+        constants = dict(global_constants, **entry['constants'])
+        for line, value in entry['strings']:
+            location = f"{os.path.relpath(path, root)}:{line}"
+            resolved = _resolve(value, constants)
+            dynamic = INTERPOLATION.search(resolved)
+            if dynamic:
+                prefix = resolved[:dynamic.start()]
+                if prefix.startswith('assets/') and prefix.endswith('/'):
+                    prefixes.add(prefix)
+            elif resolved.startswith('assets/') and resolved.lower().endswith(ASSET_EXTENSIONS):
+                references.setdefault(resolved, []).append(location)
+            elif BARE_NAME.match(resolved) and resolved.lower().endswith(ASSET_EXTENSIONS):
+                bare_names.append((resolved, location))
+
+    ordered_prefixes = sorted(prefixes)
+    for name, location in bare_names:
+        candidates = [prefix + name for prefix in ordered_prefixes]
+        existing = [candidate for candidate in candidates
+                    if os.path.exists(os.path.join(root, candidate))]
+        for candidate in existing or candidates[:1]:
+            references.setdefault(candidate, []).append(location)
+    return references, ordered_prefixes
+
+
+def build_report(root='.', index_path=DEFAULT_INDEX_PATH):
+    """Cross-reference the Dart sources with the bundled assets of a project"""
+    index = AssetIndex(index_path)
+    index.update(os.path.join(root, DART_DIR))
+    index.save()
+
+    bundled = bundled_assets(root)
+    references, prefixes = collect_references(index.files, root)
+    unused = {path: size for path, size in bundled.items() if path not in references}
+    missing = {path: locations for path, locations in references.items()
+               if not os.path.exists(os.path.join(root, path))}
+    undeclared = sorted(path for path in references
+                        if path not in bundled and path not in missing)
+    return {
+        'root': root,
+        'dart_files': len(index.files),
+        'scanned': index.scanned,
+        'reused': index.reused,
+        'prefixes': prefixes,
+        'bundled': len(bundled),
+        'bundled_bytes': sum(bundled.values()),
+        'referenced': len(references),
+        'unused': dict(sorted(unused.items(), key=lambda item: -item[1])),
+        'unused_bytes': sum(unused.values()),
+        'missing': dict(sorted(missing.items())),
+        'undeclared': undeclared,
+    }
+
+
+def print_report(report, limit=None):
+    """Print unused assets with the bytes they waste and references to missing files"""
+    print(f"\n📂 Dart files: {report['dart_files']} ({report['scanned']} scanned, "
+          f"{report['reused']} reused from the index)")
+    if report['prefixes']:
+        print(f"   Dynamic asset prefixes: {', '.join(report['prefixes'])}")
+
+    unused = list(report['unused'].items())
+    print(f"\n🗑️ Unreferenced assets: {len(unused)} of {report['bundled']} bundled, "
+          f"{report['unused_bytes'] / 1024:,.1f} KB shipped for nothing")
+    for path, size in unused[:limit]:
+        print(f"   {size / 1024:>10,.1f} KB  {path}")
+    if limit is not None and len(unused) > limit:
+        print(f"   ... and {len(unused) - limit} more")
+
+    print(f"\n❌ References to missing files: {len(report['missing'])}")
+    for path, locations in report['missing'].items():
+        more = f" (+{len(locations) - 1} more)" if len(locations) > 1 else ''
+        print(f"   {path}  ← {locations[0]}{more}")
+
+    if report['undeclared']:
+        print(f"\n⚠️ Referenced but not bundled by pubspec.yaml: {len(report['undeclared'])}")
+        for path in report['undeclared']:
+            print(f"   {path}")
+
+
+def main():
+    """Report unused and missing assets of a Flutter project"""
+    parser = argparse.ArgumentParser(description="Find unused and missing BeautyGlow assets")
+    parser.add_argument('--root', default='.', help='Flutter project root')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help='Cached index of the Dart sources')
+    parser.add_argument('--no-cache', action='store_true', help='Rescan every Dart file')
+    parser.add_argument('--limit', type=int, default=25, help='Unreferenced assets to list')
+    parser.add_argument('--json', metavar='PATH', help='Write the full report to this JSON file')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with status 1 if any reference points to a missing file')
+    args = parser.parse_args()
+
+    print("🔎 BeautyGlow Asset Reference Check")
+    print("=" * 50)
+    start = time.perf_counter()
+    index_path = None if args.no_cache else os.path.join(args.root, args.index)
+    report = build_report(args.root, index_path)
+    print_report(report, max(0, args.limit))
+    print(f"\n⏱️ Indexed in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"   Report: {args.json}")
+    return 1 if args.check and report['missing'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+BeautyGlow Asset Tooling Command Line
+One entry point for every asset script; a subcommand imports its module (and
+Pillow, if it needs it) only when it runs, so quick commands start fast
+"""
+
+import importlib
+import sys
+
+PROG = 'beautyglow-assets'
+
+# Subcommand -> (module whose main() it runs, one-line description)
+COMMANDS = {
+    'icons': ('update_app_icons', 'Update app icons on every platform'),
+    'launcher': ('update_launcher_icons', 'Update the Android launcher and adaptive icons'),
+    'clean-icons': ('update_clean_icons', 'Update icons with the sharpened, clean rendering'),
+    'graph': ('icon_graph', 'Build icon targets from the declarative manifest'),
+    'batch': ('icon_batch', 'Build the icons of every Flutter app in the repository'),
+    'watch': ('icon_watch', 'Regenerate icons whenever the source image changes'),
+    'fix-refs': ('fix_icon_references', 'Point Android XML icon references at the mipmaps'),
+    'snapshot': ('icon_snapshot', 'Back up, restore and prune icon snapshots'),
+    'verify': ('icon_verify', 'Check the size of every generated icon'),
+    'assets': ('asset_index', 'Find unused and missing assets'),
+    'rebuild': ('clean_and_rebuild', 'Clean and rebuild the Flutter project'),
+    'apk': ('apk_analyzer', 'Break down the contents of the built APK'),
+    'metrics': ('build_metrics', 'Show the build metrics history'),
+    'benchmark': ('icon_benchmark', 'Benchmark the icon tooling'),
+}
+
+# Third-party modules a command may need, and the package that provides them
+REQUIREMENTS = {'PIL': 'Pillow'}
+
+# Exit status when a required package is missing (update_icons.sh installs
+# requirements.txt and retries on it, instead of probing with a separate python)
+MISSING_DEPENDENCY = 3
+
+
+def print_usage():
+    """List the subcommands without importing any of them"""
+    print(f"usage: {PROG} <command> [options]\n")
+    print("BeautyGlow asset tooling. Commands:")
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:<12} {description}")
+    print(f"\nRun '{PROG} <command> --help' for the options of a command.")
+
+
+def load_command(name):
+    """Import the module behind a subcommand and return its main function"""
+    module_name, _ = COMMANDS[name]
+    return importlib.import_module(module_name).main
+
+
+def run_command(name, argv):
+    """Run a subcommand with its own arguments and return its exit status"""
+    try:
+        command = load_command(name)
+    except ModuleNotFoundError as e:
+        package = REQUIREMENTS.get((e.name or '').split('.')[0])
+        if package is None:
+            raise
+        print(f"❌ '{name}' needs {package}, which is not installed")
+        print("   Install it with: pip3 install -r requirements.txt")
+        return MISSING_DEPENDENCY
+
+    # Each script parses sys.argv itself; its usage line shows the subcommand
+    sys.argv = [f"{PROG} {name}"] + argv
+    status = command()
+    return status if isinstance(status, int) else 0
+
+
+def main(argv=None):
+    """Dispatch to a subcommand"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        print_usage()
+        return 0
+    if argv[0] not in COMMANDS:
+        print(f"❌ Unknown command '{argv[0]}'\n")
+        print_usage()
+        return 2
+    return run_command(argv[0], argv[1:])
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
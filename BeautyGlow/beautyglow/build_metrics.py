@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Build Metrics History for BeautyGlow
+Stores step durations, APK size, asset sizes and the git revision of every
+rebuild in a local SQLite database and reports trends and regressions
+"""
+
+import argparse
+import os
+import sqlite3
+import subprocess
+import time
+
+DEFAULT_DB_PATH = os.path.join('.icon_cache', 'build_metrics.sqlite')
+DEFAULT_LIMIT = 20
+
+# A run is flagged when its wall time grew by more than this fraction...
+DEFAULT_TIME_THRESHOLD = 0.30
+# ...by at least this many seconds (filters out noise on very short runs)...
+DEFAULT_MIN_DELTA = 5.0
+# ...or its APK grew by more than this many megabytes, compared with the previous run
+DEFAULT_SIZE_THRESHOLD_MB = 1.0
+
+MB = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    revision TEXT,
+    mode TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    wall_time REAL NOT NULL,
+    apk_size INTEGER
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    step TEXT NOT NULL,
+    duration REAL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assets (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    files INTEGER NOT NULL
+);
+"""
+
+
+def connect(db_path=DEFAULT_DB_PATH):
+    """Open the metrics database, creating it and its tables if needed"""
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def git_revision():
+    """Short git revision of the working tree, marked '+dirty' with local changes"""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{revision}+dirty" if status.strip() else revision
+
+
+def path_size(path):
+    """Total bytes and file count of a file or directory tree"""
+    if os.path.isfile(path):
+        return os.path.getsize(path), 1
+    size = files = 0
+    for directory, _, names in os.walk(path):
+        for name in names:
+            try:
+                size += os.path.getsize(os.path.join(directory, name))
+                files += 1
+            except OSError:
+                pass
+    return size, files
+
+
+def step_ok(results, step):
+    """True if a step ran and succeeded"""
+    return bool(results.get(step) and results[step]['ok'])
+
+
+def record_run(db_path, mode, results, wall_time, apk_path=None, asset_paths=(),
+               required=None, apk_step=None):
+    """Store one rebuild: step results ({step: result dict or None}), APK and asset sizes
+
+    The run counts as ok when the required steps (default: all) succeeded; the
+    APK size is recorded whenever apk_step (default: the whole run) succeeded,
+    so a failed optional clean step does not drop it from the size trend.
+    """
+    ok = all(step_ok(results, step) for step in (results if required is None else required))
+    built = step_ok(results, apk_step) if apk_step else ok
+    apk_size = os.path.getsize(apk_path) if built and apk_path and os.path.exists(apk_path) else None
+
+    connection = connect(db_path)
+    with connection:
+        run_id = connection.execute(
+            "INSERT INTO runs (started_at, revision, mode, ok, wall_time, apk_size) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (time.time() - wall_time, git_revision(), mode, int(ok), wall_time, apk_size)
+        ).lastrowid
+        for step, result in results.items():
+            if result is None:
+                status, duration = 'skipped', None
+            else:
+                status = 'ok' if result['ok'] else ('timed out' if result['timed_out'] else 'failed')
+                duration = result['duration']
+            connection.execute("INSERT INTO steps (run_id, step, duration, status) VALUES (?, ?, ?, ?)",
+                               (run_id, step, duration, status))
+        for path in asset_paths:
+            if os.path.exists(path):
+                size, files = path_size(path)
+                connection.execute("INSERT INTO assets (run_id, path, size, files) VALUES (?, ?, ?, ?)",
+                                   (run_id, path, size, files))
+    connection.close()
+    return run_id
+
+
+def load_runs(db_path=DEFAULT_DB_PATH, limit=DEFAULT_LIMIT):
+    """The most recent runs, oldest first, each with its step durations and asset total"""
+    connection = connect(db_path)
+    connection.row_factory = sqlite3.Row
+    runs = [dict(row) for row in connection.execute(
+        "SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,))][::-1]
+    for run in runs:
+        run['steps'] = {row['step']: row['duration'] for row in connection.execute(
+            "SELECT step, duration FROM steps WHERE run_id = ?", (run['id'],))}
+        run['asset_size'] = connection.execute(
+            "SELECT SUM(size) FROM assets WHERE run_id = ?", (run['id'],)).fetchone()[0]
+    connection.close()
+    return runs
+
+
+def flag_runs(runs, time_threshold=DEFAULT_TIME_THRESHOLD, size_threshold_mb=DEFAULT_SIZE_THRESHOLD_MB,
+              min_delta=DEFAULT_MIN_DELTA):
+    """Return {run id: [reasons]} for runs slower or larger than the previous comparable run
+
+    Wall time is compared with the previous successful run of the same mode
+    that ran the same steps, since incremental and full rebuilds, or a run
+    that skipped the clean, take very different times. APK size is compared
+    with the previous run that produced an APK.
+    """
+    flags = {}
+    last_time = {}
+    last_size = None
+    for run in runs:
+        reasons = []
+        if run['ok']:
+            comparable = (run['mode'], frozenset(step for step, duration in run['steps'].items()
+                                                 if duration is not None))
+            previous = last_time.get(comparable)
+            growth = run['wall_time'] - (previous or 0)
+            if previous and growth / previous > time_threshold and growth > min_delta:
+                reasons.append(f"build time +{growth / previous * 100:.0f}%")
+            last_time[comparable] = run['wall_time']
+        if run['apk_size'] is not None:
+            if last_size is not None and (run['apk_size'] - last_size) / MB > size_threshold_mb:
+                reasons.append(f"APK +{(run['apk_size'] - last_size) / MB:.2f} MB")
+            last_size = run['apk_size']
+        if reasons:
+            flags[run['id']] = reasons
+    return flags
+
+
+def _megabytes(size):
+    return f"{size / MB:.2f}" if size is not None else '-'
+
+
+def print_report(runs, flags):
+    """Print one line per run and the average duration of every step"""
+    print(f"\n📈 Build history (last {len(runs)} runs):")
+    print(f"   {'#':>4}  {'Date':<16}  {'Revision':<14}  {'Mode':<11}  {'Wall':>8}  "
+          f"{'APK MB':>7}  {'Assets MB':>9}")
+    for run in runs:
+        date = time.strftime('%Y-%m-%d %H:%M', time.localtime(run['started_at']))
+        status = '' if run['ok'] else '  ❌ failed'
+        if run['id'] in flags:
+            status += '  ⚠️ ' + ', '.join(flags[run['id']])
+        print(f"   {run['id']:>4}  {date:<16}  {(run['revision'] or '-'):<14}  {run['mode']:<11}  "
+              f"{run['wall_time']:>7.1f}s  {_megabytes(run['apk_size']):>7}  "
+              f"{_megabytes(run['asset_size']):>9}{status}")
+
+    durations = {}
+    for run in runs:
+        for step, duration in run['steps'].items():
+            if duration is not None:
+                durations.setdefault(step, []).append(duration)
+    if durations:
+        print("\n⏱️ Step durations:")
+        for step, values in durations.items():
+            print(f"   {step:<14} {len(values):>4} runs  avg {sum(values) / len(values):>8.1f}s  "
+                  f"last {values[-1]:>8.1f}s")
+
+
+def add_metrics_arguments(parser):
+    """Add the build metrics options to an argparse parser"""
+    parser.add_argument('--metrics-db', default=DEFAULT_DB_PATH,
+                        help='SQLite database receiving the metrics of every run')
+    parser.add_argument('--no-metrics', action='store_true',
+                        help='Do not record metrics for this run')
+
+
+def main():
+    """Report the recorded build history and flag regressions"""
+    parser = argparse.ArgumentParser(description="Report BeautyGlow build metrics history")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='Build metrics SQLite database')
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help='Number of recent runs to show')
+    parser.add_argument('--time-threshold', type=float, default=DEFAULT_TIME_THRESHOLD,
+                        help='Relative build time growth flagged as a regression (0.30 = 30%%)')
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help='Smallest build time growth in seconds flagged as a regression')
+    parser.add_argument('--size-threshold', type=float, default=DEFAULT_SIZE_THRESHOLD_MB,
+                        help='APK growth in MB flagged as a regression')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with status 1 if the latest run is flagged')
+    args = parser.parse_args()
+
+    print("📊 BeautyGlow Build Metrics")
+    print("=" * 50)
+    if not os.path.exists(args.db):
+        print(f"⚠️ No build metrics recorded yet ({args.db})")
+        return 0
+
+    # Load one extra run so the oldest shown run has something to compare with
+    runs = load_runs(args.db, max(1, args.limit) + 1)
+    flags = flag_runs(runs, args.time_threshold, args.size_threshold, args.min_delta)
+    runs = runs[-max(1, args.limit):]
+    print_report(runs, flags)
+
+    flagged = [run for run in runs if run['id'] in flags]
+    if flagged:
+        print(f"\n⚠️ {len(flagged)} run(s) grew beyond the thresholds")
+    else:
+        print("\n✅ No build time or APK size regressions")
+    if args.check and runs and runs[-1]['id'] in flags:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
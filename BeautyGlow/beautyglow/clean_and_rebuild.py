@@ -5,64 +5,327 @@ Ensures icon changes take effect by cleaning and rebuilding the project
 """
 
 import os
-import subprocess
-import sys
+import argparse
+import asyncio
+import hashlib
+import json
+import signal
+import time
+from apk_analyzer import add_apk_arguments, report_apk
+from asset_index import pubspec_asset_paths
+from build_metrics import add_metrics_arguments, record_run
+from icon_trace import add_trace_arguments, finish_tracing, progress, span, tracing_from_args
 
-def run_command(command, description):
-    """Run a command and handle errors"""
+APK_PATH = "build/app/outputs/flutter-apk/app-debug.apk"
+
+# Fingerprints of the previous successful build (--incremental)
+DEFAULT_STATE_PATH = os.path.join('.icon_cache', 'build_state.json')
+
+# Build steps in the order they run
+STEP_FLUTTER_CLEAN = 'flutter-clean'
+STEP_PUB_GET = 'pub-get'
+STEP_GRADLE_CLEAN = 'gradle-clean'
+STEP_BUILD_APK = 'build-apk'
+FULL_STEPS = [STEP_FLUTTER_CLEAN, STEP_PUB_GET, STEP_GRADLE_CLEAN, STEP_BUILD_APK]
+
+# Flutter check scheduled ahead of the build steps (never skipped)
+STEP_CHECK_FLUTTER = 'check-flutter'
+
+# Description of each step and whether a failure stops the run
+STEP_DESCRIPTIONS = {
+    STEP_CHECK_FLUTTER: ("Checking Flutter installation", True),
+    STEP_FLUTTER_CLEAN: ("Cleaning Flutter project", False),
+    STEP_PUB_GET: ("Getting dependencies", True),
+    STEP_GRADLE_CLEAN: ("Cleaning Android build", False),
+    STEP_BUILD_APK: ("Building Android APK", True),
+}
+
+# Steps that must finish first; steps without a path between them run concurrently.
+# Unlike the original sequence (flutter clean, pub get, gradlew clean), Gradle clean
+# goes first, alongside the Flutter check, because flutter clean removes the build
+# dir it would clean. It is optional, so a fresh clone without android/local.properties
+# only gets a warning from it.
+STEP_DEPENDENCIES = {
+    STEP_CHECK_FLUTTER: [],
+    STEP_GRADLE_CLEAN: [],
+    STEP_FLUTTER_CLEAN: [STEP_CHECK_FLUTTER, STEP_GRADLE_CLEAN],
+    STEP_PUB_GET: [STEP_CHECK_FLUTTER, STEP_FLUTTER_CLEAN],
+    STEP_BUILD_APK: [STEP_CHECK_FLUTTER, STEP_PUB_GET, STEP_GRADLE_CLEAN],
+}
+
+# Per-step timeouts in seconds
+STEP_TIMEOUTS = {
+    STEP_CHECK_FLUTTER: 120,
+    STEP_FLUTTER_CLEAN: 300,
+    STEP_PUB_GET: 600,
+    STEP_GRADLE_CLEAN: 900,
+    STEP_BUILD_APK: 1800,
+}
+
+# Largest single output line the runner reads (Gradle progress lines can be long)
+STREAM_LIMIT = 1024 * 1024
+# Output lines kept per stream for failure reports
+ERROR_TAIL_LINES = 20
+
+# Build inputs fingerprinted for --incremental; asset dirs come from pubspec.yaml
+FINGERPRINT_INPUTS = {
+    'pubspec': ['pubspec.yaml', 'pubspec.lock'],
+    'android_build': ['android/build.gradle', 'android/build.gradle.kts',
+                      'android/app/build.gradle', 'android/app/build.gradle.kts',
+                      'android/settings.gradle', 'android/settings.gradle.kts',
+                      'android/gradle.properties'],
+    'android_res': ['android/app/src/main/res'],
+    'ios_assets': ['ios/Runner/Assets.xcassets'],
+    'dart': ['lib'],
+}
+
+# Steps needed when an input group changed. Resource, asset and Dart changes
+# are picked up by an incremental build; only Gradle config needs a clean.
+GROUP_STEPS = {
+    'pubspec': [STEP_PUB_GET, STEP_BUILD_APK],
+    'android_build': [STEP_GRADLE_CLEAN, STEP_BUILD_APK],
+    'android_res': [STEP_BUILD_APK],
+    'assets': [STEP_BUILD_APK],
+    'dart': [STEP_BUILD_APK],
+    'ios_assets': [],  # Only affects iOS builds
+}
+
+async def _read_stream(stream, label, lines):
+    """Print each line of a process stream as it arrives, with a timestamp"""
+    while True:
+        line = await stream.readline()
+        if not line:
+            break
+        text = line.decode('utf-8', errors='replace').rstrip()
+        lines.append(text)
+        progress(f"[{time.strftime('%H:%M:%S')}] {label} | {text}")
+
+def _kill_process(process):
+    """Kill a shell command together with the processes it started"""
+    try:
+        if os.name == 'posix':
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+async def _communicate(process, label, result):
+    """Stream both outputs of a process into result, then return its exit code"""
+    await asyncio.gather(
+        _read_stream(process.stdout, label, result['stdout']),
+        _read_stream(process.stderr, f"{label} (stderr)", result['stderr'])
+    )
+    return await process.wait()
+
+async def run_command(command, description, timeout=None, label=None):
+    """Run a command, streaming its output, and return a result dict"""
     print(f"\n🔄 {description}...")
     print(f"Command: {command}")
+    label = label or description
+    result = {'command': command, 'description': description, 'returncode': None,
+              'ok': False, 'timed_out': False, 'duration': 0.0, 'stdout': [], 'stderr': []}
+    start = time.perf_counter()
     
     try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            cwd=os.getcwd()
-        )
-        
-        if result.returncode == 0:
-            print(f"✅ {description} completed successfully")
-            if result.stdout:
-                print(f"Output: {result.stdout}")
-        else:
-            print(f"❌ {description} failed")
-            print(f"Error: {result.stderr}")
-            return False
-            
+        with span(description, 'subprocess', command=command):
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=os.getcwd(),
+                limit=STREAM_LIMIT,
+                start_new_session=os.name == 'posix'
+            )
+            try:
+                # The deadline covers the exit as well: a child can close its output and keep running
+                result['returncode'] = await asyncio.wait_for(_communicate(process, label, result), timeout)
+            except asyncio.TimeoutError:
+                result['timed_out'] = True
+                _kill_process(process)
+                result['returncode'] = await process.wait()
     except Exception as e:
         print(f"❌ Error running {description}: {e}")
-        return False
+        return result
+    finally:
+        result['duration'] = time.perf_counter() - start
     
-    return True
+    if result['timed_out']:
+        print(f"❌ {description} timed out after {timeout}s")
+    elif result['returncode'] == 0:
+        result['ok'] = True
+        print(f"✅ {description} completed successfully in {result['duration']:.1f}s")
+    else:
+        print(f"❌ {description} failed (exit code {result['returncode']})")
+        tail = result['stderr'][-ERROR_TAIL_LINES:] or result['stdout'][-ERROR_TAIL_LINES:]
+        if tail:
+            print("Error: " + "\n".join(tail))
+    return result
 
-def check_flutter_installation():
-    """Check if Flutter is installed and accessible"""
+async def check_flutter_installation(timeout=None):
+    """Check if Flutter is installed and accessible; return its result dict"""
     print("🔍 Checking Flutter installation...")
+    result = await run_command("flutter --version", "Checking Flutter installation",
+                               timeout, label=STEP_CHECK_FLUTTER)
     
-    try:
-        result = subprocess.run(
-            "flutter --version",
-            shell=True,
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:
-            print("✅ Flutter is installed and accessible")
-            print(f"Flutter version: {result.stdout.split('Flutter')[1].split('•')[0].strip()}")
-            return True
-        else:
-            print("❌ Flutter is not accessible")
+    if result['ok']:
+        output = "\n".join(result['stdout'])
+        print("✅ Flutter is installed and accessible")
+        if 'Flutter' in output:
+            print(f"Flutter version: {output.split('Flutter')[1].split('•')[0].strip()}")
+    else:
+        print("❌ Flutter is not accessible")
+    return result
+
+async def run_step(step, tasks, results, timeout):
+    """Run one step once the steps it depends on have finished"""
+    for dependency in STEP_DEPENDENCIES[step]:
+        if dependency in tasks and not await tasks[dependency]:
+            print(f"⏭️ Skipping {step}: {dependency} failed")
             return False
-            
-    except Exception as e:
-        print(f"❌ Error checking Flutter: {e}")
-        return False
+    
+    description, required = STEP_DESCRIPTIONS[step]
+    if step == STEP_CHECK_FLUTTER:
+        result = await check_flutter_installation(timeout)
+    else:
+        if step == STEP_BUILD_APK:
+            print("\n📱 Building for Android...")
+        result = await run_command(step_command(step), description, timeout, label=step)
+    results[step] = result
+    
+    if not result['ok'] and not required:
+        print(f"⚠️ {description} failed, but continuing...")
+        return True
+    return result['ok']
+
+async def run_steps(steps, timeout=None):
+    """Run steps concurrently in dependency order; return {step: result dict}"""
+    tasks = {}
+    results = dict.fromkeys(steps)
+    for step in steps:
+        tasks[step] = asyncio.ensure_future(
+            run_step(step, tasks, results, timeout or STEP_TIMEOUTS.get(step)))
+    await asyncio.gather(*tasks.values())
+    return results
+
+def print_timings(results, elapsed):
+    """Print how long each step took and the wall time of the whole run"""
+    print("\n⏱️ Step timings:")
+    for step, result in results.items():
+        if result is None:
+            print(f"   {step:<14} skipped")
+        else:
+            status = 'ok' if result['ok'] else ('timed out' if result['timed_out'] else 'failed')
+            print(f"   {step:<14} {result['duration']:>8.1f}s  {status}")
+    total = sum(result['duration'] for result in results.values() if result)
+    print(f"   Wall time {elapsed:.1f}s for {total:.1f}s of steps")
+
+def gradle_clean_command():
+    """Command for the Gradle clean step (project wrapper, else gradlew on PATH)"""
+    if os.path.exists(os.path.join('android', 'gradlew')):
+        return "cd android && ./gradlew clean"
+    return "cd android && gradlew clean"
+
+def step_command(step):
+    """Shell command for a build step"""
+    return {
+        STEP_FLUTTER_CLEAN: "flutter clean",
+        STEP_PUB_GET: "flutter pub get",
+        STEP_GRADLE_CLEAN: gradle_clean_command(),
+        STEP_BUILD_APK: "flutter build apk --debug",
+    }[step]
+
+def fingerprint_paths(paths):
+    """Hash the names, sizes and mtimes of every file under the given paths"""
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    file_path = os.path.join(directory, name)
+                    stat = os.stat(file_path)
+                    digest.update(f"{file_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+        elif os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+        else:
+            digest.update(f"{path}\0missing\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def fingerprint_inputs():
+    """Fingerprint every build input group"""
+    groups = dict(FINGERPRINT_INPUTS)
+    groups['assets'] = pubspec_asset_paths()
+    return {name: fingerprint_paths(paths) for name, paths in groups.items()}
+
+def load_build_state(state_path):
+    """Load the fingerprints of the previous successful build"""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_build_state(state_path, fingerprints):
+    """Persist the fingerprints of a successful build atomically"""
+    os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'fingerprints': fingerprints}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, state_path)
+
+def changed_groups(state, fingerprints):
+    """Names of the input groups whose fingerprint differs from the saved state"""
+    previous = state.get('fingerprints', {}) if state else {}
+    return [name for name, digest in fingerprints.items() if previous.get(name) != digest]
+
+def plan_steps(state, changed, apk_exists):
+    """Return the minimal ordered steps for the changed inputs"""
+    if state is None:
+        return list(FULL_STEPS)
+    
+    steps = set()
+    for name in changed:
+        steps.update(GROUP_STEPS.get(name, [STEP_BUILD_APK]))
+    if not os.path.exists(os.path.join('.dart_tool', 'package_config.json')):
+        steps.update([STEP_PUB_GET, STEP_BUILD_APK])
+    if not apk_exists:
+        steps.add(STEP_BUILD_APK)
+    return [step for step in FULL_STEPS if step in steps]
+
+def print_plan(state, changed, steps):
+    """Print why the incremental plan runs the steps it does"""
+    print("\n🧮 Incremental build plan:")
+    if state is None:
+        print("   No previous build state, running every step")
+    else:
+        print(f"   Changed inputs: {', '.join(changed) if changed else 'none'}")
+    skipped = [step for step in FULL_STEPS if step not in steps]
+    print(f"   Running: {', '.join(steps) if steps else 'nothing'}")
+    if skipped:
+        print(f"   Skipping: {', '.join(skipped)}")
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Clean and rebuild the BeautyGlow Flutter project")
+    parser.add_argument('--incremental', action='store_true',
+                        help='Run only the steps needed by inputs changed since the last build')
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH,
+                        help='File holding the fingerprints of the last successful build')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print the steps that would run without running them')
+    parser.add_argument('--timeout', type=float, metavar='SECONDS',
+                        help='Timeout for every step (default: a per-step limit)')
+    add_metrics_arguments(parser)
+    add_apk_arguments(parser)
+    add_trace_arguments(parser)
+    return parser.parse_args()
 
 def main():
     """Main function to clean and rebuild the Flutter project"""
+    args = parse_args()
+    tracing_from_args(args)
     print("🧹 BeautyGlow Flutter Clean and Rebuild Script")
     print("=" * 50)
     
@@ -71,40 +334,68 @@ def main():
         print("❌ pubspec.yaml not found. Please run this script from the Flutter project root.")
         return
     
-    # Check Flutter installation
-    if not check_flutter_installation():
-        print("❌ Flutter is not properly installed. Please install Flutter first.")
+    # Decide which steps to run
+    steps = list(FULL_STEPS)
+    if args.incremental:
+        state = load_build_state(args.state)
+        changed = changed_groups(state, fingerprint_inputs())
+        steps = plan_steps(state, changed, os.path.exists(APK_PATH))
+        print_plan(state, changed, steps)
+    
+    if args.dry_run:
+        for step in steps:
+            print(f"Command: {step_command(step)}")
         return
     
-    print("\n🚀 Starting clean and rebuild process...")
+    if not steps:
+        print("\n✅ Build is up to date, nothing to do")
+        finish_tracing(args)
+        return
     
-    # Step 1: Flutter clean
-    if not run_command("flutter clean", "Cleaning Flutter project"):
-        print("❌ Clean failed, but continuing...")
+    print("\n🚀 Starting clean and rebuild process...")
     
-    # Step 2: Get dependencies
-    if not run_command("flutter pub get", "Getting dependencies"):
-        print("❌ Getting dependencies failed")
-        return
+    # Check Flutter alongside the steps that do not need it, e.g. gradlew clean
+    start = time.perf_counter()
+    results = asyncio.run(run_steps([STEP_CHECK_FLUTTER] + steps, args.timeout))
+    elapsed = time.perf_counter() - start
+    print_timings(results, elapsed)
     
-    # Step 3: Clean Android build
-    if not run_command("cd android && ./gradlew clean", "Cleaning Android build"):
-        print("⚠️ Android clean failed, but continuing...")
+    if not args.no_metrics:
+        try:
+            record_run(args.metrics_db, 'incremental' if args.incremental else 'full', results, elapsed,
+                       APK_PATH, pubspec_asset_paths() + FINGERPRINT_INPUTS['android_res'],
+                       required=[step for step in results if STEP_DESCRIPTIONS[step][1]],
+                       apk_step=STEP_BUILD_APK)
+            print(f"📊 Metrics recorded in {args.metrics_db}")
+        except Exception as e:
+            print(f"⚠️ Could not record build metrics: {e}")
     
-    # Step 4: Build for Android
-    print("\n📱 Building for Android...")
-    if not run_command("flutter build apk --debug", "Building Android APK"):
-        print("❌ Android build failed")
+    check = results[STEP_CHECK_FLUTTER]
+    if not check or not check['ok']:
+        print("❌ Flutter is not properly installed. Please install Flutter first.")
+        finish_tracing(args)
         return
+    for step in steps:
+        description, required = STEP_DESCRIPTIONS[step]
+        if required and not (results[step] and results[step]['ok']):
+            print(f"❌ {description} failed")
+            finish_tracing(args)
+            return
+    
+    # Remember the inputs of this build for the next --incremental run
+    save_build_state(args.state, fingerprint_inputs())
     
-    # Step 5: Check if APK was created
-    apk_path = "build/app/outputs/flutter-apk/app-debug.apk"
+    # Check if APK was created
+    apk_path = APK_PATH
     if os.path.exists(apk_path):
         apk_size = os.path.getsize(apk_path) / (1024 * 1024)  # Convert to MB
         print(f"✅ APK created successfully: {apk_path}")
         print(f"📦 APK size: {apk_size:.2f} MB")
+        if not args.no_apk_analysis:
+            report_apk(apk_path, top=max(0, args.apk_top))
     else:
         print("⚠️ APK not found at expected location")
+    finish_tracing(args)
     
     print("\n✅ Clean and rebuild completed!")
     print("\n📋 Next steps:")
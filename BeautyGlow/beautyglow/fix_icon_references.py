@@ -6,49 +6,35 @@ Fixes any remaining drawable references and ensures all icon references are corr
 
 import os
 import glob
-import re
+import argparse
+from icon_trace import add_trace_arguments, finish_tracing, progress, tracing_from_args
+from icon_verify import icon_expectations, print_result, verify_files
+from icon_xml import (DEFAULT_CONFIG_PATH, DEFAULT_STATE_PATH, DEFAULT_WORKERS, ReferenceRewriter,
+                      load_replacements, load_state, print_results, rewrite_files, save_state)
 
-def fix_xml_references():
+RES_DIR = "android/app/src/main/res"
+
+def fix_xml_references(res_dirs=None, rewriter=None, dry_run=False, incremental=True,
+                       state_path=DEFAULT_STATE_PATH, workers=DEFAULT_WORKERS):
     """Fix any XML files that reference drawable instead of mipmap"""
     print("🔧 Fixing XML references...")
+    rewriter = rewriter or ReferenceRewriter()
+    
+    # Find all XML files in the res directories
+    xml_files = []
+    for res_dir in res_dirs or [RES_DIR]:
+        xml_files.extend(glob.glob(os.path.join(res_dir, "**", "*.xml"), recursive=True))
+    xml_files = sorted(set(xml_files))
     
-    # Find all XML files in the res directory
-    xml_files = glob.glob("android/app/src/main/res/**/*.xml", recursive=True)
+    state = load_state(state_path, rewriter) if incremental else {}
+    results = rewrite_files(xml_files, rewriter, state, dry_run, workers)
+    counts = print_results(results)
     
-    for xml_file in xml_files:
-        try:
-            with open(xml_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            original_content = content
-            
-            # Fix drawable references to mipmap
-            content = re.sub(
-                r'@drawable/ic_launcher_foreground',
-                '@mipmap/ic_launcher_foreground',
-                content
-            )
-            content = re.sub(
-                r'@drawable/ic_launcher_background',
-                '@mipmap/ic_launcher_background',
-                content
-            )
-            content = re.sub(
-                r'@color/ic_launcher_background',
-                '@mipmap/ic_launcher_background',
-                content
-            )
-            
-            # If content changed, write it back
-            if content != original_content:
-                with open(xml_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                print(f"✅ Fixed references in {xml_file}")
-            else:
-                print(f"✓ No changes needed in {xml_file}")
-                
-        except Exception as e:
-            print(f"⚠️ Error processing {xml_file}: {e}")
+    # Remember every file's content for the next run (a dry run changes nothing)
+    if not dry_run:
+        save_state(state_path, rewriter,
+                   {result['path']: result['entry'] for result in results if result['entry']})
+    return counts
 
 def remove_old_drawable_icons():
     """Remove any old drawable icon files that might conflict"""
@@ -65,7 +51,7 @@ def remove_old_drawable_icons():
         for old_file in old_files:
             try:
                 os.remove(old_file)
-                print(f"🗑️ Removed old file: {old_file}")
+                progress(f"🗑️ Removed old file: {old_file}")
             except Exception as e:
                 print(f"⚠️ Could not remove {old_file}: {e}")
 
@@ -91,18 +77,28 @@ def verify_mipmap_files():
         "android/app/src/main/res/mipmap-xxxhdpi/ic_launcher_background.png",
     ]
     
-    missing_files = []
-    for file_path in required_files:
-        if os.path.exists(file_path):
-            file_size = os.path.getsize(file_path)
-            if file_size > 100:  # File should be at least 100 bytes
-                print(f"✅ {file_path} - {file_size} bytes")
-            else:
-                print(f"⚠️ {file_path} - File too small ({file_size} bytes)")
-                missing_files.append(file_path)
+    if not os.path.isdir(RES_DIR):
+        print(f"❌ {RES_DIR} - Res directory not found, no mipmap files to verify")
+        return False
+    missing_files = [path for path in required_files if not os.path.isdir(os.path.dirname(path))]
+    for directory in sorted({os.path.dirname(path) for path in missing_files}):
+        print(f"⚠️ {directory} - Directory not found")
+    
+    # Check the real dimensions from the PNG headers, all files at once
+    expectations = {os.path.normpath(path): expected for path, expected in icon_expectations().items()}
+    checks = {}
+    for path in required_files:
+        if path in missing_files:
+            continue
+        expected = expectations.get(os.path.normpath(path))
+        if expected is None:
+            print(f"❌ {path} - No expected size known for this file")
+            missing_files.append(path)
         else:
-            print(f"❌ {file_path} - File not found")
-            missing_files.append(file_path)
+            checks[path] = expected
+    for result in verify_files(checks):
+        if not print_result(result):
+            missing_files.append(result['path'])
     
     if missing_files:
         print(f"\n⚠️ Missing or invalid files: {len(missing_files)}")
@@ -111,14 +107,39 @@ def verify_mipmap_files():
         print(f"\n✅ All mipmap files verified successfully!")
         return True
 
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Fix BeautyGlow icon references")
+    parser.add_argument('--res-dir', action='append', dest='res_dirs', metavar='DIR',
+                        help=f'Android res directory to scan (repeatable, default: {RES_DIR})')
+    parser.add_argument('--config', default=DEFAULT_CONFIG_PATH,
+                        help='JSON file of extra {"@old/ref": "@new/ref"} replacements')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Print a unified diff of the XML changes without writing or removing files')
+    parser.add_argument('--full', action='store_true',
+                        help='Rescan every XML file, ignoring the last run')
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH,
+                        help='File remembering the XML files checked by the last run')
+    parser.add_argument('--jobs', '-j', type=int, default=DEFAULT_WORKERS,
+                        help='Number of worker threads')
+    add_trace_arguments(parser)
+    return parser.parse_args()
+
 def main():
     """Main function to fix icon references"""
+    args = parse_args()
     print("🔧 BeautyGlow Icon Reference Fix Script")
     print("=" * 50)
     
     try:
+        tracing_from_args(args)
+        
         # Step 1: Fix XML references
-        fix_xml_references()
+        rewriter = ReferenceRewriter(load_replacements(args.config))
+        fix_xml_references(args.res_dirs, rewriter, args.dry_run, not args.full, args.state, args.jobs)
+        if args.dry_run:
+            finish_tracing(args)
+            return
         
         # Step 2: Remove old drawable files
         remove_old_drawable_icons()
@@ -128,6 +149,7 @@ def main():
             print("\n✅ All icon references fixed successfully!")
         else:
             print("\n⚠️ Some files may need attention")
+        finish_tracing(args)
         
         print("\n📋 Summary:")
         print("   • Fixed XML references to use mipmap instead of drawable")
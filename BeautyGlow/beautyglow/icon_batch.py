@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Multi-App Icon Batch Builder for BeautyGlow
+Discovers every Flutter app under a repository by its pubspec.yaml and builds
+the icons of all of them on one shared worker pool and cache, with a combined report
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import time
+from icon_cache import add_cache_arguments, cache_from_args
+from icon_encode import add_encode_arguments, finish_encoding, use_profile
+from icon_enhance import add_enhance_arguments, use_engine
+from icon_graph import CACHED, DEFAULT_TARGETS, FAILED, build_graph, load_manifest, run_graphs
+from icon_output import add_output_arguments, outputs_from_args
+from icon_parallel import add_parallel_arguments, workers_from_args
+import icon_primitives
+from icon_source import add_source_arguments, persist_dir_from_args
+from icon_trace import add_trace_arguments, finish_tracing, progress, tracing_from_args
+
+# Optional JSON file at the repository root with per-app settings:
+# {"apps": {"Bird/Flappy-Bird": {"source": "...", "targets": [...], "manifest": "...", "skip": false}}}
+DEFAULT_CONFIG_PATH = 'icon_batch.json'
+
+# Directories never searched for apps (build output, caches, platform folders)
+SKIP_DIRS = {'build', 'node_modules', 'Pods', 'ephemeral', 'android', 'ios', 'macos',
+             'linux', 'windows', 'web', 'lib', 'test', 'assets'}
+# A pubspec.yaml only marks an app, rather than a Dart package, next to one of these
+PLATFORM_DIRS = ('android', 'ios', 'macos', 'web')
+
+# flutter_launcher_icons settings, in a file of their own or inside pubspec.yaml
+LAUNCHER_ICONS_FILES = ('flutter_launcher_icons.yaml', 'pubspec.yaml')
+LAUNCHER_ICONS_SECTIONS = ('flutter_launcher_icons:', 'flutter_icons:')
+
+# Status of each app in the report
+BUILT = 'built'
+SKIPPED = 'skipped'
+CONFLICTS = 'conflicts'
+
+
+def discover_apps(repo_root='.'):
+    """Relative paths of every Flutter app root under repo_root, sorted"""
+    apps = []
+    for directory, dirs, names in os.walk(repo_root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d not in SKIP_DIRS)
+        if 'pubspec.yaml' in names and any(
+                os.path.isdir(os.path.join(directory, d)) for d in PLATFORM_DIRS):
+            apps.append(os.path.relpath(directory, repo_root))
+    return sorted(apps)
+
+
+def launcher_icon_path(app_root):
+    """The image_path of the app's flutter_launcher_icons settings, or None"""
+    for file_name in LAUNCHER_ICONS_FILES:
+        try:
+            with open(os.path.join(app_root, file_name), 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            continue
+        in_section = False
+        for line in lines:
+            stripped = line.strip()
+            if not stripped or stripped.startswith('#'):
+                continue
+            if len(line) == len(line.lstrip()):
+                in_section = stripped in LAUNCHER_ICONS_SECTIONS
+            elif in_section and stripped.startswith('image_path:'):
+                return stripped.split(':', 1)[1].split('#')[0].strip().strip('\'"')
+    return None
+
+
+def load_config(config_path):
+    """Per-app settings keyed by app path relative to the repository root"""
+    if not config_path or not os.path.exists(config_path):
+        return {}
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    return {os.path.normpath(app): settings for app, settings in config.get('apps', {}).items()}
+
+
+def resolve_source(app_root, settings, manifest):
+    """Source image of an app relative to its root: configured, manifest default or launcher icon"""
+    candidates = [settings.get('source'), manifest['source'], launcher_icon_path(app_root)]
+    for candidate in candidates:
+        if candidate and os.path.isfile(os.path.join(app_root, candidate)):
+            return candidate
+    return None
+
+
+def plan_apps(repo_root, apps, config, targets):
+    """Build graph and report entry of every app; apps that cannot be built get a reason"""
+    plans = []
+    for app in apps:
+        settings = config.get(os.path.normpath(app), {})
+        app_root = os.path.normpath(os.path.join(repo_root, app))
+        entry = {'app': app, 'status': SKIPPED, 'reason': None, 'source': None,
+                 'targets': settings.get('targets') or targets, 'graph': None}
+        plans.append(entry)
+        if settings.get('skip'):
+            entry['reason'] = 'skipped by config'
+            continue
+
+        manifest_path = settings.get('manifest')
+        try:
+            manifest = load_manifest(os.path.join(app_root, manifest_path) if manifest_path else None)
+            entry['source'] = resolve_source(app_root, settings, manifest)
+            if entry['source'] is None:
+                entry['reason'] = 'no source image (set "source" in the batch config)'
+                continue
+            # Apps differ in platforms, so never create a platform directory that is missing
+            graph = build_graph(manifest, entry['targets'], app_root, entry['source'], existing_dirs=True)
+        except (OSError, ValueError) as e:
+            entry['reason'] = str(e)
+            continue
+        entry['graph'] = graph
+        entry['status'] = CONFLICTS if graph.conflicts else BUILT
+    return plans
+
+
+def summarize(plans, outcomes):
+    """Fill in each app's destination counts from the outcomes of the shared run"""
+    for entry in plans:
+        graph = entry.pop('graph', None)
+        if graph is None:
+            continue
+        results = [outcomes.get(path) for path in graph.destinations]
+        entry['destinations'] = len(graph.destinations)
+        entry['nodes'] = len(graph.nodes())
+        entry['cached'] = results.count(CACHED)
+        entry['failed'] = results.count(FAILED)
+        entry['written'] = len(results) - entry['cached'] - entry['failed'] - results.count(None)
+        entry['skipped_destinations'] = len(graph.skipped)
+        entry['conflicts'] = [path for path, *_ in graph.conflicts]
+        if entry['failed']:
+            entry['status'] = FAILED
+    return plans
+
+
+def print_report(plans):
+    """Print one line per app and the totals of the batch"""
+    print(f"\n📊 Batch report: {len(plans)} apps")
+    print(f"   {'App':<40} {'Status':<10} {'Files':>6} {'Nodes':>6} {'Cached':>7} {'Failed':>7}")
+    for entry in plans:
+        if 'destinations' in entry:
+            print(f"   {entry['app']:<40} {entry['status']:<10} {entry['destinations']:>6} "
+                  f"{entry['nodes']:>6} {entry['cached']:>7} {entry['failed']:>7}")
+        else:
+            print(f"   {entry['app']:<40} {entry['status']:<10} {entry['reason']}")
+        if entry.get('source'):
+            progress(f"      source {entry['source']}, targets {', '.join(entry['targets'])}")
+        for path in entry.get('conflicts', []):
+            print(f"      ❌ conflicting writes to {path}")
+
+    built = [entry for entry in plans if entry['status'] == BUILT]
+    print(f"\n   {len(built)} built, {sum(1 for entry in plans if entry['status'] == SKIPPED)} skipped, "
+          f"{sum(1 for entry in plans if entry['status'] in (CONFLICTS, FAILED))} failed; "
+          f"{sum(entry.get('destinations', 0) for entry in built)} destinations, "
+          f"{sum(entry.get('cached', 0) for entry in built)} from cache")
+
+
+def build_apps(repo_root='.', config=None, targets=None, patterns=None, cache=None,
+               workers=1, persist_dir=None, executor='thread'):
+    """Build every discovered app on one worker pool; return the per-app report entries"""
+    apps = discover_apps(repo_root)
+    if patterns:
+        apps = [app for app in apps if any(fnmatch.fnmatch(app, pattern) for pattern in patterns)]
+    plans = plan_apps(repo_root, apps, config or {}, targets or DEFAULT_TARGETS)
+    graphs = [entry['graph'] for entry in plans if entry['status'] == BUILT]
+    for entry in plans:
+        if entry['status'] == CONFLICTS:
+            print(f"❌ {entry['app']}: conflicting writes, nothing written for this app")
+
+    outcomes = run_graphs(graphs, cache, workers, persist_dir, executor) if graphs else {}
+    return summarize(plans, outcomes)
+
+
+def main():
+    """Build the icons of every Flutter app in the repository in one run"""
+    parser = argparse.ArgumentParser(description="Build icons for every Flutter app in a repository")
+    parser.add_argument('--repo', default='.', help='Repository root to search for pubspec.yaml files')
+    parser.add_argument('--config', help=f"Per-app JSON settings (default: <repo>/{DEFAULT_CONFIG_PATH})")
+    parser.add_argument('--app', action='append', dest='patterns', metavar='PATTERN',
+                        help='Only build apps whose path matches this glob (repeatable)')
+    parser.add_argument('--target', '-t', action='append', dest='targets',
+                        help=f"Default target of apps without one configured (default: {', '.join(DEFAULT_TARGETS)})")
+    parser.add_argument('--list', action='store_true', help='Only list the discovered apps and their sources')
+    parser.add_argument('--json', metavar='PATH', help='Write the combined report to this JSON file')
+    add_parallel_arguments(parser)
+    add_cache_arguments(parser)
+    add_source_arguments(parser)
+    add_encode_arguments(parser)
+    add_enhance_arguments(parser)
+    add_output_arguments(parser)
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+
+    print("🗂️ BeautyGlow Multi-App Icon Batch")
+    print("=" * 50)
+    config = load_config(args.config or os.path.join(args.repo, DEFAULT_CONFIG_PATH))
+
+    if args.list:
+        apps = discover_apps(args.repo)
+        plans = plan_apps(args.repo, apps, config, args.targets or DEFAULT_TARGETS)
+        for entry in plans:
+            detail = entry['source'] if entry['status'] != SKIPPED else entry['reason']
+            print(f"   {entry['app']:<40} {entry['status']:<10} {detail}")
+        return 0
+
+    use_profile(args.profile)
+    use_engine(args.enhance_engine)
+    tracing_from_args(args)
+    outputs = outputs_from_args(args)
+    cache = cache_from_args(args)
+    start = time.perf_counter()
+    plans = build_apps(args.repo, config, args.targets, args.patterns, cache,
+                       workers_from_args(args), persist_dir_from_args(args), args.executor)
+    print_report(plans)
+    print(f"   Built in {time.perf_counter() - start:.2f}s")
+
+    if cache is not None:
+        cache.save()
+        cache.print_summary()
+    outputs.print_summary()
+    icon_primitives.print_summary()
+    finish_encoding(args)
+    finish_tracing(args)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(plans, f, indent=2)
+        print(f"   Report: {args.json}")
+    return 0 if all(entry['status'] in (BUILT, SKIPPED) for entry in plans) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
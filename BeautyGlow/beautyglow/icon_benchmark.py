@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Icon Tooling Benchmark Suite for BeautyGlow
+Times decode, resize, enhance, encode and write on synthetic project trees
+and compares the JSON results against a saved baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import PIL
+from PIL import Image, ImageDraw
+from icon_encode import PROFILES, DEFAULT_PROFILE, PngEncoder
+from icon_enhance import enhance_batch, enhance_pillow, fused_available
+from icon_pyramid import ResizePyramid
+import icon_sizes
+from icon_graph import ENHANCED_SIZES, build_graph, load_manifest
+
+DEFAULT_MASTER_SIZES = [512, 1024, 2048]
+DEFAULT_REPEAT = 3
+DEFAULT_OUTPUT = os.path.join('.icon_cache', 'benchmark.json')
+
+# A stage is a regression when it is this much slower than the baseline...
+DEFAULT_THRESHOLD = 0.10
+# ...and at least this many seconds slower (filters out timer noise)
+DEFAULT_MIN_DELTA = 0.005
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Scripts timed end to end with --scripts, and the arguments they run with
+SCRIPTS = {
+    'update_app_icons': ['update_app_icons.py', '--no-cache'],
+    'update_clean_icons': ['update_clean_icons.py', '--no-cache'],
+    'update_launcher_icons': ['update_launcher_icons.py', '--no-cache'],
+    'fix_icon_references': ['fix_icon_references.py'],
+    'clean_and_rebuild': ['clean_and_rebuild.py'],
+}
+
+# Scripts that shell out to tools which may not be installed
+SCRIPT_REQUIREMENTS = {'clean_and_rebuild': 'flutter'}
+
+# CLI subcommands whose startup ('<command> --help') is timed with --startup
+STARTUP_COMMANDS = ['verify', 'fix-refs', 'assets', 'apk', 'metrics', 'rebuild',
+                    'icons', 'launcher', 'clean-icons']
+# Quick commands that must start without importing Pillow
+LIGHT_COMMANDS = ('verify', 'fix-refs', 'assets', 'apk', 'metrics', 'rebuild')
+
+ADAPTIVE_ICON_XML = """<?xml version="1.0" encoding="utf-8"?>
+<adaptive-icon xmlns:android="http://schemas.android.com/apk/res/android">
+    <background android:drawable="@drawable/ic_launcher_background"/>
+    <foreground android:drawable="@drawable/ic_launcher_foreground"/>
+</adaptive-icon>
+"""
+
+
+def synthetic_master(size):
+    """Draw a deterministic logo-like RGB master of the given size"""
+    gradient = Image.linear_gradient('L').resize((size, size))
+    image = Image.merge('RGB', (gradient, gradient.rotate(90), gradient.rotate(180)))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((size // 8, size // 8, size * 7 // 8, size * 7 // 8), fill=(236, 72, 153))
+    draw.rectangle((size * 3 // 8, size * 3 // 8, size * 5 // 8, size * 5 // 8), fill=(255, 255, 255))
+    # Noise keeps the encoder from compressing the master unrealistically well
+    noise = Image.effect_noise((size, size), 24).convert('RGB')
+    return Image.blend(image, noise, 0.08)
+
+
+def build_tree(root, master_size):
+    """Create a synthetic Flutter project tree with a master logo under root"""
+    res_dir = os.path.join(root, icon_sizes.ANDROID_RES_DIR)
+    folders = (list(icon_sizes.ANDROID_MIPMAP_SIZES) + list(icon_sizes.ANDROID_DRAWABLE_SIZES)
+               + ['drawable', 'mipmap-anydpi-v26'])
+    for folder in folders:
+        os.makedirs(os.path.join(res_dir, folder), exist_ok=True)
+    for directory in (icon_sizes.IOS_ICON_DIR, icon_sizes.IOS_LAUNCH_DIR,
+                      icon_sizes.MACOS_ICON_DIR, icon_sizes.WEB_ICON_DIR):
+        os.makedirs(os.path.join(root, directory), exist_ok=True)
+
+    with open(os.path.join(res_dir, 'mipmap-anydpi-v26', 'ic_launcher.xml'), 'w', encoding='utf-8') as f:
+        f.write(ADAPTIVE_ICON_XML)
+    with open(os.path.join(root, 'pubspec.yaml'), 'w', encoding='utf-8') as f:
+        f.write("name: benchmark_app\n")
+
+    master_path = os.path.join(root, icon_sizes.SOURCE_IMAGE)
+    os.makedirs(os.path.dirname(master_path), exist_ok=True)
+    synthetic_master(master_size).save(master_path, format='JPEG', quality=95)
+    return master_path
+
+
+def time_runs(fn, repeat):
+    """Call fn() repeat times and return the elapsed seconds of each call"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def summarize(runs):
+    """Reduce a list of timings to the values stored in the JSON results"""
+    return {
+        'seconds': round(statistics.median(runs), 6),
+        'min': round(min(runs), 6),
+        'runs': [round(run, 6) for run in runs],
+    }
+
+
+def decode_master(master_path):
+    """Decode and convert the master the way the icon scripts do"""
+    with Image.open(master_path) as image:
+        return image.convert('RGBA')
+
+
+def benchmark_stages(root, master_path, repeat, profile):
+    """Time each pipeline stage separately and return {stage: timings}"""
+    results = {}
+    sizes = icon_sizes.all_icon_sizes()
+    foreground_sizes = ENHANCED_SIZES
+
+    results['decode'] = time_runs(lambda: decode_master(master_path), repeat)
+    source_img = decode_master(master_path)
+
+    results['resize'] = time_runs(
+        lambda: [source_img.resize((size, size), Image.LANCZOS) for size in sizes], repeat)
+    results['resize_pyramid'] = time_runs(lambda: ResizePyramid(source_img, sizes), repeat)
+    resized = {size: source_img.resize((size, size), Image.LANCZOS) for size in sizes}
+
+    foregrounds = [resized[size] for size in foreground_sizes]
+    results['enhance'] = time_runs(lambda: [enhance_pillow(icon) for icon in foregrounds], repeat)
+    if fused_available():
+        results['enhance_numpy'] = time_runs(lambda: enhance_batch(foregrounds), repeat)
+
+    encoder = PngEncoder(profile)
+    results['encode'] = time_runs(lambda: [encoder.encode(icon) for icon in resized.values()], repeat)
+    encoded = {size: encoder.encode(icon) for size, icon in resized.items()}
+
+    outputs = [(output_path, encoded[size])
+               for output_path, (size, _) in build_graph(load_manifest(), ['app'], root).destinations.items()]
+
+    def write_all():
+        for output_path, data in outputs:
+            with open(output_path, 'wb') as f:
+                f.write(data)
+
+    results['write'] = time_runs(write_all, repeat)
+    return results
+
+
+def benchmark_scripts(root, repeat):
+    """Time each tooling script end to end inside the synthetic tree"""
+    results = {}
+    for name, command in SCRIPTS.items():
+        requirement = SCRIPT_REQUIREMENTS.get(name)
+        if requirement and shutil.which(requirement) is None:
+            print(f"⚠️ Skipping {name}: '{requirement}' is not installed")
+            continue
+
+        argv = [sys.executable, os.path.join(SCRIPT_DIR, command[0])] + command[1:]
+
+        def run():
+            completed = subprocess.run(argv, cwd=root, capture_output=True, text=True)
+            if completed.returncode != 0:
+                raise RuntimeError(f"{name} exited with {completed.returncode}: {completed.stderr.strip()}")
+
+        try:
+            results[name] = time_runs(run, repeat)
+        except Exception as e:
+            print(f"⚠️ Error benchmarking {name}: {e}")
+    return results
+
+
+def imports_pillow(argv):
+    """True if running argv under -X importtime imports PIL"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime'] + argv,
+                               cwd=SCRIPT_DIR, capture_output=True, text=True)
+    return any(line.rsplit('|', 1)[-1].strip() == 'PIL' for line in completed.stderr.splitlines())
+
+
+def benchmark_startup(repeat):
+    """Time '<command> --help' through the CLI; return (timings, light commands importing Pillow)"""
+    results = {}
+    heavy = []
+    for name in STARTUP_COMMANDS:
+        argv = [os.path.join(SCRIPT_DIR, 'beautyglow_assets.py'), name, '--help']
+
+        def run():
+            completed = subprocess.run([sys.executable] + argv, cwd=SCRIPT_DIR, capture_output=True, text=True)
+            if completed.returncode != 0:
+                raise RuntimeError(f"{name} exited with {completed.returncode}: {completed.stderr.strip()}")
+
+        try:
+            results[name] = time_runs(run, repeat)
+        except Exception as e:
+            print(f"⚠️ Error benchmarking {name} startup: {e}")
+            continue
+        pillow = imports_pillow(argv)
+        if pillow and name in LIGHT_COMMANDS:
+            heavy.append(name)
+        print(f"   startup {name:<24} {statistics.median(results[name]) * 1000:>10.1f} ms"
+              f"{'  (imports Pillow)' if pillow else ''}")
+    return results, heavy
+
+
+def run_benchmarks(master_sizes, repeat=DEFAULT_REPEAT, profile=DEFAULT_PROFILE,
+                   scripts=False, keep_dir=None, startup=False):
+    """Run every benchmark and return the JSON-serialisable results"""
+    results = {}
+    heavy_startup = []
+    if startup:
+        print("\n🚀 CLI startup")
+        timings, heavy_startup = benchmark_startup(repeat)
+        for name, runs in timings.items():
+            results[f"startup/{name}"] = summarize(runs)
+    for master_size in master_sizes:
+        root = tempfile.mkdtemp(prefix=f"beautyglow-bench-{master_size}-", dir=keep_dir)
+        try:
+            print(f"\n📐 Master {master_size}x{master_size} in {root}")
+            master_path = build_tree(root, master_size)
+            timings = benchmark_stages(root, master_path, repeat, profile)
+            if scripts:
+                timings.update({f"script:{name}": runs
+                                for name, runs in benchmark_scripts(root, repeat).items()})
+            for stage, runs in timings.items():
+                results[f"{master_size}px/{stage}"] = summarize(runs)
+                print(f"   {stage:<32} {statistics.median(runs) * 1000:>10.1f} ms")
+        finally:
+            if keep_dir is None:
+                shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'profile': profile,
+        'repeat': repeat,
+        'results': results,
+        'heavy_startup': heavy_startup,
+    }
+
+
+def save_results(report, output_path):
+    """Write benchmark results as JSON"""
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, output_path)
+
+
+def load_results(path):
+    """Load benchmark results written by save_results"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    """Print a stage-by-stage comparison and return the regressed stage names"""
+    base, cur = baseline['results'], current['results']
+    regressions = []
+
+    print(f"{'Stage':<44} {'Baseline':>10} {'Current':>10} {'Change':>8}")
+    for name in sorted(set(base) | set(cur)):
+        if name not in base or name not in cur:
+            print(f"{name:<44} {'only in ' + ('current' if name in cur else 'baseline'):>30}")
+            continue
+        before, after = base[name]['seconds'], cur[name]['seconds']
+        change = (after - before) / before if before else 0.0
+        regressed = change > threshold and after - before > min_delta
+        if regressed:
+            regressions.append(name)
+        flag = '  ✗ regression' if regressed else ('  ✓ faster' if change < -threshold else '')
+        print(f"{name:<44} {before * 1000:>8.1f}ms {after * 1000:>8.1f}ms {change * 100:>+7.1f}%{flag}")
+
+    if baseline.get('profile') != current.get('profile'):
+        print(f"⚠️ Encode profiles differ: {baseline.get('profile')} vs {current.get('profile')}")
+    return regressions
+
+
+def report_comparison(baseline_path, current, threshold, min_delta):
+    """Compare current results with a baseline file and return an exit code"""
+    print(f"\n📊 Comparing with baseline: {baseline_path}")
+    regressions = compare_results(load_results(baseline_path), current, threshold, min_delta)
+    if regressions:
+        print(f"\n❌ {len(regressions)} stage(s) regressed by more than {threshold * 100:.0f}%")
+        return 1
+    print("\n✅ No regressions against the baseline")
+    return 0
+
+
+def add_threshold_arguments(parser):
+    """Add the regression threshold options to an argparse parser"""
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative slowdown counted as a regression (0.10 = 10%%)')
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help='Smallest absolute slowdown in seconds counted as a regression')
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark the BeautyGlow icon tooling")
+    commands = parser.add_subparsers(dest='command')
+
+    run = commands.add_parser('run', help='Run the benchmarks and save JSON results')
+    run.add_argument('--masters', type=int, nargs='+', default=DEFAULT_MASTER_SIZES,
+                     help='Edge lengths of the synthetic master logos')
+    run.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per stage')
+    run.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                     help='PNG encode profile to benchmark')
+    run.add_argument('--scripts', action='store_true',
+                     help='Also time each tooling script end to end')
+    run.add_argument('--startup', action='store_true',
+                     help='Also time CLI startup and fail if a quick command imports Pillow')
+    run.add_argument('--output', default=DEFAULT_OUTPUT, help='JSON file receiving the results')
+    run.add_argument('--baseline', help='Compare the new results with this JSON file')
+    run.add_argument('--keep-dir', help='Build the synthetic trees here and keep them')
+    add_threshold_arguments(run)
+
+    compare = commands.add_parser('compare', help='Compare two saved JSON results')
+    compare.add_argument('baseline', help='Baseline JSON results')
+    compare.add_argument('current', help='Current JSON results')
+    add_threshold_arguments(compare)
+
+    # 'run' is the default command
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in ('run', 'compare', '-h', '--help'):
+        argv = ['run'] + argv
+    return parser.parse_args(argv)
+
+
+def main():
+    """Run the benchmark suite or compare saved results"""
+    args = parse_args()
+    print("⏱️ BeautyGlow Icon Tooling Benchmarks")
+    print("=" * 50)
+
+    if args.command == 'compare':
+        return report_comparison(args.baseline, load_results(args.current),
+                                 args.threshold, args.min_delta)
+
+    if args.keep_dir:
+        os.makedirs(args.keep_dir, exist_ok=True)
+    report = run_benchmarks(args.masters, max(1, args.repeat), args.profile,
+                            args.scripts, args.keep_dir, args.startup)
+    save_results(report, args.output)
+    print(f"\n💾 Results: {args.output}")
+
+    if report['heavy_startup']:
+        print(f"\n❌ Quick commands importing Pillow: {', '.join(report['heavy_startup'])}")
+        return 1
+
+    if args.baseline:
+        return report_comparison(args.baseline, report, args.threshold, args.min_delta)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Incremental Icon Cache for BeautyGlow
+Content-addressed on-disk cache of encoded icons so unchanged outputs are
+restored from disk instead of being re-rendered and re-encoded
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from icon_output import LINK_MODES, file_digest, place_file
+
+DEFAULT_CACHE_DIR = '.icon_cache'
+DEFAULT_MAX_MB = 64
+
+INDEX_FILE = 'index.json'
+
+
+class IconCache:
+    """Persistent cache of encoded icons keyed by source, size, transform and encoder"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_mb=DEFAULT_MAX_MB, link='copy'):
+        if link not in LINK_MODES:
+            raise ValueError(f"Unknown link mode '{link}', expected one of {LINK_MODES}")
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+        self.index = self._load_index()
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, INDEX_FILE)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _blob_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.png")
+
+    @staticmethod
+    def key(source_digest, size, transform, encoder):
+        """Build a cache key from the source hash, size, transform and encoder settings"""
+        parts = {
+            'source': source_digest,
+            'size': size,
+            'transform': transform,
+            'encoder': encoder,
+        }
+        payload = json.dumps(parts, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def restore(self, key, output_path):
+        """Place the cached bytes for key at output_path; return False on a miss"""
+        entry = self.index.get(key)
+        blob_path = self._blob_path(key)
+        if entry is None or not os.path.exists(blob_path):
+            self.misses += 1
+            return False
+
+        # A hard-linked output rewritten in place would corrupt the blob
+        if file_digest(blob_path) != entry['digest']:
+            self.index.pop(key, None)
+            os.remove(blob_path)
+            self.misses += 1
+            return False
+
+        place_file(blob_path, output_path, self.link)
+
+        entry['last_used'] = time.time()
+        self.hits += 1
+        return True
+
+    def store(self, key, output_path):
+        """Copy a freshly written output into the cache under key"""
+        blob_path = self._blob_path(key)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        tmp_path = f"{blob_path}.tmp"
+        shutil.copyfile(output_path, tmp_path)
+        os.replace(tmp_path, blob_path)
+        self.index[key] = {
+            'digest': file_digest(blob_path),
+            'bytes': os.path.getsize(blob_path),
+            'last_used': time.time(),
+        }
+
+    def total_bytes(self):
+        """Return the size of every cached blob"""
+        return sum(entry['bytes'] for entry in self.index.values())
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits its size cap"""
+        evicted = 0
+        total = self.total_bytes()
+        for key in sorted(self.index, key=lambda k: self.index[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= self.index.pop(key)['bytes']
+            try:
+                os.remove(self._blob_path(key))
+            except OSError:
+                pass
+            evicted += 1
+        return evicted
+
+    def save(self):
+        """Evict over-budget entries and persist the index"""
+        evicted = self.evict()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._index_path()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self._index_path())
+        return evicted
+
+    def print_summary(self):
+        """Print hit/miss counts and the current cache size"""
+        total = self.hits + self.misses
+        rate = f"{(self.hits / total) * 100:.1f}%" if total else "N/A"
+        print(f"\n🗄️ Icon cache: {self.hits} hits, {self.misses} misses ({rate}), "
+              f"{self.total_bytes() / 1024:.1f} KB in {len(self.index)} entries")
+
+
+def add_cache_arguments(parser):
+    """Add the shared cache options to an argparse parser"""
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Render every icon even if a cached copy exists')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='Directory of the incremental icon cache')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_MB,
+                        help='Size cap of the cache before LRU eviction')
+    parser.add_argument('--cache-link', choices=LINK_MODES, default='copy',
+                        help='Copy, hard-link or reflink cached icons into place')
+
+
+def cache_from_args(args):
+    """Return an IconCache for parsed arguments, or None when caching is disabled"""
+    if args.no_cache:
+        return None
+    return IconCache(args.cache_dir, args.cache_max_mb, args.cache_link)
+
+
+def main():
+    """Show cache statistics or clear the cache"""
+    parser = argparse.ArgumentParser(description="Inspect the BeautyGlow icon cache")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--clear', action='store_true', help='Delete every cached icon')
+    args = parser.parse_args()
+
+    if args.clear:
+        shutil.rmtree(args.cache_dir, ignore_errors=True)
+        print(f"🗑️ Cleared icon cache: {args.cache_dir}")
+        return
+
+    cache = IconCache(args.cache_dir)
+    print(f"🗄️ {args.cache_dir}: {len(cache.index)} entries, "
+          f"{cache.total_bytes() / 1024:.1f} KB")
+
+
+if __name__ == '__main__':
+    main()
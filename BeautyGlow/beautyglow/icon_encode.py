@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+PNG Encoder Profiles for BeautyGlow Icon Scripts
+Named encode profiles (fast local iteration vs. smallest release output)
+with a per-file report of encode time against output size
+"""
+
+import csv
+import io
+import os
+import threading
+import time
+import zlib
+from PIL import Image, ImageChops
+from icon_output import write_bytes
+from icon_trace import span
+
+DEFAULT_REPORT_PATH = os.path.join('.icon_cache', 'encode_report.csv')
+
+# zlib strategies tried by the release profile at maximum compression
+RELEASE_STRATEGIES = {
+    'default': zlib.Z_DEFAULT_STRATEGY,
+    'filtered': zlib.Z_FILTERED,
+    'rle': zlib.Z_RLE,
+    'fixed': zlib.Z_FIXED,
+}
+
+# Each profile lists save() settings to try; the smallest result wins.
+# 'reduce' enables lossless colour-type reductions before encoding.
+PROFILES = {
+    'fast': {
+        'candidates': [{'compress_level': 1}],
+        'reduce': False,
+    },
+    'default': {
+        'candidates': [{'optimize': True}],
+        'reduce': False,
+    },
+    'release': {
+        'candidates': [
+            {'compress_level': 9, 'compress_type': strategy}
+            for strategy in RELEASE_STRATEGIES.values()
+        ],
+        'reduce': True,
+    },
+}
+DEFAULT_PROFILE = 'default'
+
+
+def _strategy_name(settings):
+    """Readable name of the zlib strategy in a candidate's settings"""
+    names = {value: name for name, value in RELEASE_STRATEGIES.items()}
+    return names.get(settings.get('compress_type'), 'optimize')
+
+
+def _is_lossless(original, reduced):
+    """True if reduced converts back to exactly the original pixels"""
+    restored = reduced.convert(original.mode)
+    return ImageChops.difference(original, restored).getbbox() is None
+
+
+def lossless_variants(image):
+    """Return (label, image) pairs that encode the same pixels in smaller colour types"""
+    variants = [('as-is', image)]
+    if image.mode == 'RGBA' and image.getchannel('A').getextrema() == (255, 255):
+        variants.append(('rgb', image.convert('RGB')))
+
+    if image.mode in ('RGB', 'RGBA') and image.getcolors(256) is not None:
+        palette = image.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+        if _is_lossless(image, palette):
+            variants.append(('palette', palette))
+    return variants
+
+
+class PngEncoder:
+    """Encodes icons with a named profile and records time and size per file"""
+
+    def __init__(self, profile=DEFAULT_PROFILE):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown encode profile '{profile}', expected one of {list(PROFILES)}")
+        self.profile = profile
+        self.candidates = PROFILES[profile]['candidates']
+        self.reduce = PROFILES[profile]['reduce']
+        self.records = []
+        self._lock = threading.Lock()
+
+    def settings_key(self):
+        """Description of the encoder used in cache keys"""
+        return {'format': 'PNG', 'profile': self.profile,
+                'candidates': self.candidates, 'reduce': self.reduce}
+
+    def encode(self, image, label=None):
+        """Encode image with every candidate of the profile and return the smallest bytes"""
+        start = time.perf_counter()
+        with span('encode', 'encode', size=image.width, profile=self.profile, path=label):
+            variants = lossless_variants(image) if self.reduce else [('as-is', image)]
+
+            best, best_name, tried = None, None, 0
+            for variant_name, variant in variants:
+                for settings in self.candidates:
+                    buffer = io.BytesIO()
+                    variant.save(buffer, format='PNG', **settings)
+                    data = buffer.getvalue()
+                    tried += 1
+                    if best is None or len(data) < len(best):
+                        best = data
+                        best_name = f"{variant_name}/{_strategy_name(settings)}"
+
+        if label is not None:
+            with self._lock:
+                self.records.append({
+                    'path': label,
+                    'profile': self.profile,
+                    'size': f"{image.width}x{image.height}",
+                    'seconds': round(time.perf_counter() - start, 6),
+                    'bytes': len(best),
+                    'candidates': tried,
+                    'winner': best_name if self.reduce else '',
+                })
+        return best
+
+    def drain_records(self):
+        """Remove and return the records collected so far"""
+        with self._lock:
+            records, self.records = self.records, []
+        return records
+
+    def merge_records(self, records):
+        """Add records collected by another process"""
+        with self._lock:
+            self.records.extend(records)
+
+    def save(self, image, output_path):
+        """Encode image and write it to output_path unless the file already holds those bytes"""
+        return write_bytes(output_path, self.encode(image, label=output_path))
+
+    def write_report(self, report_path=DEFAULT_REPORT_PATH):
+        """Write the per-file encode time / size report as CSV"""
+        if not self.records:
+            return None
+        os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+        with open(report_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.records[0]))
+            writer.writeheader()
+            writer.writerows(self.records)
+        return report_path
+
+    def print_summary(self):
+        """Print total encode time and output size for this run"""
+        if not self.records:
+            return
+        seconds = sum(record['seconds'] for record in self.records)
+        total = sum(record['bytes'] for record in self.records)
+        print(f"🗜️ Encoded {len(self.records)} PNGs with '{self.profile}' profile: "
+              f"{total / 1024:.1f} KB in {seconds:.2f}s")
+
+
+# Encoder shared by every script running in this process
+_active = PngEncoder()
+
+
+def use_profile(profile):
+    """Switch the process-wide encoder to a named profile and return it"""
+    global _active
+    if _active.profile != profile:
+        _active = PngEncoder(profile)
+    return _active
+
+
+def active_encoder():
+    """Return the process-wide encoder"""
+    return _active
+
+
+def drain_records():
+    """Remove and return the records of the process-wide encoder (for pool workers)"""
+    return _active.drain_records()
+
+
+def merge_records(records):
+    """Add records from a pool worker to the process-wide encoder"""
+    _active.merge_records(records)
+
+
+def add_encode_arguments(parser):
+    """Add the shared encoder options to an argparse parser"""
+    parser.add_argument('--profile', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                        help='PNG encode profile: fast for local iteration, release for smallest files')
+    parser.add_argument('--encode-report', default=DEFAULT_REPORT_PATH,
+                        help='CSV file receiving per-file encode time and size')
+
+
+def finish_encoding(args):
+    """Write the encode report and print its summary"""
+    encoder = active_encoder()
+    report_path = encoder.write_report(args.encode_report)
+    encoder.print_summary()
+    if report_path:
+        print(f"   Report: {report_path}")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Fused Icon Enhancement for BeautyGlow
+Applies the sharpness and contrast enhancement of the clean icon script in
+one vectorised NumPy pass, for a whole batch of icon sizes at once
+"""
+
+import argparse
+import time
+from PIL import Image, ImageChops, ImageEnhance
+from icon_sizes import SOURCE_IMAGE
+from icon_trace import span
+
+# NumPy is optional and heavy to import, so it is loaded when the fused
+# engine is first used; without it the Pillow ImageEnhance path runs
+np = None
+_numpy_checked = False
+
+DEFAULT_SHARPNESS = 1.2
+DEFAULT_CONTRAST = 1.1
+
+# Largest per-channel difference from Pillow accepted by --check
+DEFAULT_TOLERANCE = 1
+
+# Weights of ImageFilter.SMOOTH, the degenerate image of ImageEnhance.Sharpness
+SMOOTH_CENTER = 5
+SMOOTH_SCALE = 13
+
+# ITU-R 601-2 luma weights used by Image.convert('L'), in 16-bit fixed point
+LUMA_WEIGHTS = (19595, 38470, 7471)
+
+FUSED_MODES = ('RGB', 'RGBA')
+
+# 'numpy' enhances a batch of sizes in one fused pass; 'pillow' runs ImageEnhance per icon
+ENGINES = ('pillow', 'numpy')
+DEFAULT_ENGINE = 'pillow'
+
+
+def load_numpy():
+    """Import NumPy on first use; return the module, or None if it is not installed"""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+
+def fused_available(image=None):
+    """True if NumPy is installed (and image, when given, has a supported mode)"""
+    return load_numpy() is not None and (image is None or image.mode in FUSED_MODES)
+
+
+def enhance_pillow(image, sharpness=DEFAULT_SHARPNESS, contrast=DEFAULT_CONTRAST):
+    """Reference enhancement with two ImageEnhance passes"""
+    enhanced = ImageEnhance.Sharpness(image).enhance(sharpness)
+    return ImageEnhance.Contrast(enhanced).enhance(contrast)
+
+
+def _blend(degenerate, original, factor):
+    """Image.blend in float32 with its truncating clip back to 8 bits"""
+    result = original - degenerate
+    result *= np.float32(factor)
+    result += degenerate
+    np.clip(result, 0, 255, out=result)
+    return np.trunc(result, out=result)
+
+
+def enhance_batch(images, sharpness=DEFAULT_SHARPNESS, contrast=DEFAULT_CONTRAST):
+    """Enhance several RGB/RGBA images in one pass and return them in order
+
+    The images are stacked on one canvas so the smoothing, blends and clips run
+    as single array operations. Edge pixels, which ImageFilter.SMOOTH leaves
+    untouched and which would otherwise see their neighbours on the canvas, are
+    restored per image afterwards.
+    """
+    if not images:
+        return []
+    if not all(fused_available(image) for image in images):
+        return [enhance_pillow(image, sharpness, contrast) for image in images]
+
+    width = max(image.width for image in images)
+    height = sum(image.height for image in images)
+    canvas = np.zeros((height, width, 3), dtype=np.int16)
+    offsets = []
+    top = 0
+    for image in images:
+        canvas[top:top + image.height, :image.width] = np.asarray(image.convert('RGB'))
+        offsets.append(top)
+        top += image.height
+
+    # Sharpness: blend against the 3x3 SMOOTH filter, rounded like ImagingFilter
+    total = canvas[1:-1, 1:-1] * (SMOOTH_CENTER - 1)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            total += canvas[dy:height - 2 + dy, dx:width - 2 + dx]
+    smooth = canvas.copy()
+    smooth[1:-1, 1:-1] = (total * 2 + SMOOTH_SCALE) // (SMOOTH_SCALE * 2)
+    for image, top in zip(images, offsets):
+        bottom, right = top + image.height, image.width
+        for rows, cols in ((slice(top, top + 1), slice(0, right)),
+                           (slice(bottom - 1, bottom), slice(0, right)),
+                           (slice(top, bottom), slice(0, 1)),
+                           (slice(top, bottom), slice(right - 1, right))):
+            smooth[rows, cols] = canvas[rows, cols]
+    sharp = _blend(smooth.astype(np.float32), canvas.astype(np.float32), sharpness)
+
+    # Contrast: blend against the rounded mean luma of each sharpened image
+    channels = sharp.astype(np.int32)
+    luma = (channels[..., 0] * LUMA_WEIGHTS[0] + channels[..., 1] * LUMA_WEIGHTS[1]
+            + channels[..., 2] * LUMA_WEIGHTS[2] + 0x8000) >> 16
+    means = np.zeros((height, 1, 1), dtype=np.float32)
+    for image, top in zip(images, offsets):
+        region = luma[top:top + image.height, :image.width]
+        means[top:top + image.height] = int(region.sum() / region.size + 0.5)
+    result = _blend(np.broadcast_to(means, sharp.shape), sharp, contrast).astype(np.uint8)
+
+    enhanced = []
+    for image, top in zip(images, offsets):
+        rgb = Image.fromarray(np.ascontiguousarray(result[top:top + image.height, :image.width]), 'RGB')
+        if image.mode == 'RGBA':
+            rgb.putalpha(image.getchannel('A'))
+        enhanced.append(rgb)
+    return enhanced
+
+
+def enhance(image, sharpness=DEFAULT_SHARPNESS, contrast=DEFAULT_CONTRAST):
+    """Enhance one image with the fused kernel when available"""
+    return enhance_batch([image], sharpness, contrast)[0]
+
+
+def enhance_sizes(image, sizes, sharpness=DEFAULT_SHARPNESS, contrast=DEFAULT_CONTRAST,
+                  engine=None):
+    """Resize image to every size and enhance the results; return {size: image}"""
+    engine = engine or _engine
+    with span('resize batch', 'resize', sizes=list(sizes)):
+        resized = [image.resize((size, size), Image.LANCZOS) for size in sizes]
+    with span('enhance batch', 'enhance', sizes=list(sizes), engine=engine):
+        if engine == 'numpy':
+            enhanced = enhance_batch(resized, sharpness, contrast)
+        else:
+            enhanced = [enhance_pillow(icon, sharpness, contrast) for icon in resized]
+    return dict(zip(sizes, enhanced))
+
+
+# Engine shared by every script running in this process
+_engine = DEFAULT_ENGINE
+
+
+def use_engine(engine):
+    """Switch the process-wide enhancement engine and return the one in use"""
+    global _engine
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown enhancement engine '{engine}', expected one of {ENGINES}")
+    if engine == 'numpy' and load_numpy() is None:
+        print("⚠️ NumPy is not installed; using the Pillow enhancement engine")
+        engine = 'pillow'
+    _engine = engine
+    return _engine
+
+
+def active_engine():
+    """Return the process-wide enhancement engine"""
+    return _engine
+
+
+def add_enhance_arguments(parser):
+    """Add the shared enhancement options to an argparse parser"""
+    parser.add_argument('--enhance-engine', choices=ENGINES, default=DEFAULT_ENGINE,
+                        help='Enhance icons per file with Pillow or in one NumPy batch')
+
+
+def max_difference(first, second):
+    """Largest per-channel difference between two images of the same size and mode"""
+    return max(high for _, high in ImageChops.difference(first, second).getextrema())
+
+
+def check(source_img, sizes, sharpness=DEFAULT_SHARPNESS, contrast=DEFAULT_CONTRAST,
+          tolerance=DEFAULT_TOLERANCE):
+    """Compare the fused kernel with Pillow for every size; return True if all match"""
+    resized = [source_img.resize((size, size), Image.LANCZOS) for size in sizes]
+
+    start = time.perf_counter()
+    expected = [enhance_pillow(image, sharpness, contrast) for image in resized]
+    pillow_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = enhance_batch(resized, sharpness, contrast)
+    fused_time = time.perf_counter() - start
+
+    ok = True
+    print(f"{'Size':>6} {'Max diff':>9}")
+    for size, want, got in zip(sizes, expected, actual):
+        diff = max_difference(want, got)
+        ok = ok and diff <= tolerance
+        print(f"{size:>6} {diff:>9}{'' if diff <= tolerance else '  ✗ over tolerance'}")
+    print(f"\n⏱️ Pillow: {pillow_time * 1000:.1f} ms, fused batch: {fused_time * 1000:.1f} ms")
+    return ok
+
+
+def main():
+    """Check the fused kernel against Pillow's ImageEnhance"""
+    parser = argparse.ArgumentParser(description="Check the fused icon enhancement kernel")
+    parser.add_argument('--source', default=SOURCE_IMAGE, help='Source image to enhance')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[24, 36, 48, 72, 96, 144, 192],
+                        help='Icon sizes to compare')
+    parser.add_argument('--tolerance', type=int, default=DEFAULT_TOLERANCE,
+                        help='Largest accepted per-channel difference')
+    args = parser.parse_args()
+
+    if load_numpy() is None:
+        print("⚠️ NumPy is not installed; the Pillow enhancement path is used")
+        return 0
+
+    with Image.open(args.source) as image:
+        source_img = image.convert('RGBA')
+    if check(source_img, args.sizes, tolerance=args.tolerance):
+        print(f"✅ Fused kernel matches Pillow within {args.tolerance}")
+        return 0
+    print("❌ Fused kernel differs from Pillow")
+    return 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
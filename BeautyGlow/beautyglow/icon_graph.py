@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Declarative Icon Build Graph for BeautyGlow
+Expands a manifest of icon targets into source → transform → encode →
+destination nodes, rejects conflicting writes and renders every unique node
+once, in parallel, writing each destination exactly once per run
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from PIL import Image
+from icon_cache import IconCache, add_cache_arguments, cache_from_args
+from icon_encode import (active_encoder, add_encode_arguments, drain_records, finish_encoding, merge_records,
+                         use_profile)
+from icon_enhance import (DEFAULT_CONTRAST, DEFAULT_SHARPNESS, active_engine, add_enhance_arguments,
+                          enhance_sizes, use_engine)
+import icon_output
+from icon_output import add_output_arguments, outputs_from_args, write_bytes
+from icon_parallel import add_parallel_arguments, print_worker_timings, run_jobs, workers_from_args
+from icon_primitives import MASK_SUPERSAMPLE, WHITE, circular_mask, encoded_background
+import icon_primitives
+from icon_pyramid import DEFAULT_MIN_RATIO, ResizePyramid, resize_icon
+from icon_source import add_source_arguments, attach_raster, persist_dir_from_args, shared_source
+import icon_trace
+from icon_trace import add_trace_arguments, finish_tracing, progress, span, tracing_from_args
+from icon_sizes import (ADAPTIVE_ICON_SIZE, ANDROID_DRAWABLE_SIZES, ANDROID_MIPMAP_SIZES,
+                        ANDROID_NOTIFICATION_SIZES, ANDROID_RES_DIR, IOS_ICON_DIR, IOS_ICON_SIZES,
+                        IOS_LAUNCH_DIR, LAUNCH_IMAGE_SIZE, MACOS_ICON_DIR, MACOS_ICON_SIZES, SOURCE_IMAGE,
+                        WEB_ICON_DIR, WEB_ICON_SIZES)
+
+# Named size tables the manifest rules expand over ({key} is the table key)
+SIZE_TABLES = {
+    'android_mipmap': ANDROID_MIPMAP_SIZES,
+    'android_drawable': ANDROID_DRAWABLE_SIZES,
+    'android_notification': ANDROID_NOTIFICATION_SIZES,
+    'ios': IOS_ICON_SIZES,
+    'macos': MACOS_ICON_SIZES,
+    'web': WEB_ICON_SIZES,
+}
+
+# Transforms and the description each one contributes to the cache key
+TRANSFORMS = {
+    'pyramid': {'op': 'plain', 'resample': 'lanczos', 'pyramid': DEFAULT_MIN_RATIO},
+    'circular': {'op': 'circular', 'resample': 'lanczos', 'pyramid': DEFAULT_MIN_RATIO,
+                 'mask_supersample': MASK_SUPERSAMPLE},
+    'lanczos': {'op': 'plain', 'resample': 'lanczos', 'pyramid': None},
+    'enhanced': {'op': 'enhanced', 'resample': 'lanczos', 'sharpness': DEFAULT_SHARPNESS,
+                 'contrast': DEFAULT_CONTRAST},
+    'background': {'op': 'background', 'color': list(WHITE)},
+}
+
+# Transforms derived from the shared resize pyramid rather than the source itself
+PYRAMID_TRANSFORMS = ('pyramid', 'circular')
+
+# Every size the 'enhanced' transform renders, enhanced together as one batch
+ENHANCED_SIZES = tuple(sorted(set(ANDROID_MIPMAP_SIZES.values()) | set(ANDROID_DRAWABLE_SIZES.values())
+                              | set(ANDROID_NOTIFICATION_SIZES.values())))
+
+_RES = ANDROID_RES_DIR
+
+# What each update script produces. A rule writes path (formatted with each
+# key of its size table) at the table size, or at a fixed size when given;
+# existing_dirs skips destinations whose directory does not exist.
+DEFAULT_MANIFEST = {
+    'source': SOURCE_IMAGE,
+    'targets': {
+        'app': [
+            {'path': _RES + '/{key}/ic_launcher.png', 'sizes': 'android_mipmap', 'transform': 'pyramid'},
+            {'path': _RES + '/{key}/ic_notification.png', 'sizes': 'android_drawable',
+             'transform': 'circular'},
+            {'path': IOS_ICON_DIR + '/{key}', 'sizes': 'ios', 'transform': 'pyramid'},
+            {'path': MACOS_ICON_DIR + '/{key}', 'sizes': 'macos', 'transform': 'pyramid'},
+            {'path': WEB_ICON_DIR + '/{key}', 'sizes': 'web', 'transform': 'pyramid'},
+            {'path': _RES + '/{key}/logo.png', 'sizes': 'android_drawable', 'transform': 'pyramid'},
+            {'path': IOS_LAUNCH_DIR + '/LaunchImage.png', 'size': LAUNCH_IMAGE_SIZE,
+             'transform': 'pyramid', 'existing_dirs': True},
+            {'path': _RES + '/{key}/ic_launcher_foreground.png', 'sizes': 'android_mipmap',
+             'size': ADAPTIVE_ICON_SIZE, 'transform': 'pyramid'},
+            {'path': _RES + '/{key}/ic_launcher_background.png', 'sizes': 'android_mipmap',
+             'size': ADAPTIVE_ICON_SIZE, 'transform': 'background'},
+        ],
+        'clean': [
+            {'path': _RES + '/{key}/ic_launcher.png', 'sizes': 'android_mipmap',
+             'transform': 'enhanced', 'existing_dirs': True},
+            {'path': _RES + '/{key}/ic_launcher_foreground.png', 'sizes': 'android_mipmap',
+             'transform': 'enhanced', 'existing_dirs': True},
+            {'path': _RES + '/{key}/ic_launcher_background.png', 'sizes': 'android_mipmap',
+             'transform': 'background', 'existing_dirs': True},
+            {'path': _RES + '/{key}/logo.png', 'sizes': 'android_drawable',
+             'transform': 'enhanced', 'existing_dirs': True},
+            {'path': _RES + '/{key}/ic_notification.png', 'sizes': 'android_notification',
+             'transform': 'enhanced', 'existing_dirs': True},
+        ],
+        'launcher': [
+            {'path': _RES + '/{key}/ic_launcher.png', 'sizes': 'android_mipmap',
+             'transform': 'lanczos', 'existing_dirs': True},
+            {'path': _RES + '/{key}/ic_launcher_foreground.png', 'sizes': 'android_mipmap',
+             'size': ADAPTIVE_ICON_SIZE, 'transform': 'lanczos', 'existing_dirs': True},
+            {'path': _RES + '/{key}/ic_launcher_background.png', 'sizes': 'android_mipmap',
+             'size': ADAPTIVE_ICON_SIZE, 'transform': 'background', 'existing_dirs': True},
+        ],
+    },
+}
+
+DEFAULT_TARGETS = ['app']
+
+# Outcomes of each destination
+WRITTEN = 'written'
+CACHED = 'cached'
+FAILED = 'failed'
+
+
+def load_manifest(manifest_path=None):
+    """The default manifest, with targets added or replaced by a JSON manifest file"""
+    manifest = {'source': DEFAULT_MANIFEST['source'], 'targets': dict(DEFAULT_MANIFEST['targets'])}
+    if manifest_path:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            extra = json.load(f)
+        manifest['source'] = extra.get('source', manifest['source'])
+        manifest['targets'].update(extra.get('targets', {}))
+    return manifest
+
+
+def expand_rule(rule):
+    """Return the (path, size) destinations of one manifest rule"""
+    table = rule.get('sizes')
+    if isinstance(table, str):
+        table = SIZE_TABLES[table]
+    if table is None:
+        return [(os.path.normpath(rule['path']), rule['size'])]
+    return [(os.path.normpath(rule['path'].format(key=key)), rule.get('size', size))
+            for key, size in table.items()]
+
+
+class BuildGraph:
+    """Destinations grouped under the unique (size, transform) node that renders them
+
+    Manifest paths are relative to root. With existing_dirs every rule skips
+    destinations whose directory does not exist, for projects that do not
+    have every platform.
+    """
+
+    def __init__(self, source, root='.', existing_dirs=False):
+        self.root = root
+        self.source = os.path.normpath(os.path.join(root, source))
+        self.existing_dirs = existing_dirs
+        self.destinations = {}
+        self.owners = {}
+        self.conflicts = []
+        self.skipped = []
+
+    def add(self, target, rule):
+        """Add every destination of a manifest rule owned by target"""
+        transform = rule['transform']
+        if transform not in TRANSFORMS:
+            raise ValueError(f"Unknown transform '{transform}', expected one of {list(TRANSFORMS)}")
+        for path, size in expand_rule(rule):
+            path = os.path.normpath(os.path.join(self.root, path))
+            if (self.existing_dirs or rule.get('existing_dirs')) and not os.path.isdir(os.path.dirname(path)):
+                self.skipped.append(path)
+                continue
+            node = (size, transform)
+            previous = self.destinations.get(path)
+            if previous is not None and previous != node:
+                self.conflicts.append((path, self.owners[path], previous, target, node))
+            self.destinations[path] = node
+            self.owners[path] = target
+
+    def nodes(self):
+        """{(size, transform): [destination paths]} in first-seen order"""
+        nodes = {}
+        for path, node in self.destinations.items():
+            nodes.setdefault(node, []).append(path)
+        return nodes
+
+    def pyramid_sizes(self):
+        """Sizes the resize pyramid has to serve, smallest first"""
+        return sorted({size for size, transform in self.destinations.values() if transform in PYRAMID_TRANSFORMS})
+
+    def print_conflicts(self):
+        """Print every destination two rules want to write differently"""
+        print(f"\n❌ Conflicting writes: {len(self.conflicts)}")
+        for path, first, (first_size, first_op), second, (second_size, second_op) in self.conflicts:
+            print(f"   {path}")
+            print(f"      {first}: {first_size}x{first_size} {first_op}")
+            print(f"      {second}: {second_size}x{second_size} {second_op}")
+
+
+def build_graph(manifest, targets, root='.', source=None, existing_dirs=False):
+    """Expand the named targets of a manifest into one graph of the project at root"""
+    graph = BuildGraph(source or manifest['source'], root, existing_dirs)
+    for target in targets:
+        if target not in manifest['targets']:
+            raise ValueError(f"Unknown target '{target}', expected one of {list(manifest['targets'])}")
+        for rule in manifest['targets'][target]:
+            graph.add(target, rule)
+    return graph
+
+
+def render_icon(source, size, make_circular=False):
+    """Resize the source (or pyramid) to size with an optional anti-aliased circular mask"""
+    resized = resize_icon(source, size)
+    if not make_circular:
+        return resized
+    output = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    output.paste(resized, (0, 0))
+    output.putalpha(circular_mask(size))
+    return output
+
+
+def enhanced_icon(source_img, size):
+    """Resize to size and apply the sharpness and contrast enhancement of the clean icons"""
+    return enhance_sizes(source_img, [size], DEFAULT_SHARPNESS, DEFAULT_CONTRAST, engine='pillow')[size]
+
+
+class GraphSources:
+    """Source raster, resize pyramid and encoder shared by every node of a run"""
+
+    def __init__(self, source_img, pyramid_sizes):
+        self.source_img = source_img
+        self.pyramid_sizes = sorted(pyramid_sizes)
+        self.pyramid = ResizePyramid(source_img, pyramid_sizes) if source_img is not None and pyramid_sizes else None
+        self.encoder = active_encoder()
+        self._enhanced = None
+        self._enhanced_lock = threading.Lock()
+
+    def enhanced(self, size):
+        """Enhanced icon of one size; the NumPy engine renders every enhanced size of this source at once"""
+        if active_engine() != 'numpy' or size not in ENHANCED_SIZES:
+            return enhanced_icon(self.source_img, size)
+        with self._enhanced_lock:
+            if self._enhanced is None:
+                # Fused NumPy kernel over every enhanced size, byte-identical to Pillow
+                self._enhanced = enhance_sizes(self.source_img, ENHANCED_SIZES, DEFAULT_SHARPNESS, DEFAULT_CONTRAST)
+        return self._enhanced[size].copy()
+
+    def render(self, size, transform):
+        """Render the image of one (size, transform) node"""
+        if transform in PYRAMID_TRANSFORMS:
+            return render_icon(self.pyramid, size, make_circular=(transform == 'circular'))
+        if transform == 'enhanced':
+            return self.enhanced(size)
+        with span('resize', 'resize', size=size):
+            return self.source_img.resize((size, size), Image.LANCZOS)
+
+
+def encode_node(sources, size, transform, label=None):
+    """Return the encoded PNG bytes of one (size, transform) node"""
+    if transform == 'background':
+        return encoded_background(size, sources.encoder)
+    return sources.encoder.encode(sources.render(size, transform), label=label)
+
+
+def write_node(data, paths):
+    """Write a node's bytes to each of its destinations; return how many changed"""
+    written = 0
+    for path in paths:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        written += write_bytes(path, data)
+    return written
+
+
+def render_node(sources, job):
+    """Render and encode one node once, then write it to each of its destinations"""
+    label, size, transform, paths, source = job
+    with span('node', 'job', path=label, size=size, transform=transform, outputs=len(paths)):
+        write_node(encode_node(sources[source], size, transform, label), paths)
+    return True
+
+
+# GraphSources of each source in a process worker, built from its spec on first use
+_process_sources = {}
+
+
+def render_node_in_process(specs, job):
+    """render_node for a process worker; specs maps each source to (image or raster path, pyramid sizes)"""
+    source = job[4]
+    if source not in _process_sources:
+        source_img, pyramid_sizes = specs[source]
+        if isinstance(source_img, str):
+            source_img = attach_raster(source_img)
+        _process_sources[source] = GraphSources(source_img, pyramid_sizes)
+    return render_node(_process_sources, job)
+
+
+def setup_worker(profile, engine, trace_enabled, always_write):
+    """Match a pool worker's encoder, enhancement engine, tracer and output stage to the parent process"""
+    use_profile(profile)
+    use_engine(engine)
+    icon_trace.configure(enabled=trace_enabled, quiet=True)
+    icon_output.outputs.always_write = always_write
+    # Forked workers inherit the parent's records; only report their own
+    collect_worker_stats()
+
+
+def collect_worker_stats():
+    """Drain the encode records, trace events and output counts of a pool worker"""
+    return drain_records(), icon_trace.drain_events(), icon_output.drain_counts()
+
+
+def merge_worker_stats(stats):
+    """Add a pool worker's encode records, trace events and output counts to this process"""
+    records, events, counts = stats
+    merge_records(records)
+    icon_trace.merge_events(events)
+    icon_output.merge_counts(counts)
+
+
+def pyramid_parents(node, pyramid_sizes):
+    """Pyramid levels a node can be derived through; its pixels depend on which of them exist"""
+    size, transform = node
+    if transform not in PYRAMID_TRANSFORMS:
+        return ()
+    # Levels are built largest first, each from the smallest larger level far enough above it
+    return tuple(level for level in sorted(pyramid_sizes) if level > size)
+
+
+def node_cache_key(source_digest, node, pyramid_sizes=()):
+    """Cache key of a node's encoded output, given the levels of the pyramid it is rendered from"""
+    size, transform = node
+    description = TRANSFORMS[transform]
+    parents = pyramid_parents(node, pyramid_sizes)
+    if parents:
+        description = dict(description, levels=list(parents))
+    return IconCache.key(source_digest, size, description, active_encoder().settings_key())
+
+
+def run_graphs(graphs, cache=None, workers=1, persist_dir=None, executor='thread'):
+    """Render the nodes of several graphs on one worker pool and return {path: outcome}
+
+    Graphs are typically different projects; each source is decoded once,
+    at the scale the largest node rendered from it needs, no matter how many
+    graphs use it. Process workers attach to the persisted raster of a
+    source when there is one instead of unpickling its pixels.
+    """
+    outcomes = {}
+    pending = []
+    pyramid_sizes = {}
+    max_sizes = {}
+    for graph in graphs:
+        # Levels depend on the sizes requested, so build them for every node, cached or not
+        pyramid_sizes.setdefault(graph.source, set()).update(graph.pyramid_sizes())
+        max_sizes[graph.source] = max([max_sizes.get(graph.source, 0)] + [
+            size for size, transform in graph.nodes() if transform != 'background'])
+    loaders = {source: shared_source(source, persist_dir=persist_dir, max_size=max_size or None)
+               for source, max_size in max_sizes.items()}
+
+    for graph in graphs:
+        nodes = graph.nodes()
+        source_digest = loaders[graph.source].digest() if cache is not None else None
+        for node, paths in nodes.items():
+            if cache is not None:
+                key = node_cache_key(source_digest, node, pyramid_sizes[graph.source])
+                if all([cache.restore(key, path) for path in paths]):
+                    outcomes.update(dict.fromkeys(paths, CACHED))
+                    continue
+            pending.append((paths[0], node[0], node[1], tuple(paths), graph.source))
+
+    if pending:
+        specs = {}
+        for source in dict.fromkeys(job[4] for job in pending):
+            needs_source = any(job[2] != 'background' for job in pending if job[4] == source)
+            source_img = loaders[source].image() if needs_source else None
+            specs[source] = (source_img, sorted(pyramid_sizes[source]))
+
+        print(f"\n🔄 Rendering {len(pending)} unique nodes for "
+              f"{sum(len(job[3]) for job in pending)} destinations on {workers} {executor} workers...")
+        start = time.perf_counter()
+        if executor == 'process':
+            specs = {source: (loaders[source].raster or source_img, sizes)
+                     for source, (source_img, sizes) in specs.items()}
+            results, timings = run_jobs(specs, pending, render_node_in_process, workers=workers,
+                                        executor=executor, setup=setup_worker,
+                                        setup_args=(active_encoder().profile, active_engine(),
+                                                    icon_trace.tracer.enabled, icon_output.outputs.always_write),
+                                        collect=collect_worker_stats, merge=merge_worker_stats)
+        else:
+            sources = {source: GraphSources(*spec) for source, spec in specs.items()}
+            results, timings = run_jobs(sources, pending, render_node, workers=workers, executor=executor)
+        if workers > 1:
+            print_worker_timings(timings, time.perf_counter() - start)
+        for job, ok in zip(pending, results):
+            outcomes.update(dict.fromkeys(job[3], WRITTEN if ok else FAILED))
+            if ok and cache is not None:
+                cache.store(node_cache_key(loaders[job[4]].digest(), (job[1], job[2]), pyramid_sizes[job[4]]),
+                            job[0])
+    return outcomes
+
+
+def run_graph(graph, cache=None, workers=1, persist_dir=None, executor='thread'):
+    """Render every node not restored from the cache and return {path: outcome}"""
+    return run_graphs([graph], cache, workers, persist_dir, executor)
+
+
+def print_outcomes(graph, outcomes):
+    """Print one line per destination and the graph totals"""
+    for path, (size, transform) in graph.destinations.items():
+        outcome = outcomes.get(path)
+        if outcome == FAILED:
+            print(f"✗ Failed {path} ({size}x{size} {transform})")
+        else:
+            note = ' from cache' if outcome == CACHED else ''
+            progress(f"✓ {path} ({size}x{size} {transform}){note}")
+
+    nodes = graph.nodes()
+    destinations = len(graph.destinations)
+    print(f"\n🕸️ Build graph: {destinations} destinations from {len(nodes)} unique nodes "
+          f"({destinations - len(nodes)} renders shared), "
+          f"{sum(1 for outcome in outcomes.values() if outcome == CACHED)} from cache")
+    if graph.skipped:
+        print(f"   Skipped {len(graph.skipped)} destinations whose directory does not exist")
+
+
+def build_targets(targets, manifest=None, cache=None, workers=1, persist_dir=None, executor='thread'):
+    """Build the named targets once each; return False on conflicts or failures"""
+    graph = build_graph(manifest or load_manifest(), targets)
+    if graph.conflicts:
+        graph.print_conflicts()
+        print("❌ Nothing was written; build these targets separately or fix the manifest")
+        return False
+    if not os.path.exists(graph.source):
+        print(f"❌ Source image not found: {graph.source}")
+        return False
+
+    start = time.perf_counter()
+    outcomes = run_graph(graph, cache, workers, persist_dir, executor)
+    print_outcomes(graph, outcomes)
+    print(f"   Built in {time.perf_counter() - start:.2f}s")
+    return FAILED not in outcomes.values()
+
+
+def main():
+    """Build icon targets from the manifest, or list destinations and conflicts"""
+    parser = argparse.ArgumentParser(description="Build BeautyGlow icons from a declarative manifest")
+    parser.add_argument('--target', '-t', action='append', dest='targets',
+                        help=f"Target to build (repeatable, default: {', '.join(DEFAULT_TARGETS)})")
+    parser.add_argument('--manifest', help='JSON manifest adding or replacing targets')
+    parser.add_argument('--check', action='store_true',
+                        help='Only expand the targets and report conflicting writes')
+    add_parallel_arguments(parser)
+    add_cache_arguments(parser)
+    add_source_arguments(parser)
+    add_encode_arguments(parser)
+    add_enhance_arguments(parser)
+    add_output_arguments(parser)
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+
+    print("🕸️ BeautyGlow Icon Build Graph")
+    print("=" * 50)
+    manifest = load_manifest(args.manifest)
+    targets = args.targets or DEFAULT_TARGETS
+
+    if args.check:
+        graph = build_graph(manifest, targets)
+        nodes = graph.nodes()
+        print(f"   Targets: {', '.join(targets)}")
+        print(f"   {len(graph.destinations)} destinations from {len(nodes)} unique nodes")
+        if graph.conflicts:
+            graph.print_conflicts()
+            return 1
+        print("✅ No conflicting writes")
+        return 0
+
+    use_profile(args.profile)
+    use_engine(args.enhance_engine)
+    tracing_from_args(args)
+    outputs = outputs_from_args(args)
+    cache = cache_from_args(args)
+    ok = build_targets(targets, manifest, cache, workers_from_args(args), persist_dir_from_args(args),
+                       args.executor)
+
+    if cache is not None:
+        cache.save()
+        cache.print_summary()
+    outputs.print_summary()
+    icon_primitives.print_summary()
+    finish_encoding(args)
+    finish_tracing(args)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
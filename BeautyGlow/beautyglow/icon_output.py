@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Write-If-Changed Output for BeautyGlow Icon Scripts
+Compares new output bytes with the existing file before writing, so icons
+that did not change keep their mtime and Gradle/Xcode incremental builds stay warm
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from icon_trace import span
+
+LINK_MODES = ('copy', 'hardlink', 'reflink')
+
+# ioctl request for a copy-on-write clone (Linux btrfs/XFS)
+FICLONE = 0x40049409
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OutputStats:
+    """Counts outputs written and outputs left untouched because they were identical"""
+
+    def __init__(self):
+        self.always_write = False
+        self.written = 0
+        self.unchanged = 0
+        self._lock = threading.Lock()
+
+    def count(self, written):
+        """Record one output as written or unchanged"""
+        with self._lock:
+            if written:
+                self.written += 1
+            else:
+                self.unchanged += 1
+
+    def drain(self):
+        """Remove and return the counts collected so far"""
+        with self._lock:
+            counts = (self.written, self.unchanged)
+            self.written = self.unchanged = 0
+        return counts
+
+    def merge(self, counts):
+        """Add counts collected by another process"""
+        with self._lock:
+            self.written += counts[0]
+            self.unchanged += counts[1]
+
+    def print_summary(self):
+        """Print how many outputs were written and how many were left untouched"""
+        total = self.written + self.unchanged
+        if total:
+            print(f"\n💾 Outputs: {self.written} written, {self.unchanged} unchanged "
+                  f"(mtimes preserved)")
+
+
+# Output counters shared by every script running in this process
+outputs = OutputStats()
+
+
+def same_bytes(output_path, data):
+    """True if output_path already holds exactly data"""
+    try:
+        if os.path.getsize(output_path) != len(data):
+            return False
+    except OSError:
+        return False
+    return file_digest(output_path) == hashlib.sha256(data).hexdigest()
+
+
+def same_file(source_path, output_path):
+    """True if output_path already holds the same bytes as source_path"""
+    try:
+        if os.path.samefile(source_path, output_path):
+            return True
+        if os.path.getsize(source_path) != os.path.getsize(output_path):
+            return False
+    except OSError:
+        return False
+    return file_digest(source_path) == file_digest(output_path)
+
+
+def write_bytes(output_path, data):
+    """Write data to output_path unless it already holds those bytes; return True if written
+
+    The new file replaces the old one atomically, so a hard-linked copy of the
+    old output elsewhere is never rewritten in place.
+    """
+    with span('write', 'write', path=output_path, bytes=len(data)):
+        if not outputs.always_write and same_bytes(output_path, data):
+            outputs.count(False)
+            return False
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, output_path)
+    outputs.count(True)
+    return True
+
+
+def place_file(source_path, output_path, link='copy'):
+    """Put a copy of source_path at output_path by copy, hard link or reflink
+
+    Links fall back to a plain copy when the filesystem does not support them.
+    An output that already holds the same bytes is left untouched. Returns
+    True if output_path was written.
+    """
+    with span('place', 'write', path=output_path, link=link):
+        if not outputs.always_write and same_file(source_path, output_path):
+            outputs.count(False)
+            return False
+        _place_file(source_path, output_path, link)
+    outputs.count(True)
+    return True
+
+
+def _place_file(source_path, output_path, link):
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    if os.path.exists(output_path):
+        os.remove(output_path)
+
+    if link == 'hardlink':
+        try:
+            os.link(source_path, output_path)
+            return
+        except OSError:
+            pass
+    elif link == 'reflink':
+        try:
+            import fcntl
+            with open(source_path, 'rb') as src, open(output_path, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return
+        except (ImportError, OSError):
+            pass
+    shutil.copyfile(source_path, output_path)
+
+
+def drain_counts():
+    """Remove and return the process-wide output counts (for pool workers)"""
+    return outputs.drain()
+
+
+def merge_counts(counts):
+    """Add output counts from a pool worker to the process-wide counters"""
+    outputs.merge(counts)
+
+
+def add_output_arguments(parser):
+    """Add the shared output options to an argparse parser"""
+    parser.add_argument('--always-write', action='store_true',
+                        help='Rewrite outputs even when their bytes are unchanged')
+
+
+def outputs_from_args(args):
+    """Configure the process-wide output stage for parsed arguments and return it"""
+    outputs.always_write = args.always_write
+    return outputs
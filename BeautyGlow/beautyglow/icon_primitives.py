@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Icon Building Block Cache for BeautyGlow
+Bounded LRU cache of derived primitives (circular masks, solid backgrounds
+and their encoded PNG bytes) so they are built once per run, not per icon
+"""
+
+import threading
+from collections import OrderedDict
+from PIL import Image, ImageDraw
+
+DEFAULT_MAX_ENTRIES = 128
+
+# Masks are drawn at this multiple of the target size and downsampled,
+# which gives the circle an anti-aliased edge
+MASK_SUPERSAMPLE = 4
+
+WHITE = (255, 255, 255, 255)
+
+
+class PrimitiveCache:
+    """Thread-safe LRU cache with hit/miss counters"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the cached value for key, calling build() on a miss"""
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+
+        value = build()
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Primitives shared by every script running in this process
+primitives = PrimitiveCache()
+
+
+def circular_mask(size, supersample=MASK_SUPERSAMPLE):
+    """Return a cached 'L' mask with a filled circle; do not modify the result"""
+    def build():
+        scaled = size * supersample
+        mask = Image.new('L', (scaled, scaled), 0)
+        ImageDraw.Draw(mask).ellipse((0, 0, scaled, scaled), fill=255)
+        if supersample > 1:
+            mask = mask.resize((size, size), Image.LANCZOS)
+        return mask
+
+    return primitives.get(('mask', size, supersample), build)
+
+
+def solid_background(size, color=WHITE):
+    """Return a cached solid RGBA canvas; do not modify the result"""
+    return primitives.get(
+        ('background', size, tuple(color)),
+        lambda: Image.new('RGBA', (size, size), tuple(color)),
+    )
+
+
+def encoded_background(size, encoder, color=WHITE):
+    """Return the cached encoded bytes of a solid canvas for an icon_encode.PngEncoder"""
+    return primitives.get(
+        ('encoded-background', size, tuple(color), encoder.profile),
+        lambda: encoder.encode(solid_background(size, color)),
+    )
+
+
+def print_summary():
+    """Print primitive cache hit/miss counts"""
+    total = primitives.hits + primitives.misses
+    if total:
+        print(f"🧩 Primitive cache: {primitives.hits} hits, {primitives.misses} misses, "
+              f"{len(primitives.entries)} entries")
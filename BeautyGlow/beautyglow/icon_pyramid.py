@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Resize Pyramid for BeautyGlow Icon Generation
+Derives every icon size from the nearest larger cached intermediate
+instead of resampling the full-resolution master for each target
+"""
+
+import argparse
+import os
+from PIL import Image, ImageChops, ImageStat
+from icon_trace import span
+
+# A level is only reused as a parent when it is at least this many times
+# larger than the requested size; smaller steps accumulate visible blur
+DEFAULT_MIN_RATIO = 2.0
+
+# Mean absolute per-channel error (0-255 scale) allowed against a direct
+# LANCZOS resize of the master before the pyramid output is rejected
+DEFAULT_ERROR_BOUND = 2.0
+
+
+class ResizePyramid:
+    """Cache of resized intermediates, each derived from the nearest larger level"""
+
+    def __init__(self, source_img, sizes=(), min_ratio=DEFAULT_MIN_RATIO,
+                 resample=Image.LANCZOS):
+        self.source_img = source_img
+        self.min_ratio = min_ratio
+        self.resample = resample
+        self.levels = {}
+        self.parents = {}
+        self.source_edge = min(source_img.size)
+        if sizes:
+            self.build(sizes)
+
+    def build(self, sizes):
+        """Populate the pyramid from the largest requested size downwards"""
+        for size in sorted(set(sizes), reverse=True):
+            self.get(size)
+        return self
+
+    def nearest_parent(self, size):
+        """Return the smallest cached level usable as a parent for size, or None"""
+        candidates = [
+            level for level in self.levels
+            if size * self.min_ratio <= level <= self.source_edge
+        ]
+        return min(candidates) if candidates else None
+
+    def get(self, size):
+        """Return the square icon raster for size, deriving and caching it if needed"""
+        if size in self.levels:
+            return self.levels[size]
+
+        parent = self.nearest_parent(size)
+        base = self.source_img if parent is None else self.levels[parent]
+        with span('resize level', 'resize', size=size, parent=parent):
+            resized = base.resize((size, size), self.resample)
+
+        self.levels[size] = resized
+        self.parents[size] = parent
+        return resized
+
+    def error_report(self, bound=DEFAULT_ERROR_BOUND):
+        """Compare every cached level against a direct resize of the master"""
+        report = []
+        for size in sorted(self.levels, reverse=True):
+            direct = self.source_img.resize((size, size), self.resample)
+            diff = ImageChops.difference(self.levels[size], direct)
+            mean_error = sum(ImageStat.Stat(diff).mean) / len(diff.getbands())
+            max_error = max(high for _, high in diff.getextrema())
+            report.append({
+                'size': size,
+                'parent': self.parents[size],
+                'mean_error': mean_error,
+                'max_error': max_error,
+                'within_bound': mean_error <= bound,
+            })
+        return report
+
+
+def resize_icon(source_img, size):
+    """Resize from a pyramid when one is given, otherwise from the image directly"""
+    if isinstance(source_img, ResizePyramid):
+        # Copy so callers can save or modify the result without touching the cache
+        return source_img.get(size).copy()
+    with span('resize', 'resize', size=size):
+        return source_img.resize((size, size), Image.LANCZOS)
+
+
+def print_error_report(report, bound=DEFAULT_ERROR_BOUND):
+    """Print the pyramid error report and return True if every level is within bound"""
+    print(f"\n📐 Resize Pyramid Error Report (bound: mean ≤ {bound:.2f})")
+    print(f"   {'size':>6}  {'parent':>8}  {'mean':>7}  {'max':>5}")
+    for row in report:
+        parent = 'master' if row['parent'] is None else str(row['parent'])
+        status = '✓' if row['within_bound'] else '✗'
+        print(f" {status} {row['size']:>6}  {parent:>8}  "
+              f"{row['mean_error']:>7.3f}  {row['max_error']:>5}")
+
+    derived = sum(1 for row in report if row['parent'] is not None)
+    failed = [row['size'] for row in report if not row['within_bound']]
+    print(f"\n📊 {derived}/{len(report)} sizes derived from cached intermediates")
+    if failed:
+        print(f"❌ Sizes outside error bound: {failed}")
+        return False
+    print("✅ All sizes within error bound of direct resampling")
+    return True
+
+
+def main():
+    """Build a pyramid for every icon size and report its error against direct resampling"""
+    from icon_sizes import SOURCE_IMAGE, all_icon_sizes
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', default=SOURCE_IMAGE, help='Source logo image')
+    parser.add_argument('--min-ratio', type=float, default=DEFAULT_MIN_RATIO,
+                        help='Minimum parent/target size ratio for reusing a level')
+    parser.add_argument('--bound', type=float, default=DEFAULT_ERROR_BOUND,
+                        help='Maximum allowed mean absolute error per channel')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"❌ Source image not found: {args.source}")
+        return 1
+
+    source_img = Image.open(args.source).convert('RGBA')
+    pyramid = ResizePyramid(source_img, all_icon_sizes(), min_ratio=args.min_ratio)
+    return 0 if print_error_report(pyramid.error_report(args.bound), args.bound) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Icon Size Tables for BeautyGlow
+Source path, output directories and the size of every icon on each platform,
+kept free of image imports so quick commands can load them cheaply
+"""
+
+# Source logo path - using the existing beautybglow-icon.jpg
+SOURCE_IMAGE = 'assets/images/beautybglow-icon.jpg'
+
+# Android mipmap folders and their required icon sizes
+ANDROID_MIPMAP_SIZES = {
+    'mipmap-mdpi': 48,
+    'mipmap-hdpi': 72,
+    'mipmap-xhdpi': 96,
+    'mipmap-xxhdpi': 144,
+    'mipmap-xxxhdpi': 192,
+}
+
+# Android drawable folders for notification icons
+ANDROID_DRAWABLE_SIZES = {
+    'drawable-mdpi': 24,
+    'drawable-hdpi': 36,
+    'drawable-xhdpi': 48,
+    'drawable-xxhdpi': 72,
+    'drawable-xxxhdpi': 96,
+}
+
+# Android drawable folders that get a notification icon in the clean rendering
+ANDROID_NOTIFICATION_SIZES = {
+    'drawable-hdpi': 36,
+    'drawable-xhdpi': 48,
+    'drawable-xxhdpi': 72,
+    'drawable-xxxhdpi': 96,
+}
+
+# iOS App Icon sizes
+IOS_ICON_SIZES = {
+    'Icon-App-20x20@1x.png': 20,
+    'Icon-App-20x20@2x.png': 40,
+    'Icon-App-20x20@3x.png': 60,
+    'Icon-App-29x29@1x.png': 29,
+    'Icon-App-29x29@2x.png': 58,
+    'Icon-App-29x29@3x.png': 87,
+    'Icon-App-40x40@1x.png': 40,
+    'Icon-App-40x40@2x.png': 80,
+    'Icon-App-40x40@3x.png': 120,
+    'Icon-App-50x50@1x.png': 50,
+    'Icon-App-50x50@2x.png': 100,
+    'Icon-App-57x57@1x.png': 57,
+    'Icon-App-57x57@2x.png': 114,
+    'Icon-App-60x60@2x.png': 120,
+    'Icon-App-60x60@3x.png': 180,
+    'Icon-App-72x72@1x.png': 72,
+    'Icon-App-72x72@2x.png': 144,
+    'Icon-App-76x76@1x.png': 76,
+    'Icon-App-76x76@2x.png': 152,
+    'Icon-App-83.5x83.5@2x.png': 167,
+    'Icon-App-1024x1024@1x.png': 1024,
+}
+
+# macOS App Icon sizes
+MACOS_ICON_SIZES = {
+    'app_icon_16.png': 16,
+    'app_icon_32.png': 32,
+    'app_icon_64.png': 64,
+    'app_icon_128.png': 128,
+    'app_icon_256.png': 256,
+    'app_icon_512.png': 512,
+    'app_icon_1024.png': 1024,
+}
+
+# Web icons
+WEB_ICON_SIZES = {
+    'Icon-192.png': 192,
+    'Icon-512.png': 512,
+    'Icon-maskable-192.png': 192,
+    'Icon-maskable-512.png': 512,
+}
+
+# Directories
+ANDROID_RES_DIR = 'android/app/src/main/res'
+IOS_ICON_DIR = 'ios/Runner/Assets.xcassets/AppIcon.appiconset'
+MACOS_ICON_DIR = 'macos/Runner/Assets.xcassets/AppIcon.appiconset'
+WEB_ICON_DIR = 'web/icons'
+IOS_LAUNCH_DIR = 'ios/Runner/Assets.xcassets/LaunchImage.imageset'
+
+# Adaptive icon layer size and the iOS launch image size
+ADAPTIVE_ICON_SIZE = 108
+LAUNCH_IMAGE_SIZE = 1024
+
+
+def all_icon_sizes():
+    """Return every distinct size rendered from the source image"""
+    sizes = set(ANDROID_MIPMAP_SIZES.values())
+    sizes.update(ANDROID_DRAWABLE_SIZES.values())
+    sizes.update(IOS_ICON_SIZES.values())
+    sizes.update(MACOS_ICON_SIZES.values())
+    sizes.update(WEB_ICON_SIZES.values())
+    sizes.update([ADAPTIVE_ICON_SIZE, LAUNCH_IMAGE_SIZE])
+    return sorted(sizes)
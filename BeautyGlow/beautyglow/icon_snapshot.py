@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Icon Snapshot Store for BeautyGlow
+Content-addressed backups of generated icons: every distinct file is stored
+once, snapshots are small JSON manifests, and restoring one copies (or
+reflinks) the verified blobs back into place
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import stat
+import time
+from icon_output import LINK_MODES, add_output_arguments, file_digest, outputs_from_args, place_file
+from icon_trace import add_trace_arguments, finish_tracing, progress, span, tracing_from_args
+
+# Kept apart from .icon_cache, which `icon_cache.py --clear` deletes wholesale
+DEFAULT_STORE_DIR = '.icon_snapshots'
+OBJECTS_DIR = 'objects'
+SNAPSHOTS_DIR = 'snapshots'
+
+# Snapshots kept by the automatic pruning after each backup
+DEFAULT_KEEP = 20
+
+# Label prefix of the snapshot taken before a restore, so a restore can be undone
+PRE_RESTORE_LABEL = 'pre-restore'
+
+# Characters of a label not kept in a snapshot name
+LABEL_UNSAFE = re.compile(r'[^\w.-]+')
+
+
+class SnapshotStore:
+    """Blobs stored once by SHA-256 and named snapshots listing {path: blob}"""
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR):
+        self.store_dir = store_dir
+
+    def _blob_path(self, digest):
+        return os.path.join(self.store_dir, OBJECTS_DIR, digest[:2], digest)
+
+    def _manifest_path(self, name):
+        return os.path.join(self.store_dir, SNAPSHOTS_DIR, f"{name}.json")
+
+    def add_blob(self, path):
+        """Store a file's bytes unless a blob with the same digest exists; return (digest, added)"""
+        digest = file_digest(path)
+        blob_path = self._blob_path(digest)
+        if os.path.exists(blob_path):
+            if file_digest(blob_path) == digest:
+                return digest, False
+            # Rewritten in place through a hard link; store the bytes again
+            os.chmod(blob_path, stat.S_IWRITE)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        tmp_path = f"{blob_path}.tmp"
+        shutil.copyfile(path, tmp_path)
+        # Read-only, so only a tool that forces its way through a hard link can rewrite history
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp_path, blob_path)
+        return digest, True
+
+    def names(self):
+        """Snapshot names, oldest first by creation time and then by sequence number"""
+        try:
+            entries = os.listdir(os.path.join(self.store_dir, SNAPSHOTS_DIR))
+        except OSError:
+            return []
+        order = {}
+        for name in (entry[:-5] for entry in entries if entry.endswith('.json')):
+            manifest = self.load(name)
+            # Names only break ties: their time has one-second resolution and labels sort after it
+            order[name] = (manifest['created'], manifest.get('sequence', 0), name)
+        return sorted(order, key=order.get)
+
+    def load(self, name):
+        """The manifest of a snapshot"""
+        with open(self._manifest_path(name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def resolve(self, name):
+        """Full name of a snapshot given its name, a unique prefix or 'latest'"""
+        names = self.names()
+        if name == 'latest' and names:
+            return names[-1]
+        matches = [candidate for candidate in names if candidate.startswith(name)]
+        if name in names:
+            return name
+        if len(matches) == 1:
+            return matches[0]
+        raise ValueError(f"No snapshot matches '{name}'" if not matches else
+                         f"'{name}' matches {len(matches)} snapshots: {', '.join(matches)}")
+
+    def create(self, paths, label=None):
+        """Snapshot the existing files among paths; return (name, blobs added), name None if unchanged
+
+        A snapshot identical to the latest one is not recorded again.
+        """
+        files = {}
+        added = 0
+        with span('snapshot', 'snapshot', files=len(paths)):
+            for path in sorted(set(paths)):
+                if not os.path.isfile(path):
+                    continue
+                digest, new_blob = self.add_blob(path)
+                files[os.path.normpath(path)] = {'digest': digest, 'bytes': os.path.getsize(path)}
+                added += new_blob
+
+        names = self.names()
+        latest = self.load(names[-1]) if names else None
+        if latest is not None and latest['files'] == files:
+            return None, 0
+
+        created = time.time()
+        name = time.strftime('%Y%m%d-%H%M%S', time.localtime(created))
+        if label:
+            name = f"{name}-{LABEL_UNSAFE.sub('-', label).strip('-')}"
+        suffix = 1
+        base = name
+        while name in names:
+            suffix += 1
+            name = f"{base}.{suffix}"
+
+        manifest_path = self._manifest_path(name)
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'name': name, 'label': label, 'created': created,
+                       'sequence': latest.get('sequence', 0) + 1 if latest else 1, 'files': files},
+                      f, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+        return name, added
+
+    def restore(self, name, link='copy', backup=True):
+        """Put every file of a snapshot back in place; return (snapshot name, files changed)
+
+        Every blob is checked against its digest before anything is placed.
+        Files that already hold the snapshot's bytes are left untouched. With
+        backup the current state of those files is snapshotted first, so the
+        restore itself can be undone. link='hardlink' shares the read-only
+        blobs with the restored files instead of giving them their own copy.
+        """
+        name = self.resolve(name)
+        files = self.load(name)['files']
+        missing = [path for path, entry in files.items()
+                   if not os.path.exists(self._blob_path(entry['digest']))]
+        if missing:
+            raise ValueError(f"Snapshot {name} references {len(missing)} missing blobs, e.g. {missing[0]}")
+        corrupt = [path for path, entry in files.items()
+                   if file_digest(self._blob_path(entry['digest'])) != entry['digest']]
+        if corrupt:
+            raise ValueError(f"Snapshot {name} references {len(corrupt)} blobs whose bytes changed, "
+                             f"e.g. {corrupt[0]}")
+        if backup:
+            self.create(list(files), label=PRE_RESTORE_LABEL)
+
+        changed = 0
+        with span('restore', 'snapshot', snapshot=name, files=len(files)):
+            for path, entry in sorted(files.items()):
+                blob_path = self._blob_path(entry['digest'])
+                if link != 'hardlink' and os.path.exists(path) and os.path.samefile(blob_path, path):
+                    # Hard-linked by an earlier restore; give the file its own copy
+                    os.remove(path)
+                if place_file(blob_path, path, link):
+                    changed += 1
+                    progress(f"↩️ Restored {path}")
+                if link != 'hardlink':
+                    os.chmod(path, stat.S_IMODE(os.stat(path).st_mode) | stat.S_IWUSR)
+        return name, changed
+
+    def prune(self, keep=None, max_age_days=None):
+        """Drop snapshots beyond the newest keep or older than max_age_days, then unused blobs
+
+        Returns (snapshots removed, blobs removed, bytes freed).
+        """
+        names = self.names()
+        doomed = set()
+        if keep is not None:
+            doomed.update(names[:max(0, len(names) - keep)])
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            doomed.update(name for name in names if self.load(name)['created'] < cutoff)
+        for name in doomed:
+            os.remove(self._manifest_path(name))
+
+        referenced = set()
+        for name in self.names():
+            referenced.update(entry['digest'] for entry in self.load(name)['files'].values())
+        blobs_removed = bytes_freed = 0
+        objects_dir = os.path.join(self.store_dir, OBJECTS_DIR)
+        for directory, _, blobs in os.walk(objects_dir):
+            for digest in blobs:
+                if digest not in referenced:
+                    path = os.path.join(directory, digest)
+                    bytes_freed += os.path.getsize(path)
+                    # Blobs are read-only, which Windows refuses to delete
+                    os.chmod(path, stat.S_IWRITE)
+                    os.remove(path)
+                    blobs_removed += 1
+        return len(doomed), blobs_removed, bytes_freed
+
+    def usage(self):
+        """(blobs, bytes) held by the store"""
+        blobs = total = 0
+        for directory, _, names in os.walk(os.path.join(self.store_dir, OBJECTS_DIR)):
+            for name in names:
+                blobs += 1
+                total += os.path.getsize(os.path.join(directory, name))
+        return blobs, total
+
+
+def snapshot_files(paths, label=None, store=None, keep=DEFAULT_KEEP):
+    """Back up paths as a new snapshot and prune old ones; return the snapshot name or None"""
+    store = store or SnapshotStore()
+    start = time.perf_counter()
+    name, added = store.create(paths, label)
+    if name is None:
+        print("✓ Files unchanged since the latest snapshot, nothing to back up")
+        return None
+    removed, _, _ = store.prune(keep=keep)
+    note = f", pruned {removed} old" if removed else ''
+    print(f"📸 Snapshot {name}: {added} new blobs stored "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms{note}")
+    return name
+
+
+def print_snapshots(store):
+    """List every snapshot with its file count and size"""
+    names = store.names()
+    print(f"\n📚 Snapshots in {store.store_dir}: {len(names)}")
+    for name in names:
+        manifest = store.load(name)
+        size = sum(entry['bytes'] for entry in manifest['files'].values())
+        print(f"   {name:<40} {len(manifest['files']):>5} files {size / 1024:>10,.1f} KB")
+    blobs, total = store.usage()
+    print(f"   Stored once: {blobs} blobs, {total / 1024:,.1f} KB")
+
+
+def main():
+    """Create, list, restore and prune icon snapshots"""
+    parser = argparse.ArgumentParser(description="Content-addressed snapshots of BeautyGlow icons")
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, help='Snapshot store directory')
+    commands = parser.add_subparsers(dest='command')
+
+    create = commands.add_parser('create', help='Snapshot files (default: every generated icon)')
+    create.add_argument('paths', nargs='*', help='Files or directories to snapshot')
+    create.add_argument('--label', help='Label appended to the snapshot name')
+    create.add_argument('--keep', type=int, default=DEFAULT_KEEP, help='Snapshots kept after pruning')
+
+    commands.add_parser('list', help='List the snapshots')
+
+    restore = commands.add_parser('restore', help="Restore a snapshot (name, unique prefix or 'latest')")
+    restore.add_argument('name')
+    restore.add_argument('--link', choices=LINK_MODES, default='copy',
+                         help='Copy (default), reflink or hard-link the stored files into place; '
+                              'hard-linked files share the read-only blobs')
+    restore.add_argument('--no-backup', action='store_true',
+                         help='Do not snapshot the current files before restoring')
+    add_output_arguments(restore)
+    add_trace_arguments(restore)
+
+    prune = commands.add_parser('prune', help='Remove old snapshots and the blobs only they used')
+    prune.add_argument('--keep', type=int, help='Number of newest snapshots to keep')
+    prune.add_argument('--max-age', type=float, metavar='DAYS', help='Remove snapshots older than this')
+    args = parser.parse_args()
+
+    print("📸 BeautyGlow Icon Snapshots")
+    print("=" * 50)
+    store = SnapshotStore(args.store)
+
+    if args.command == 'create':
+        paths = []
+        for path in args.paths:
+            if os.path.isdir(path):
+                paths.extend(os.path.join(directory, name)
+                             for directory, _, names in os.walk(path) for name in names)
+            else:
+                paths.append(path)
+        if not args.paths:
+            from icon_verify import icon_expectations
+            paths = list(icon_expectations())
+        snapshot_files(paths, args.label, store, max(1, args.keep))
+        return 0
+
+    if args.command == 'restore':
+        tracing_from_args(args)
+        outputs = outputs_from_args(args)
+        start = time.perf_counter()
+        try:
+            name, changed = store.restore(args.name, args.link, not args.no_backup)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"↩️ Restored {name}: {changed} files changed "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        outputs.print_summary()
+        finish_tracing(args)
+        return 0
+
+    if args.command == 'prune':
+        if args.keep is None and args.max_age is None:
+            print("❌ Give --keep and/or --max-age")
+            return 1
+        removed, blobs, freed = store.prune(args.keep, args.max_age)
+        print(f"🗑️ Removed {removed} snapshots and {blobs} unused blobs ({freed / 1024:,.1f} KB)")
+        return 0
+
+    print_snapshots(store)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
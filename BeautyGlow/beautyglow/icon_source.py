@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Shared Source Loader for BeautyGlow Icon Scripts
+Decodes the source logo once per run, at the smallest scale that still covers
+the largest icon and without an alpha channel it does not have, and hands the
+same raster to every step, optionally persisted as a memory-mapped file
+"""
+
+import glob
+import hashlib
+import json
+import math
+import mmap
+import os
+from PIL import Image
+from icon_cache import DEFAULT_CACHE_DIR, file_digest
+from icon_trace import span
+
+DEFAULT_RASTER_DIR = os.path.join(DEFAULT_CACHE_DIR, 'rasters')
+
+# The decoded source stays at least this many times larger than the largest
+# requested size (Pillow's reducing_gap, thumbnail() uses the same default),
+# so reduced decodes resize like full ones
+DEFAULT_REDUCING_GAP = 2.0
+
+# JPEG DCT scaling only reduces by these factors
+JPEG_SCALES = (8, 4, 2, 1)
+
+# Loaders shared by every script running in this process
+_loaders = {}
+
+
+def raster_path(raster_dir, digest, mode, size):
+    """Path of the persisted raw raster for a decoded source"""
+    width, height = size
+    return os.path.join(raster_dir, f"{digest}.{mode}.{width}x{height}.raw")
+
+
+def find_raster(raster_dir, digest, mode):
+    """Return the persisted raster path for a source digest, or None"""
+    matches = glob.glob(os.path.join(raster_dir, f"{digest}.{mode}.*.raw"))
+    return matches[0] if matches else None
+
+
+def attach_raster(path):
+    """Memory-map a persisted raster and wrap it as a read-only image"""
+    _, mode, dims, _ = os.path.basename(path).rsplit('.', 3)
+    width, height = (int(value) for value in dims.split('x'))
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    image = Image.frombuffer(mode, (width, height), buffer, 'raw', mode, 0, 1)
+
+    # The colour profile travels with resized copies into every PNG
+    icc_path = f"{path}.icc"
+    if os.path.exists(icc_path):
+        with open(icc_path, 'rb') as f:
+            image.info['icc_profile'] = f.read()
+    return image
+
+
+def persist_raster(image, raster_dir, digest):
+    """Write a decoded image as a raw raster and return its path"""
+    os.makedirs(raster_dir, exist_ok=True)
+    path = raster_path(raster_dir, digest, image.mode, image.size)
+    icc_profile = image.info.get('icc_profile')
+    if icc_profile:
+        with open(f"{path}.icc", 'wb') as f:
+            f.write(icc_profile)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(image.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+def native_mode(image):
+    """RGBA only for sources that carry transparency, RGB otherwise"""
+    if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+        return 'RGBA'
+    return 'RGB'
+
+
+def reduce_factor(source, max_size, reducing_gap=DEFAULT_REDUCING_GAP):
+    """Integer factor the source can shrink by while covering max_size with the gap"""
+    if not max_size:
+        return 1
+    factor = int(min(source.size) // math.ceil(max_size * reducing_gap))
+    if source.format == 'JPEG':
+        return next(scale for scale in JPEG_SCALES if scale <= max(1, factor))
+    return max(1, factor)
+
+
+class SourceLoader:
+    """Decodes a source image on first use and returns the same raster afterwards
+
+    mode=None keeps the source's own mode (RGB for a JPEG); transforms that
+    need alpha add it to their small outputs. With max_size the source is
+    decoded at a reduced scale: JPEG DCT scaling via draft(), an integer
+    reduce() for other formats.
+    """
+
+    def __init__(self, path, mode=None, persist_dir=None, max_size=None,
+                 reducing_gap=DEFAULT_REDUCING_GAP):
+        self.path = path
+        self.mode = mode
+        self.persist_dir = persist_dir
+        self.max_size = max_size
+        self.reducing_gap = reducing_gap
+        self.stamp = source_stamp(path)
+        self.raster = None
+        self.decodes = 0
+        self._image = None
+        self._plan = None
+        self._digest = None
+
+    def require(self, max_size):
+        """Make sure the decoded source covers max_size, decoding again if it does not"""
+        if max_size is None or self.max_size is None or max_size <= self.max_size:
+            return
+        self.max_size = max_size
+        self._image = self._plan = self._digest = None
+        self.raster = None
+
+    def plan(self):
+        """(mode, factor, decoded size) of the decode, read from the header alone"""
+        if self._plan is None:
+            with Image.open(self.path) as source:
+                mode = self.mode or native_mode(source)
+                factor = reduce_factor(source, self.max_size, self.reducing_gap)
+                width, height = source.size
+                if source.format == 'JPEG' and factor > 1:
+                    source.draft(mode, (width // factor, height // factor))
+                    size = source.size
+                else:
+                    size = (math.ceil(width / factor), math.ceil(height / factor))
+            self._plan = (mode, factor, size)
+        return self._plan
+
+    def digest(self):
+        """Hash of the source file and how it is decoded, for cache keys"""
+        if self._digest is None:
+            mode, factor, size = self.plan()
+            payload = json.dumps({'file': file_digest(self.path), 'mode': mode,
+                                  'factor': factor, 'size': list(size)}, sort_keys=True)
+            self._digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return self._digest
+
+    def image(self):
+        """Return the decoded source, attaching to a persisted raster when possible"""
+        if self._image is not None:
+            return self._image
+
+        mode, factor, size = self.plan()
+        digest = self.digest() if self.persist_dir else None
+        if digest:
+            self.raster = find_raster(self.persist_dir, digest, mode)
+            if self.raster:
+                with span('attach raster', 'source', path=self.raster):
+                    self._image = attach_raster(self.raster)
+                return self._image
+
+        with span('decode', 'source', path=self.path, mode=mode, factor=factor):
+            with Image.open(self.path) as source:
+                if source.format == 'JPEG' and factor > 1:
+                    source.draft(mode, size)
+                source.load()
+                image = source.reduce(factor) if source.format != 'JPEG' and factor > 1 else source
+                # Only convert when needed: convert() copies even when the mode already matches
+                self._image = image if image.mode == mode else image.convert(mode)
+        self.decodes += 1
+
+        if digest:
+            self.raster = persist_raster(self._image, self.persist_dir, digest)
+        return self._image
+
+
+def source_stamp(path):
+    """(size, mtime) of a source file, or None when it cannot be read"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def shared_source(path, mode=None, persist_dir=None, max_size=None):
+    """Return the process-wide loader for path, creating it on first use
+
+    Callers pass the largest size they render and the loader decodes at the
+    largest of those; a loader first requested without a size decodes at
+    full resolution. A file changed on disk since its loader was created
+    gets a fresh loader.
+    """
+    key = (os.path.abspath(path), mode)
+    loader = _loaders.get(key)
+    if loader is None or loader.stamp != source_stamp(path):
+        loader = _loaders[key] = SourceLoader(path, mode, persist_dir, max_size)
+    else:
+        loader.require(max_size)
+        if persist_dir and loader.persist_dir is None:
+            loader.persist_dir = persist_dir
+    return loader
+
+
+def add_source_arguments(parser):
+    """Add the shared source loading options to an argparse parser"""
+    parser.add_argument('--persist-source', action='store_true',
+                        help='Keep the decoded source as a memory-mapped raster for later runs')
+    parser.add_argument('--raster-dir', default=DEFAULT_RASTER_DIR,
+                        help='Directory of persisted source rasters')
+
+
+def persist_dir_from_args(args):
+    """Return the raster directory for parsed arguments, or None"""
+    return args.raster_dir if args.persist_source else None
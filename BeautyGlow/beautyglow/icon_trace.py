@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Trace Instrumentation for BeautyGlow Icon Scripts
+Records timed spans around loading, resizing, enhancing, encoding, writing
+and build steps, exported as Chrome-trace/Perfetto JSON or a JSON-lines log
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Disabled spans cost one attribute check and share this context manager
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    """Context manager recording one complete ('X') trace event"""
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.wall = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.args['error'] = f"{exc_type.__name__}: {exc}"
+        self.tracer.record({
+            'name': self.name,
+            'cat': self.category,
+            'ph': 'X',
+            'ts': round(self.wall * 1e6, 1),
+            'dur': round(duration * 1e6, 1),
+            'pid': os.getpid(),
+            'tid': threading.get_native_id(),
+            'args': self.args,
+        })
+        return False
+
+
+class Tracer:
+    """Collects trace events and controls per-file console output"""
+
+    def __init__(self):
+        self.enabled = False
+        self.quiet = False
+        self.events = []
+        self._lock = threading.Lock()
+
+    def configure(self, enabled=False, quiet=False):
+        """Turn event recording and quiet console output on or off"""
+        self.enabled = enabled
+        self.quiet = quiet
+
+    def span(self, name, category='icon', **args):
+        """Return a context manager timing the enclosed block"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def record(self, event):
+        """Add a finished event"""
+        with self._lock:
+            self.events.append(event)
+
+    def drain_events(self):
+        """Remove and return the events recorded so far"""
+        with self._lock:
+            events, self.events = self.events, []
+        return events
+
+    def merge_events(self, events):
+        """Add events recorded by another process"""
+        with self._lock:
+            self.events.extend(events)
+
+    def write_chrome_trace(self, trace_path):
+        """Write the events as Chrome-trace JSON (loadable in Perfetto or chrome://tracing)"""
+        os.makedirs(os.path.dirname(trace_path) or '.', exist_ok=True)
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+
+    def write_event_log(self, log_path):
+        """Write the events as JSON lines, one event per line in start order"""
+        os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+        with open(log_path, 'w', encoding='utf-8') as f:
+            for event in sorted(self.events, key=lambda e: e['ts']):
+                f.write(json.dumps(event, separators=(',', ':')) + '\n')
+
+    def print_summary(self, limit=8):
+        """Print the total time spent in each category and the slowest spans"""
+        if not self.events:
+            return
+        totals = {}
+        for event in self.events:
+            stats = totals.setdefault(event['cat'], {'count': 0, 'dur': 0.0})
+            stats['count'] += 1
+            stats['dur'] += event['dur']
+
+        print(f"\n🧭 Trace: {len(self.events)} spans")
+        for category, stats in sorted(totals.items(), key=lambda item: -item[1]['dur']):
+            print(f"   {category:<10} {stats['count']:>5} spans {stats['dur'] / 1e6:>8.3f}s")
+        print("   Slowest:")
+        for event in sorted(self.events, key=lambda e: -e['dur'])[:limit]:
+            detail = event['args'].get('path') or event['args'].get('size', '')
+            print(f"   {event['dur'] / 1e3:>9.1f} ms  {event['cat']}/{event['name']} {detail}")
+
+
+# Tracer shared by every script running in this process
+tracer = Tracer()
+
+
+def span(name, category='icon', **args):
+    """Time the enclosed block with the process-wide tracer"""
+    return tracer.span(name, category, **args)
+
+
+def progress(message):
+    """Print a per-file progress line unless quiet mode is on"""
+    if not tracer.quiet:
+        print(message)
+
+
+def configure(enabled=False, quiet=False):
+    """Configure the process-wide tracer (also used to set up pool workers)"""
+    tracer.configure(enabled, quiet)
+
+
+def drain_events():
+    """Remove and return the events of the process-wide tracer (for pool workers)"""
+    return tracer.drain_events()
+
+
+def merge_events(events):
+    """Add events from a pool worker to the process-wide tracer"""
+    tracer.merge_events(events)
+
+
+def add_trace_arguments(parser):
+    """Add the shared tracing options to an argparse parser"""
+    parser.add_argument('--trace', metavar='PATH',
+                        help='Write a Chrome-trace/Perfetto JSON file of timed spans')
+    parser.add_argument('--trace-log', metavar='PATH',
+                        help='Write every span as a JSON-lines event log')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='Suppress per-file progress output')
+
+
+def tracing_from_args(args):
+    """Configure the process-wide tracer for parsed arguments and return it"""
+    configure(enabled=bool(args.trace or args.trace_log), quiet=args.quiet)
+    return tracer
+
+
+def finish_tracing(args):
+    """Write the requested trace files and print the span summary"""
+    if not tracer.enabled:
+        return
+    tracer.print_summary()
+    if args.trace:
+        tracer.write_chrome_trace(args.trace)
+        print(f"   Trace: {args.trace}")
+    if args.trace_log:
+        tracer.write_event_log(args.trace_log)
+        print(f"   Event log: {args.trace_log}")
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Header-Only Icon Verifier for BeautyGlow
+Checks the real pixel dimensions of every generated icon against the size
+tables and the asset catalog Contents.json, reading only the file headers
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from icon_trace import add_trace_arguments, finish_tracing, progress, span, tracing_from_args
+import icon_sizes
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+IMAGE_EXTENSIONS = ('.png', '.webp', '.jpg', '.jpeg')
+
+# JPEG start-of-frame markers carrying the image dimensions
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# JPEG markers without a length field
+JPEG_STANDALONE_MARKERS = {0x01, 0xD8} | set(range(0xD0, 0xD8))
+
+# Header checks are I/O bound, so use more threads than cores
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Problems reported for a file
+MISSING = 'File not found'
+
+
+def _jpeg_size(f):
+    """Walk JPEG marker segments up to the first start-of-frame"""
+    while True:
+        byte = f.read(1)
+        if not byte:
+            raise ValueError('no JPEG frame header')
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        while marker == b'\xff':
+            marker = f.read(1)
+        if not marker:
+            raise ValueError('truncated JPEG header')
+        code = marker[0]
+        if code in JPEG_STANDALONE_MARKERS or code == 0x00:
+            continue
+        if code == 0xD9:
+            raise ValueError('no JPEG frame header')
+        length = struct.unpack('>H', f.read(2))[0]
+        if code in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>xHH', f.read(5))
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _webp_size(header):
+    """Dimensions from the first chunk of a RIFF WebP header"""
+    chunk = header[12:16]
+    if chunk == b'VP8 ' and len(header) >= 30:
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and len(header) >= 25:
+        bits = struct.unpack('<I', header[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X' and len(header) >= 30:
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+        return width, height
+    raise ValueError('unknown WebP chunk')
+
+
+def read_image_size(path):
+    """Return (format, width, height) from the file header without decoding pixels"""
+    with open(path, 'rb') as f:
+        header = f.read(30)
+        if header.startswith(PNG_SIGNATURE):
+            if header[12:16] != b'IHDR':
+                raise ValueError('PNG without IHDR chunk')
+            width, height = struct.unpack('>II', header[16:24])
+            return 'PNG', width, height
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return ('WEBP',) + _webp_size(header)
+        if header[:2] == b'\xff\xd8':
+            f.seek(2)
+            return ('JPEG',) + _jpeg_size(f)
+    raise ValueError('not a PNG, WebP or JPEG file')
+
+
+def check_file(path, expected=None, required=True):
+    """Check one file's header against the allowed square sizes; return a result dict"""
+    result = {'path': path, 'format': None, 'width': None, 'height': None,
+              'expected': sorted(expected) if expected else None, 'ok': False, 'problem': None}
+    if not os.path.exists(path):
+        result['problem'] = MISSING
+        result['ok'] = not required
+        return result
+
+    with span('verify', 'verify', path=path):
+        try:
+            result['format'], result['width'], result['height'] = read_image_size(path)
+        except (OSError, ValueError, struct.error) as e:
+            result['problem'] = f"Unreadable header: {e}"
+            return result
+
+    width, height = result['width'], result['height']
+    if width <= 0 or height <= 0:
+        result['problem'] = f"Invalid dimensions {width}x{height}"
+    elif expected and (width != height or width not in expected):
+        allowed = ' or '.join(f"{size}x{size}" for size in result['expected'])
+        result['problem'] = f"Is {width}x{height}, expected {allowed}"
+    else:
+        result['ok'] = True
+    return result
+
+
+def verify_files(expectations, workers=DEFAULT_WORKERS):
+    """Check {path: (allowed sizes or None, required)} in parallel; results keep that order"""
+    items = list(expectations.items())
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda item: check_file(item[0], *item[1]), items))
+
+
+def print_result(result):
+    """Print one result line and return True if the file passed"""
+    path = result['path']
+    if result['ok']:
+        if result['problem'] != MISSING:
+            progress(f"✅ {path} - {result['width']}x{result['height']} {result['format']}")
+        return True
+    if result['problem'] == MISSING:
+        print(f"⚠️ {path} - File not found")
+    else:
+        print(f"❌ {path} - {result['problem']}")
+    return False
+
+
+def _add(expectations, path, sizes, required):
+    """Merge an expectation, allowing every size any table permits"""
+    known_sizes, known_required = expectations.get(path, (set(), False))
+    expectations[path] = (known_sizes | set(sizes), known_required or required)
+
+
+def contents_expectations(icon_dir):
+    """Expected pixel sizes of every file listed in an asset catalog Contents.json"""
+    expectations = {}
+    try:
+        with open(os.path.join(icon_dir, 'Contents.json'), 'r', encoding='utf-8') as f:
+            images = json.load(f).get('images', [])
+    except (OSError, ValueError):
+        return expectations
+
+    for image in images:
+        if not image.get('filename') or 'size' not in image:
+            continue
+        points = float(image['size'].split('x')[0])
+        scale = float(image.get('scale', '1x').rstrip('x'))
+        _add(expectations, os.path.join(icon_dir, image['filename']), [round(points * scale)], True)
+    return expectations
+
+
+def icon_expectations(root='.'):
+    """Expected sizes of the icons the update scripts generate under a project root"""
+    expectations = {}
+    res_dir = os.path.join(root, icon_sizes.ANDROID_RES_DIR)
+    if os.path.isdir(res_dir):
+        for folder, size in icon_sizes.ANDROID_MIPMAP_SIZES.items():
+            folder_dir = os.path.join(res_dir, folder)
+            _add(expectations, os.path.join(folder_dir, 'ic_launcher.png'), [size], True)
+            # Adaptive layers are density-sized or 108px depending on the script that wrote them
+            for layer in ('ic_launcher_foreground.png', 'ic_launcher_background.png'):
+                _add(expectations, os.path.join(folder_dir, layer),
+                     [size, icon_sizes.ADAPTIVE_ICON_SIZE], True)
+        for folder, size in icon_sizes.ANDROID_DRAWABLE_SIZES.items():
+            for file_name in ('logo.png', 'ic_notification.png'):
+                _add(expectations, os.path.join(res_dir, folder, file_name), [size], False)
+
+    for icon_dir, table in ((icon_sizes.IOS_ICON_DIR, icon_sizes.IOS_ICON_SIZES),
+                            (icon_sizes.MACOS_ICON_DIR, icon_sizes.MACOS_ICON_SIZES),
+                            (icon_sizes.WEB_ICON_DIR, icon_sizes.WEB_ICON_SIZES)):
+        icon_dir = os.path.join(root, icon_dir)
+        if not os.path.isdir(icon_dir):
+            continue
+        for path, (sizes, required) in contents_expectations(icon_dir).items():
+            _add(expectations, path, sizes, required)
+        for file_name, size in table.items():
+            _add(expectations, os.path.join(icon_dir, file_name), [size], False)
+    return expectations
+
+
+def scan_images(root='.'):
+    """Every image file in the Android res, app icon and web icon directories"""
+    directories = [os.path.join(root, icon_sizes.IOS_ICON_DIR), os.path.join(root, icon_sizes.MACOS_ICON_DIR),
+                   os.path.join(root, icon_sizes.WEB_ICON_DIR)]
+    res_dir = os.path.join(root, icon_sizes.ANDROID_RES_DIR)
+    if os.path.isdir(res_dir):
+        with os.scandir(res_dir) as entries:
+            directories.extend(entry.path for entry in entries if entry.is_dir())
+
+    paths = []
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        with os.scandir(directory) as entries:
+            paths.extend(entry.path for entry in entries
+                         if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS))
+    return sorted(paths)
+
+
+def project_expectations(root='.'):
+    """Expectations for a project: every scanned image plus every required icon"""
+    expectations = icon_expectations(root)
+    for path in scan_images(root):
+        expectations.setdefault(path, (set(), True))
+    return dict(sorted(expectations.items()))
+
+
+def print_summary(results, elapsed, title="Icon Verification Summary"):
+    """Print totals for a verification run and return True if everything passed"""
+    checked = [result for result in results if result['problem'] != MISSING or not result['ok']]
+    failed = [result for result in checked if not result['ok']]
+    print(f"\n📊 {title}:")
+    print(f"   Checked: {len(checked)} files in {elapsed * 1000:.1f} ms")
+    print(f"   Passed: {len(checked) - len(failed)}")
+    print(f"   Failed: {len(failed)}")
+    return not failed
+
+
+def main():
+    """Verify the generated icons of one or more Flutter projects"""
+    parser = argparse.ArgumentParser(description="Verify BeautyGlow icon dimensions from file headers")
+    parser.add_argument('roots', nargs='*', default=['.'], help='Flutter project roots to verify')
+    parser.add_argument('--jobs', '-j', type=int, default=DEFAULT_WORKERS,
+                        help='Number of worker threads')
+    parser.add_argument('--json', metavar='PATH', help='Write every result to this JSON file')
+    add_trace_arguments(parser)
+    args = parser.parse_args()
+    tracing_from_args(args)
+
+    print("🔍 BeautyGlow Icon Verification")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    expectations = {}
+    for root in args.roots:
+        expectations.update(project_expectations(root))
+    results = verify_files(expectations, max(1, args.jobs))
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        print_result(result)
+    ok = print_summary(results, elapsed)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"   Results: {args.json}")
+    finish_tracing(args)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
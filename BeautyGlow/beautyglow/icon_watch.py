@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Icon Watch Mode for BeautyGlow
+Keeps the icon pipeline warm in one process, polls the source image and the
+manifest for changes and regenerates only the affected outputs, printing the
+change-to-updated-icons latency of every rebuild
+"""
+
+import argparse
+import os
+import time
+from collections import OrderedDict
+from icon_cache import add_cache_arguments, cache_from_args
+from icon_encode import add_encode_arguments, finish_encoding, use_profile
+from icon_enhance import add_enhance_arguments, use_engine
+from icon_graph import (DEFAULT_TARGETS, GraphSources, build_graph, encode_node, load_manifest,
+                        node_cache_key, pyramid_parents, write_node)
+from icon_output import add_output_arguments, outputs_from_args
+from icon_parallel import default_workers, run_jobs
+from icon_source import shared_source
+from icon_trace import add_trace_arguments, finish_tracing, progress, span, tracing_from_args
+
+# Seconds between two polls of the watched files
+DEFAULT_INTERVAL = 0.1
+
+# A changed file must keep its size and mtime this long before a rebuild,
+# so a save that is still being written is not picked up half-way
+SETTLE_TIME = 0.05
+
+# Encoded nodes are kept in memory for this many source versions, so
+# undoing an edit rewrites the previous icons without rendering anything
+KEEP_VERSIONS = 4
+
+
+def signature(path):
+    """(mtime, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def render_warm(version, job):
+    """Render and encode one node and keep its bytes in memory under the job's key"""
+    label, size, transform, paths, key = job
+    with span('node', 'job', path=label, size=size, transform=transform, outputs=len(paths)):
+        version['nodes'][key] = encode_node(version['sources'], size, transform, label)
+    return True
+
+
+class WarmPipeline:
+    """Decoded source, resize pyramid and encoded nodes kept in memory between builds
+
+    Encoded nodes are keyed with the pyramid levels they were derived
+    through, so a manifest edit that changes the levels renders them again.
+    """
+
+    def __init__(self, targets, manifest_path=None, cache=None, workers=1):
+        self.targets = targets
+        self.manifest_path = manifest_path
+        self.cache = cache
+        self.workers = workers
+        self.source = None
+        self.versions = OrderedDict()
+        self.builds = 0
+
+    def watched_paths(self):
+        """The source image of the current manifest and the manifest itself"""
+        paths = [self.source] if self.source else []
+        if self.manifest_path:
+            paths.append(self.manifest_path)
+        return paths
+
+    def _version(self, digest):
+        """In-memory state of one source version; older versions keep only their bytes"""
+        version = self.versions.get(digest)
+        if version is None:
+            version = self.versions[digest] = {'sources': None, 'nodes': {}}
+        self.versions.move_to_end(digest)
+        for old_digest, old_version in self.versions.items():
+            if old_digest != digest:
+                old_version['sources'] = None
+        while len(self.versions) > KEEP_VERSIONS:
+            self.versions.popitem(last=False)
+        return version
+
+    def build(self):
+        """Regenerate the outputs whose node changed; return the build stats or None
+
+        A source that cannot be read or decoded (a save still in progress, a
+        corrupt file) fails this build only; the next change builds again.
+        """
+        start = time.perf_counter()
+        try:
+            graph = build_graph(load_manifest(self.manifest_path), self.targets)
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not load the manifest: {e}")
+            return None
+        self.source = graph.source
+        if graph.conflicts:
+            graph.print_conflicts()
+            return None
+        if not os.path.exists(graph.source):
+            print(f"❌ Source image not found: {graph.source}")
+            return None
+
+        nodes = graph.nodes()
+        max_size = max([size for size, transform in nodes if transform != 'background'], default=0)
+        try:
+            loader = shared_source(graph.source, max_size=max_size or None)
+            digest = loader.digest()
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not read the source image: {e}")
+            return None
+        version = self._version(digest)
+
+        pyramid_sizes = graph.pyramid_sizes()
+        pending = []
+        reused = restored = written = failed = 0
+        for node, paths in nodes.items():
+            key = (node, pyramid_parents(node, pyramid_sizes))
+            data = version['nodes'].get(key)
+            if data is not None:
+                written += write_node(data, paths)
+                reused += 1
+            elif self.cache is not None and all(
+                    [self.cache.restore(node_cache_key(digest, node, pyramid_sizes), path) for path in paths]):
+                restored += 1
+            else:
+                pending.append((paths[0], node[0], node[1], tuple(paths), key))
+
+        if pending:
+            sources = version['sources']
+            needs_source = any(job[2] != 'background' for job in pending)
+            # A pyramid grown lazily for other levels would derive sizes from different parents
+            if (sources is None or sources.pyramid_sizes != pyramid_sizes
+                    or (needs_source and sources.source_img is None)):
+                try:
+                    version['sources'] = GraphSources(loader.image() if needs_source else None, pyramid_sizes)
+                except (OSError, ValueError) as e:
+                    print(f"❌ Could not decode the source image: {e}")
+                    return None
+            results, _ = run_jobs(version, pending, render_warm, workers=self.workers, executor='thread')
+            for (label, size, transform, paths, key), ok in zip(pending, results):
+                if not ok:
+                    failed += 1
+                    continue
+                written += write_node(version['nodes'][key], paths)
+                if self.cache is not None:
+                    self.cache.store(node_cache_key(digest, (size, transform), pyramid_sizes), label)
+
+        self.builds += 1
+        return {
+            'seconds': time.perf_counter() - start,
+            'destinations': len(graph.destinations),
+            'rendered': len(pending),
+            'reused': reused,
+            'restored': restored,
+            'written': written,
+            'failed': failed,
+        }
+
+
+def print_build(stats, changed=(), now=None):
+    """Print what a rebuild did and how long it took after the change"""
+    if stats is None:
+        return
+    detail = (f"{stats['rendered']} nodes rendered, {stats['reused']} reused from memory, "
+              f"{stats['restored']} restored from cache; {stats['written']} of "
+              f"{stats['destinations']} files changed")
+    if stats['failed']:
+        detail += f"; ❌ {stats['failed']} nodes failed"
+    if not changed:
+        print(f"✅ Initial build in {stats['seconds'] * 1000:.0f} ms: {detail}")
+        return
+    print(f"⚡ Regenerated in {stats['seconds'] * 1000:.0f} ms: {detail}")
+    for path in changed:
+        mtime = signature(path)
+        if mtime is not None and now is not None:
+            progress(f"   {path} saved {(now - mtime[0] / 1e9) * 1000:.0f} ms before the icons were updated")
+
+
+def watch(pipeline, interval=DEFAULT_INTERVAL, settle=SETTLE_TIME):
+    """Build once, then rebuild whenever a watched file changes, until interrupted"""
+    print_build(pipeline.build())
+    signatures = {path: signature(path) for path in pipeline.watched_paths()}
+    print(f"👀 Watching {', '.join(signatures)} (Ctrl+C to stop)")
+    while True:
+        time.sleep(interval)
+        current = {path: signature(path) for path in pipeline.watched_paths()}
+        changed = [path for path in current if current[path] != signatures.get(path)]
+        if not changed:
+            continue
+        time.sleep(settle)
+        if any(signature(path) != current[path] for path in changed):
+            continue
+        print_build(pipeline.build(), changed, time.time())
+        signatures = {path: signature(path) for path in pipeline.watched_paths()}
+
+
+def main():
+    """Keep the icon pipeline warm and regenerate icons whenever the source changes"""
+    parser = argparse.ArgumentParser(description="Regenerate BeautyGlow icons whenever the source changes")
+    parser.add_argument('--target', '-t', action='append', dest='targets',
+                        help=f"Target to build (repeatable, default: {', '.join(DEFAULT_TARGETS)})")
+    parser.add_argument('--manifest', help='JSON manifest adding or replacing targets (also watched)')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help='Seconds between polls of the watched files')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Number of worker threads (0 = one per CPU core)')
+    add_cache_arguments(parser)
+    add_encode_arguments(parser)
+    add_enhance_arguments(parser)
+    add_output_arguments(parser)
+    add_trace_arguments(parser)
+    # Watch mode is for iterating on the design; build with the release profile before shipping
+    parser.set_defaults(profile='fast')
+    args = parser.parse_args()
+
+    print("👀 BeautyGlow Icon Watch Mode")
+    print("=" * 50)
+    use_profile(args.profile)
+    use_engine(args.enhance_engine)
+    tracing_from_args(args)
+    outputs = outputs_from_args(args)
+    cache = cache_from_args(args)
+    pipeline = WarmPipeline(args.targets or DEFAULT_TARGETS, args.manifest, cache,
+                            args.jobs if args.jobs > 0 else default_workers())
+    try:
+        watch(pipeline, max(0.01, args.interval))
+    except KeyboardInterrupt:
+        print(f"\n🛑 Stopped after {pipeline.builds} builds")
+
+    if cache is not None:
+        cache.save()
+        cache.print_summary()
+    outputs.print_summary()
+    finish_encoding(args)
+    finish_tracing(args)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Incremental XML Reference Rewriter for BeautyGlow
+Rewrites resource references in Android XML with one compiled pattern, in
+parallel, skipping files unchanged since the last run, with a dry-run diff mode
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from icon_output import write_bytes
+from icon_trace import progress, span
+
+# Launcher icon references that must point at the mipmap resources
+DEFAULT_REPLACEMENTS = {
+    '@drawable/ic_launcher_foreground': '@mipmap/ic_launcher_foreground',
+    '@drawable/ic_launcher_background': '@mipmap/ic_launcher_background',
+    '@color/ic_launcher_background': '@mipmap/ic_launcher_background',
+}
+
+# Optional JSON object of extra {"@old/reference": "@new/reference"} rewrites
+DEFAULT_CONFIG_PATH = 'icon_references.json'
+DEFAULT_STATE_PATH = os.path.join('.icon_cache', 'xml_references.json')
+
+# File reads dominate, so use more threads than cores
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Outcome of each file
+FIXED = 'fixed'
+UNCHANGED = 'unchanged'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+
+def load_replacements(config_path=DEFAULT_CONFIG_PATH):
+    """The default replacement table extended by a JSON config file, if present"""
+    replacements = dict(DEFAULT_REPLACEMENTS)
+    if config_path and os.path.exists(config_path):
+        with open(config_path, 'r', encoding='utf-8') as f:
+            replacements.update(json.load(f))
+    return replacements
+
+
+class ReferenceRewriter:
+    """Applies a replacement table to text in a single regex pass"""
+
+    def __init__(self, replacements=None):
+        self.replacements = dict(replacements or DEFAULT_REPLACEMENTS)
+        # Longest first, so a reference is never cut short by one of its prefixes
+        keys = sorted(self.replacements, key=len, reverse=True)
+        self.pattern = re.compile('|'.join(re.escape(key) for key in keys))
+        payload = json.dumps(self.replacements, sort_keys=True)
+        self.rules_digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def rewrite(self, text):
+        """Return (rewritten text, number of replacements)"""
+        return self.pattern.subn(lambda match: self.replacements[match.group(0)], text)
+
+
+def load_state(state_path, rewriter):
+    """Per-file entries of the last run, dropped if the replacement table changed"""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get('rules') != rewriter.rules_digest:
+        return {}
+    return state.get('files', {})
+
+
+def save_state(state_path, rewriter, files):
+    """Persist the per-file entries for the next run"""
+    os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'rules': rewriter.rules_digest, 'files': files}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, state_path)
+
+
+def _entry(path, data):
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+            'digest': hashlib.sha256(data).hexdigest()}
+
+
+def rewrite_file(path, rewriter, previous=None, dry_run=False):
+    """Rewrite one XML file; return a result dict with its outcome, count, diff and state entry"""
+    result = {'path': path, 'status': UNCHANGED, 'count': 0, 'diff': None,
+              'entry': previous, 'error': None}
+    try:
+        stat = os.stat(path)
+        if previous and (previous['mtime_ns'], previous['size']) == (stat.st_mtime_ns, stat.st_size):
+            result['status'] = SKIPPED
+            return result
+
+        with span('rewrite', 'xml', path=path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Touched but identical to the content the last run left behind
+            if previous and hashlib.sha256(data).hexdigest() == previous['digest']:
+                result['status'] = SKIPPED
+                result['entry'] = _entry(path, data)
+                return result
+
+            # Decoded from bytes, so the file keeps its own line endings
+            text = data.decode('utf-8')
+            content, count = rewriter.rewrite(text)
+            if not count or content == text:
+                result['entry'] = _entry(path, data)
+                return result
+
+            result['status'] = FIXED
+            result['count'] = count
+            if dry_run:
+                result['entry'] = previous
+                result['diff'] = ''.join(difflib.unified_diff(
+                    text.splitlines(keepends=True), content.splitlines(keepends=True),
+                    fromfile=f"a/{path}", tofile=f"b/{path}"))
+                return result
+
+            new_data = content.encode('utf-8')
+            write_bytes(path, new_data)
+            result['entry'] = _entry(path, new_data)
+    except Exception as e:
+        result['status'] = FAILED
+        result['error'] = str(e)
+        result['entry'] = None
+    return result
+
+
+def rewrite_files(paths, rewriter, state=None, dry_run=False, workers=DEFAULT_WORKERS):
+    """Rewrite many files in parallel; results keep the order of paths"""
+    state = state or {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(lambda path: rewrite_file(path, rewriter, state.get(path), dry_run), paths))
+
+
+def print_results(results):
+    """Print one line per processed file, any diffs, and the totals"""
+    counts = dict.fromkeys((FIXED, UNCHANGED, SKIPPED, FAILED), 0)
+    for result in results:
+        counts[result['status']] += 1
+        path = result['path']
+        if result['status'] == FIXED:
+            if result['diff'] is not None:
+                progress(f"📝 Would fix {result['count']} reference(s) in {path}")
+                print(result['diff'], end='')
+            else:
+                progress(f"✅ Fixed references in {path}")
+        elif result['status'] == UNCHANGED:
+            progress(f"✓ No changes needed in {path}")
+        elif result['status'] == FAILED:
+            print(f"⚠️ Error processing {path}: {result['error']}")
+
+    print(f"📊 XML: {len(results)} files, {counts[FIXED]} fixed, {counts[UNCHANGED]} unchanged, "
+          f"{counts[SKIPPED]} skipped (unchanged since last run), {counts[FAILED]} failed")
+    return counts
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Tip Image Optimization Script for BeautyGlow Flutter App
+Recompresses the bundled tip images losslessly (or lossy within a quality
+threshold) on a bounded worker pool, skipping files already optimized
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from PIL import Image, ImageChops, ImageStat
+from icon_cache import file_digest
+from icon_encode import PngEncoder
+
+# Tip images bundled through the assets/images/tips/ entry in pubspec.yaml
+TIPS_DIR = 'assets/images/tips'
+
+# Kept outside the tips folder so it is never bundled into the app
+MANIFEST_PATH = 'assets/images/.tips_optimization.json'
+
+# Lossy palette output is only accepted at or above this PSNR (dB)
+DEFAULT_MIN_PSNR = 40.0
+
+IMAGE_EXTENSIONS = ('.png',)
+
+
+def psnr(original, candidate):
+    """Peak signal-to-noise ratio between two images of the same size"""
+    diff = ImageChops.difference(original.convert('RGB'), candidate.convert('RGB'))
+    mse = sum(rms ** 2 for rms in ImageStat.Stat(diff).rms) / 3
+    if mse == 0:
+        return float('inf')
+    return 10 * math.log10(255 ** 2 / mse)
+
+
+def has_alpha(image):
+    """Whether an image carries transparency (alpha band or a transparent palette entry)"""
+    return image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+
+
+def recompress(path, lossy=False, min_psnr=DEFAULT_MIN_PSNR):
+    """Return (best encoded bytes or None, method, psnr) for one image"""
+    original_bytes = os.path.getsize(path)
+    with Image.open(path) as image:
+        image.load()
+        encoder = PngEncoder('release')
+        best = encoder.encode(image)
+        method, quality = 'lossless', float('inf')
+
+        # The RGB palette would flatten transparency that psnr() cannot see
+        if lossy and not has_alpha(image):
+            palette = image.convert('RGB').quantize(colors=256, method=Image.Quantize.MEDIANCUT,
+                                                    dither=Image.Dither.NONE)
+            score = psnr(image, palette)
+            if score >= min_psnr:
+                buffer = io.BytesIO()
+                palette.save(buffer, format='PNG', optimize=True)
+                if len(buffer.getvalue()) < len(best):
+                    best, method, quality = buffer.getvalue(), 'lossy', score
+
+    if len(best) >= original_bytes:
+        return None, 'unchanged', float('inf')
+    return best, method, quality
+
+
+def optimize_file(path, lossy, min_psnr, dry_run):
+    """Optimize one image in place and return its report row"""
+    start = time.perf_counter()
+    before = os.path.getsize(path)
+    data, method, quality = recompress(path, lossy, min_psnr)
+
+    if data is not None and not dry_run:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    return {
+        'file': os.path.basename(path),
+        'method': method,
+        'before': before,
+        'after': len(data) if data is not None else before,
+        'psnr': '' if math.isinf(quality) else round(quality, 2),
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def load_manifest(manifest_path):
+    """Load the manifest of already optimized files"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, manifest_path):
+    """Persist the manifest atomically"""
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def settings_label(lossy, min_psnr):
+    """Manifest label for the optimization settings"""
+    return f"lossy:{min_psnr:g}" if lossy else 'lossless'
+
+
+def iter_images(images_dir):
+    """Yield image paths in the directory without building a full listing"""
+    with os.scandir(images_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                yield entry.path
+
+
+def optimize_directory(images_dir, manifest, workers, lossy=False,
+                       min_psnr=DEFAULT_MIN_PSNR, dry_run=False, force=False):
+    """Stream the directory through a bounded pool and return report rows"""
+    settings = settings_label(lossy, min_psnr)
+    rows = []
+    skipped = 0
+    in_flight = {}
+    max_in_flight = workers * 2
+
+    def finish(done):
+        for future in done:
+            path = in_flight.pop(future)
+            try:
+                row = future.result()
+            except Exception as e:
+                print(f"⚠️ Error optimizing {path}: {e}")
+                continue
+            rows.append(row)
+            saved = row['before'] - row['after']
+            print(f"✓ {row['file']}: {row['before'] / 1024:.0f} KB → "
+                  f"{row['after'] / 1024:.0f} KB ({row['method']}, -{saved / 1024:.0f} KB)")
+            if not dry_run:
+                manifest[row['file']] = {'sha256': file_digest(path), 'settings': settings}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path in iter_images(images_dir):
+            entry = manifest.get(os.path.basename(path))
+            if (not force and entry and entry.get('settings') == settings
+                    and entry.get('sha256') == file_digest(path)):
+                skipped += 1
+                continue
+
+            # Keep at most a few images decoded at once
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                finish(done)
+            future = pool.submit(optimize_file, path, lossy, min_psnr, dry_run)
+            in_flight[future] = path
+
+        if in_flight:
+            finish(list(in_flight))
+
+    rows.sort(key=lambda row: row['file'])
+    return rows, skipped
+
+
+def print_report(rows, skipped):
+    """Print the before/after size summary"""
+    before = sum(row['before'] for row in rows)
+    after = sum(row['after'] for row in rows)
+    changed = sum(1 for row in rows if row['method'] != 'unchanged')
+
+    print(f"\n📊 Tip Image Optimization Summary:")
+    print(f"   Processed: {len(rows)} (skipped as already optimized: {skipped})")
+    print(f"   Recompressed: {changed}")
+    print(f"   Before: {before / (1024 * 1024):.2f} MB")
+    print(f"   After: {after / (1024 * 1024):.2f} MB")
+    if before:
+        print(f"   Saved: {(before - after) / (1024 * 1024):.2f} MB "
+              f"({(before - after) / before * 100:.1f}%)")
+
+
+def write_report(rows, report_path):
+    """Write the per-file before/after report as CSV"""
+    with open(report_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['file', 'method', 'before', 'after', 'psnr', 'seconds'])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    """Main function to optimize the bundled tip images"""
+    parser = argparse.ArgumentParser(description="Recompress BeautyGlow tip images")
+    parser.add_argument('--dir', default=TIPS_DIR, help='Directory of images to optimize')
+    parser.add_argument('--manifest', default=MANIFEST_PATH, help='Hash manifest of optimized files')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker threads')
+    parser.add_argument('--lossy', action='store_true',
+                        help='Allow 256-colour palette output when it stays above --min-psnr')
+    parser.add_argument('--min-psnr', type=float, default=DEFAULT_MIN_PSNR,
+                        help='Minimum PSNR in dB for lossy output')
+    parser.add_argument('--dry-run', action='store_true', help='Report savings without writing')
+    parser.add_argument('--force', action='store_true', help='Ignore the manifest')
+    parser.add_argument('--report', help='Write the per-file report to this CSV file')
+    args = parser.parse_args()
+
+    print("🖼️ BeautyGlow Tip Image Optimization Script")
+    print("=" * 50)
+
+    if not os.path.isdir(args.dir):
+        print(f"❌ Image directory not found: {args.dir}")
+        return 1
+
+    manifest = load_manifest(args.manifest)
+    rows, skipped = optimize_directory(args.dir, manifest, max(1, args.jobs), args.lossy,
+                                       args.min_psnr, args.dry_run, args.force)
+    if not args.dry_run:
+        save_manifest(manifest, args.manifest)
+
+    print_report(rows, skipped)
+    if args.report:
+        write_report(rows, args.report)
+        print(f"   Report: {args.report}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
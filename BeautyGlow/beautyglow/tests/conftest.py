@@ -0,0 +1,12 @@
+"""
+Pytest setup for the BeautyGlow asset scripts
+The scripts are flat modules next to this folder, imported as the scripts import each other
+"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
@@ -0,0 +1,108 @@
+"""
+Tests for the APK content size analyzer, on small synthetic zips
+"""
+
+import zipfile
+import pytest
+
+from apk_analyzer import analyze_apk, categorize, print_diff, report_apk
+
+BASE_ENTRIES = {
+    'lib/arm64-v8a/x.so': 4000,
+    'assets/flutter_assets/assets/images/tips/tip1.png': 3000,
+    'assets/flutter_assets/assets/images/logo.png': 2000,
+    'assets/flutter_assets/AssetManifest.json': 100,
+    'res/mipmap-hdpi/ic_launcher.png': 500,
+    'res/drawable/splash.png': 300,
+    'resources.arsc': 200,
+    'classes.dex': 1500,
+    'META-INF/CERT.SF': 50,
+    'kotlin/collections.kotlin_builtins': 10,
+}
+
+
+def write_apk(path, entries):
+    """A stored (uncompressed) zip, so compressed sizes equal the entry sizes"""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as apk:
+        apk.writestr('res/', '')
+        for name, size in entries.items():
+            apk.writestr(name, b'x' * size)
+    return str(path)
+
+
+@pytest.mark.parametrize('name, category', [
+    ('res/mipmap-xxhdpi/ic_launcher.png', 'launcher icons'),
+    ('res/drawable-v21/launch_background.xml', 'drawables'),
+    ('res/layout/main.xml', 'other resources'),
+    ('resources.arsc', 'other resources'),
+    ('assets/flutter_assets/assets/images/tips/tip1.png', 'tip images'),
+    ('assets/flutter_assets/assets/images/logo.png', 'app images'),
+    ('assets/flutter_assets/fonts/MaterialIcons-Regular.otf', 'flutter assets'),
+    ('lib/arm64-v8a/libflutter.so', 'native libs'),
+    ('classes.dex', 'dex'),
+    ('classes2.dex', 'dex'),
+    ('META-INF/MANIFEST.MF', 'signature'),
+    ('AndroidManifest.xml', 'other'),
+])
+def test_categorize(name, category):
+    assert categorize(name) == category
+
+
+def test_analyze_apk_totals(tmp_path):
+    breakdown = analyze_apk(write_apk(tmp_path / 'app.apk', BASE_ENTRIES))
+
+    total = sum(BASE_ENTRIES.values())
+    assert breakdown['compressed'] == total
+    assert breakdown['uncompressed'] == total
+    assert len(breakdown['entries']) == len(BASE_ENTRIES)  # directories are skipped
+    assert breakdown['categories']['native libs'] == {'files': 1, 'compressed': 4000, 'uncompressed': 4000}
+    assert breakdown['categories']['flutter assets']['files'] == 1
+    assert breakdown['categories']['other resources'] == {'files': 1, 'compressed': 200, 'uncompressed': 200}
+    assert breakdown['categories']['other']['compressed'] == 10
+    assert sum(stats['files'] for stats in breakdown['categories'].values()) == len(BASE_ENTRIES)
+
+
+def test_compressed_entries(tmp_path):
+    path = tmp_path / 'app.apk'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as apk:
+        apk.writestr('classes.dex', b'\0' * 10000)
+    breakdown = analyze_apk(str(path))
+    assert breakdown['uncompressed'] == 10000
+    assert breakdown['compressed'] < 1000
+
+
+def test_print_diff(tmp_path, capsys):
+    previous = analyze_apk(write_apk(tmp_path / 'old.apk', BASE_ENTRIES))
+    entries = dict(BASE_ENTRIES)
+    del entries['res/drawable/splash.png']
+    entries['lib/arm64-v8a/x.so'] = 6048
+    entries['assets/flutter_assets/assets/images/tips/tip2.png'] = 1024
+    current = analyze_apk(write_apk(tmp_path / 'new.apk', entries))
+
+    print_diff(previous, current)
+    lines = capsys.readouterr().out.splitlines()
+
+    assert lines[1] == '📊 Compared with previous build: +2.7 KB compressed'
+    assert '   native libs              3.9 KB →         5.9 KB  (+2.0 KB)' in lines
+    assert '   drawables                0.3 KB →         0.0 KB  (-0.3 KB)' in lines
+    assert '   +       2.0 KB  lib/arm64-v8a/x.so' in lines
+    assert '   +       1.0 KB  assets/flutter_assets/assets/images/tips/tip2.png (new)' in lines
+    assert '   -       0.3 KB  res/drawable/splash.png (removed)' in lines
+    assert not any('classes.dex' in line for line in lines)
+
+
+def test_print_diff_unchanged(tmp_path, capsys):
+    breakdown = analyze_apk(write_apk(tmp_path / 'app.apk', BASE_ENTRIES))
+    print_diff(breakdown, breakdown)
+    assert 'No entries changed size' in capsys.readouterr().out
+
+
+def test_report_apk_diffs_against_saved_breakdown(tmp_path, capsys):
+    saved = str(tmp_path / 'breakdown.json')
+    report_apk(write_apk(tmp_path / 'old.apk', BASE_ENTRIES), saved)
+    assert 'Compared with previous build' not in capsys.readouterr().out
+
+    entries = dict(BASE_ENTRIES, **{'classes2.dex': 2048})
+    report_apk(write_apk(tmp_path / 'new.apk', entries), saved)
+    out = capsys.readouterr().out
+    assert '+       2.0 KB  classes2.dex (new)' in out
@@ -0,0 +1,51 @@
+"""
+Tests for the asset tooling entry point: quick commands start without Pillow,
+and commands that need it report a missing install with their own exit status
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+import pytest
+
+from beautyglow_assets import MISSING_DEPENDENCY
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'beautyglow_assets.py')
+
+# Generous bound on a quick command's --help, interpreter startup included
+STARTUP_LIMIT = 1.5
+
+# -X importtime lists every imported module on stderr, one per line: "... | name"
+PILLOW_IMPORT = re.compile(r'\|\s+PIL(\.|$)', re.MULTILINE)
+
+
+def run_cli(args, env=None, options=()):
+    return subprocess.run([sys.executable, *options, SCRIPT, *args], capture_output=True, text=True,
+                          env=env, timeout=60)
+
+
+@pytest.mark.parametrize('command', ['verify', 'fix-refs'])
+def test_quick_command_help_skips_pillow(command):
+    start = time.perf_counter()
+    result = run_cli([command, '--help'], options=['-X', 'importtime'])
+    elapsed = time.perf_counter() - start
+
+    assert result.returncode == 0
+    assert f"beautyglow-assets {command}" in result.stdout
+    assert not PILLOW_IMPORT.search(result.stderr)
+    assert elapsed < STARTUP_LIMIT
+
+
+def test_command_needing_pillow_reports_missing_install(tmp_path):
+    # A PIL package that fails to import the way an absent one does
+    package = tmp_path / 'PIL'
+    package.mkdir()
+    (package / '__init__.py').write_text('raise ModuleNotFoundError("No module named \'PIL\'", name="PIL")\n')
+    env = dict(os.environ, PYTHONPATH=str(tmp_path))
+
+    result = run_cli(['icons'], env=env)
+
+    assert result.returncode == MISSING_DEPENDENCY
+    assert "'icons' needs Pillow" in result.stdout
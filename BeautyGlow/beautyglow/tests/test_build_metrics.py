@@ -0,0 +1,86 @@
+"""
+Tests for the build metrics history
+"""
+
+import sqlite3
+
+from build_metrics import MB, flag_runs, load_runs, record_run
+
+
+def step_result(ok):
+    return {'ok': ok, 'timed_out': False, 'duration': 1.0}
+
+
+def recorded_run(db_path):
+    connection = sqlite3.connect(db_path)
+    row = connection.execute("SELECT ok, apk_size FROM runs").fetchone()
+    connection.close()
+    return row
+
+
+def test_failed_optional_step_keeps_run_ok_and_apk_size(tmp_path):
+    apk = tmp_path / 'app-debug.apk'
+    apk.write_bytes(b'x' * 1234)
+    results = {'check-flutter': step_result(True), 'gradle-clean': step_result(False),
+               'pub-get': step_result(True), 'build-apk': step_result(True)}
+    db_path = str(tmp_path / 'metrics.sqlite')
+
+    record_run(db_path, 'full', results, 10.0, str(apk),
+               required=['check-flutter', 'pub-get', 'build-apk'], apk_step='build-apk')
+
+    assert recorded_run(db_path) == (1, 1234)
+
+
+def test_failed_required_step_fails_run(tmp_path):
+    apk = tmp_path / 'app-debug.apk'
+    apk.write_bytes(b'x' * 1234)
+    results = {'pub-get': step_result(True), 'build-apk': step_result(False)}
+    db_path = str(tmp_path / 'metrics.sqlite')
+
+    record_run(db_path, 'full', results, 10.0, str(apk), required=['pub-get', 'build-apk'],
+               apk_step='build-apk')
+
+    assert recorded_run(db_path) == (0, None)
+
+
+def history(*runs):
+    """Synthetic runs, oldest first: (mode, ok, {step: duration}, apk MB)"""
+    return [{'id': number, 'mode': mode, 'ok': ok, 'steps': steps,
+             'wall_time': sum(duration or 0 for duration in steps.values()),
+             'apk_size': apk_mb * MB if apk_mb is not None else None}
+            for number, (mode, ok, steps, apk_mb) in enumerate(runs, 1)]
+
+
+def test_build_time_compared_with_runs_of_the_same_steps():
+    runs = history(
+        ('full', True, {'pub-get': 5.0, 'build-apk': 40.0}, 20),
+        # The clean ran this time; slower, but not comparable with run 1
+        ('full', True, {'gradle-clean': 30.0, 'pub-get': 5.0, 'build-apk': 40.0}, 20),
+        ('full', True, {'gradle-clean': None, 'pub-get': 5.0, 'build-apk': 41.0}, 20),
+        ('full', True, {'gradle-clean': 30.0, 'pub-get': 5.0, 'build-apk': 70.0}, 20),
+        ('incremental', True, {'build-apk': 80.0}, 20),
+    )
+
+    assert flag_runs(runs) == {4: ['build time +40%']}
+
+
+def test_failed_runs_and_small_deltas_are_not_flagged_for_time():
+    runs = history(
+        ('full', True, {'build-apk': 10.0}, 20),
+        ('full', False, {'build-apk': 60.0}, None),
+        ('full', True, {'build-apk': 14.0}, 20),
+        ('full', True, {'build-apk': 30.0}, 22),
+    )
+
+    assert flag_runs(runs) == {4: ['build time +114%', 'APK +2.00 MB']}
+
+
+def test_recorded_steps_round_trip(tmp_path):
+    db_path = str(tmp_path / 'metrics.sqlite')
+    results = {'gradle-clean': None, 'build-apk': step_result(True)}
+    record_run(db_path, 'full', results, 1.0)
+
+    runs = load_runs(db_path)
+
+    assert runs[0]['steps'] == {'gradle-clean': None, 'build-apk': 1.0}
+    assert flag_runs(runs) == {}
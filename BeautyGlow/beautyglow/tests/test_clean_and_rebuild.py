@@ -0,0 +1,146 @@
+"""
+Tests for the incremental clean-and-rebuild runner
+Stub flutter and gradlew scripts on PATH record the commands the runner starts
+"""
+
+import asyncio
+import os
+import sys
+import time
+import pytest
+
+import clean_and_rebuild
+import icon_trace
+from clean_and_rebuild import (APK_PATH, STEP_BUILD_APK, STEP_GRADLE_CLEAN, STEP_PUB_GET, changed_groups,
+                               fingerprint_inputs, load_build_state, plan_steps, run_command)
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason='stub binaries are shell scripts')
+
+FLUTTER_STUB = """#!/bin/sh
+echo "flutter $*" >> "$STUB_LOG"
+case "$1" in
+    --version) echo "Flutter 3.0.0 • channel stable" ;;
+    pub) mkdir -p .dart_tool && echo '{}' > .dart_tool/package_config.json ;;
+    build) mkdir -p build/app/outputs/flutter-apk && echo apk > build/app/outputs/flutter-apk/app-debug.apk ;;
+esac
+"""
+
+GRADLEW_STUB = """#!/bin/sh
+echo "gradlew $*" >> "$STUB_LOG"
+"""
+
+# Prints a line, then outlives any sensible timeout unless it is killed
+SLOW_STUB = """#!/bin/sh
+echo started
+sleep 2
+echo "slow finished" >> "$STUB_LOG"
+"""
+
+PUBSPEC = """name: stub_app
+flutter:
+  assets:
+    - assets/images/
+"""
+
+
+def write_file(path, text, executable=False):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    if executable:
+        os.chmod(path, 0o755)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A minimal Flutter project with stub flutter/gradlew binaries first on PATH"""
+    bin_dir = tmp_path / 'bin'
+    write_file(str(bin_dir / 'flutter'), FLUTTER_STUB, executable=True)
+    write_file(str(bin_dir / 'gradlew'), GRADLEW_STUB, executable=True)
+    write_file(str(bin_dir / 'slow'), SLOW_STUB, executable=True)
+
+    app = tmp_path / 'app'
+    write_file(str(app / 'pubspec.yaml'), PUBSPEC)
+    write_file(str(app / 'android' / 'build.gradle'), 'buildscript {}\n')
+    write_file(str(app / 'android' / 'app' / 'src' / 'main' / 'res' / 'mipmap-mdpi' / 'ic_launcher.png'), 'icon')
+    write_file(str(app / 'assets' / 'images' / 'logo.png'), 'logo')
+    write_file(str(app / 'lib' / 'main.dart'), 'void main() {}\n')
+
+    log = tmp_path / 'commands.log'
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv('STUB_LOG', str(log))
+    monkeypatch.chdir(app)
+    yield {'app': app, 'log': log}
+    # main() configures the process-wide tracer from --quiet
+    icon_trace.configure()
+
+
+def run_incremental(project, monkeypatch):
+    """Run the script with --incremental and return the stub commands it started"""
+    if project['log'].exists():
+        project['log'].unlink()
+    monkeypatch.setattr(sys, 'argv', ['clean_and_rebuild.py', '--incremental', '--no-metrics',
+                                      '--no-apk-analysis', '--quiet'])
+    clean_and_rebuild.main()
+    if not project['log'].exists():
+        return []
+    return [line for line in project['log'].read_text().splitlines() if line != 'flutter --version']
+
+
+def planned_steps():
+    """Steps the next --incremental run would take"""
+    state = load_build_state(clean_and_rebuild.DEFAULT_STATE_PATH)
+    return plan_steps(state, changed_groups(state, fingerprint_inputs()), os.path.exists(APK_PATH))
+
+
+def test_incremental_plans(project, monkeypatch):
+    # No saved state: the full clean build runs and records its inputs
+    assert run_incremental(project, monkeypatch) == [
+        'gradlew clean', 'flutter clean', 'flutter pub get', 'flutter build apk --debug']
+    assert os.path.exists(APK_PATH)
+
+    # Nothing changed
+    assert planned_steps() == []
+    assert run_incremental(project, monkeypatch) == []
+
+    # An Android resource only needs the build
+    write_file('android/app/src/main/res/mipmap-mdpi/ic_launcher.png', 'new icon')
+    assert planned_steps() == [STEP_BUILD_APK]
+    assert run_incremental(project, monkeypatch) == ['flutter build apk --debug']
+
+    # pubspec.yaml needs the dependencies fetched again
+    write_file('pubspec.yaml', PUBSPEC + 'version: 1.0.1\n')
+    assert planned_steps() == [STEP_PUB_GET, STEP_BUILD_APK]
+    assert run_incremental(project, monkeypatch) == ['flutter pub get', 'flutter build apk --debug']
+
+    # Gradle configuration needs a Gradle clean
+    write_file('android/build.gradle', 'buildscript { ext.kotlin_version = "1.9.0" }\n')
+    assert planned_steps() == [STEP_GRADLE_CLEAN, STEP_BUILD_APK]
+    assert run_incremental(project, monkeypatch) == ['gradlew clean', 'flutter build apk --debug']
+
+    assert planned_steps() == []
+
+
+def test_timed_out_step_is_killed(project, capsys):
+    start = time.perf_counter()
+    result = asyncio.run(run_command('slow', 'Slow step', timeout=0.5, label='slow'))
+    elapsed = time.perf_counter() - start
+
+    assert result['timed_out']
+    assert not result['ok']
+    assert result['stdout'] == ['started']
+    assert elapsed < 1.5
+    assert 'Slow step timed out after 0.5s' in capsys.readouterr().out
+
+    # The killed script never gets to its last line
+    time.sleep(2)
+    assert not project['log'].exists()
+
+
+def test_timeout_covers_a_child_that_closes_its_output(project, capsys):
+    start = time.perf_counter()
+    result = asyncio.run(run_command('exec >&- 2>&-; sleep 30', 'Silent step', timeout=0.5, label='silent'))
+
+    assert result['timed_out']
+    assert time.perf_counter() - start < 5
+    assert 'Silent step timed out after 0.5s' in capsys.readouterr().out
@@ -0,0 +1,54 @@
+"""
+Tests for the mipmap verification of the icon reference fixer
+"""
+
+import os
+import pytest
+from PIL import Image
+
+import fix_icon_references
+from fix_icon_references import RES_DIR, verify_mipmap_files
+from icon_sizes import ADAPTIVE_ICON_SIZE, ANDROID_MIPMAP_SIZES
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for folder, size in ANDROID_MIPMAP_SIZES.items():
+        folder_dir = os.path.join(RES_DIR, folder)
+        os.makedirs(folder_dir)
+        Image.new('RGB', (size, size)).save(os.path.join(folder_dir, 'ic_launcher.png'))
+        for layer in ('ic_launcher_foreground.png', 'ic_launcher_background.png'):
+            Image.new('RGB', (ADAPTIVE_ICON_SIZE, ADAPTIVE_ICON_SIZE)).save(os.path.join(folder_dir, layer))
+    return tmp_path
+
+
+def test_generated_mipmaps_pass(project):
+    assert verify_mipmap_files()
+
+
+def test_wrong_size_fails(project, capsys):
+    Image.new('RGB', (50, 50)).save(os.path.join(RES_DIR, 'mipmap-hdpi', 'ic_launcher.png'))
+    assert not verify_mipmap_files()
+    assert 'Is 50x50, expected 72x72' in capsys.readouterr().out
+
+
+def test_expectation_keys_are_normalized(project, monkeypatch):
+    # Keys spelled differently from the required paths, as os.path.join builds them on Windows
+    expectations = fix_icon_references.icon_expectations()
+    monkeypatch.setattr(fix_icon_references, 'icon_expectations', lambda: {
+        os.path.join('.', '.', path): expected for path, expected in expectations.items()})
+    Image.new('RGB', (50, 50)).save(os.path.join(RES_DIR, 'mipmap-hdpi', 'ic_launcher.png'))
+    assert not verify_mipmap_files()
+
+
+def test_missing_expectation_is_an_error(project, monkeypatch, capsys):
+    monkeypatch.setattr(fix_icon_references, 'icon_expectations', lambda: {})
+    assert not verify_mipmap_files()
+    assert 'No expected size known' in capsys.readouterr().out
+
+
+def test_missing_res_directory(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert not verify_mipmap_files()
+    assert 'Res directory not found' in capsys.readouterr().out
@@ -0,0 +1,55 @@
+"""
+Tests for the fused icon enhancement kernel
+The NumPy batch must produce exactly the bytes of the two ImageEnhance passes
+"""
+
+import random
+import pytest
+from PIL import Image
+
+pytest.importorskip('numpy')
+
+from icon_enhance import enhance, enhance_batch, enhance_pillow, enhance_sizes
+
+# Odd, tiny and non-square sizes exercise the edge pixels SMOOTH leaves untouched
+SIZES = [(1, 1), (2, 3), (3, 5), (17, 17), (48, 49), (64, 64), (5, 7)]
+
+
+def synthetic_image(mode, size, seed):
+    """A deterministic noise image, the worst case for the smoothing filter"""
+    rng = random.Random(seed)
+    width, height = size
+    return Image.frombytes(mode, size, bytes(rng.randrange(256) for _ in range(width * height * len(mode))))
+
+
+def assert_identical(expected, actual):
+    assert actual.mode == expected.mode
+    assert actual.size == expected.size
+    assert actual.tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize('mode', ['RGB', 'RGBA'])
+def test_batch_matches_pillow(mode):
+    images = [synthetic_image(mode, size, seed) for seed, size in enumerate(SIZES)]
+    for image, enhanced in zip(images, enhance_batch(images)):
+        assert_identical(enhance_pillow(image), enhanced)
+
+
+@pytest.mark.parametrize('sharpness, contrast', [(0.5, 1.5), (1.0, 1.0), (2.0, 0.8)])
+def test_factors_match_pillow(sharpness, contrast):
+    image = synthetic_image('RGB', (32, 24), 7)
+    assert_identical(enhance_pillow(image, sharpness, contrast), enhance(image, sharpness, contrast))
+
+
+def test_gradient_icon_sizes_match_pillow():
+    source = Image.linear_gradient('L').convert('RGB').rotate(30)
+    sizes = [48, 72, 96, 144, 192]
+    fused = enhance_sizes(source, sizes, engine='numpy')
+    reference = enhance_sizes(source, sizes, engine='pillow')
+    for size in sizes:
+        assert_identical(reference[size], fused[size])
+
+
+def test_unsupported_mode_falls_back_to_pillow():
+    image = synthetic_image('L', (16, 16), 3)
+    assert_identical(enhance_pillow(image), enhance_batch([image])[0])
@@ -0,0 +1,122 @@
+"""
+Tests for the icon build graph: renders shared between sources and the
+thread and process executors
+"""
+
+import os
+import pytest
+from PIL import Image
+
+import icon_enhance
+import icon_output
+from icon_cache import IconCache
+from icon_graph import ENHANCED_SIZES, FAILED, WRITTEN, GraphSources, build_graph, run_graph
+from icon_source import shared_source
+
+RED = (220, 30, 30)
+BLUE = (30, 30, 220)
+
+# One rule per transform that reads the source, plus shared and solid nodes
+MANIFEST = {
+    'source': 'icon.png',
+    'targets': {'test': [
+        {'path': 'out/big.png', 'size': 128, 'transform': 'pyramid'},
+        {'path': 'out/small.png', 'size': 40, 'transform': 'pyramid'},
+        {'path': 'out/copy.png', 'size': 40, 'transform': 'pyramid'},
+        {'path': 'out/round.png', 'size': 48, 'transform': 'circular'},
+        {'path': 'out/direct.png', 'size': 36, 'transform': 'lanczos'},
+        {'path': 'out/clean.png', 'size': 72, 'transform': 'enhanced'},
+        {'path': 'out/background.png', 'size': 32, 'transform': 'background'},
+    ]},
+}
+
+
+@pytest.fixture
+def numpy_engine():
+    pytest.importorskip('numpy')
+    previous = icon_enhance.active_engine()
+    icon_enhance.use_engine('numpy')
+    yield
+    icon_enhance.use_engine(previous)
+
+
+def center(image):
+    return image.getpixel((image.width // 2, image.height // 2))
+
+
+def is_red(pixel):
+    return pixel[0] > pixel[2]
+
+
+def test_enhanced_batches_are_per_source(numpy_engine):
+    size = ENHANCED_SIZES[0]
+    red = GraphSources(Image.new('RGB', (256, 256), RED), [])
+    blue = GraphSources(Image.new('RGB', (256, 256), BLUE), [])
+
+    assert is_red(center(red.render(size, 'enhanced')))
+    assert not is_red(center(blue.render(size, 'enhanced')))
+
+
+def test_shared_source_reloads_changed_file(tmp_path):
+    path = str(tmp_path / 'icon.png')
+    Image.new('RGB', (64, 64), RED).save(path)
+    loader = shared_source(path)
+    assert center(loader.image()) == RED
+    digest = loader.digest()
+
+    Image.new('RGB', (64, 64), BLUE).save(path)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    loader = shared_source(path)
+    assert center(loader.image()) == BLUE
+    assert loader.digest() != digest
+
+
+def rendered_bytes(root):
+    out = root / 'out'
+    return {name: (out / name).read_bytes() for name in sorted(os.listdir(out))}
+
+
+def save_gradient(path):
+    gradient = Image.linear_gradient('L').resize((256, 256))
+    Image.merge('RGB', (gradient, gradient.rotate(90), gradient.rotate(180))).save(path)
+
+
+def test_process_executor_matches_threads(tmp_path):
+    save_gradient(tmp_path / 'icon.png')
+    graph = build_graph(MANIFEST, ['test'], str(tmp_path))
+
+    outcomes = {}
+    outputs = {}
+    for executor in ('thread', 'process'):
+        written = icon_output.outputs.written
+        outcomes[executor] = run_graph(graph, workers=2, executor=executor)
+        outputs[executor] = rendered_bytes(tmp_path)
+        # Counts of the worker processes are merged back into this one
+        assert icon_output.outputs.written - written == len(graph.destinations)
+        for path in graph.destinations:
+            os.remove(path)
+
+    assert FAILED not in outcomes['process'].values()
+    assert outcomes['process'] == outcomes['thread']
+    assert outputs['process'] == outputs['thread']
+    assert outputs['thread']['copy.png'] == outputs['thread']['small.png']
+
+
+def test_cached_pyramid_node_needs_the_same_levels(tmp_path):
+    save_gradient(tmp_path / 'icon.png')
+    small_only = {'source': 'icon.png', 'targets': {'test': [MANIFEST['targets']['test'][1]]}}
+    small = tmp_path / 'out' / 'small.png'
+    cache = IconCache(str(tmp_path / 'cache'))
+
+    # With the 128 level present the 40 is derived from it, not from the source
+    run_graph(build_graph(MANIFEST, ['test'], str(tmp_path)), cache=cache)
+    from_level = small.read_bytes()
+    os.remove(small)
+
+    outcomes = run_graph(build_graph(small_only, ['test'], str(tmp_path)), cache=cache)
+    cached = small.read_bytes()
+    os.remove(small)
+    run_graph(build_graph(small_only, ['test'], str(tmp_path)))
+
+    assert list(outcomes.values()) == [WRITTEN]
+    assert cached == small.read_bytes() != from_level
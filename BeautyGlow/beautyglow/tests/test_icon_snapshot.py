@@ -0,0 +1,105 @@
+"""
+Tests for the content-addressed icon snapshot store
+"""
+
+import os
+import stat
+import time
+import pytest
+
+import icon_snapshot
+from icon_snapshot import SnapshotStore
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_latest_follows_creation_order_not_names(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path / 'store'))
+    icon = write(tmp_path / 'icon.png', b'one')
+    # Both snapshots fall in the same second, where the labels alone would sort 'b' before 'z'
+    monkeypatch.setattr(time, 'time', lambda: 1700000000.0)
+
+    first, _ = store.create([icon], label='z')
+    write(tmp_path / 'icon.png', b'two')
+    second, _ = store.create([icon], label='b')
+
+    assert store.names() == [first, second]
+    assert store.resolve('latest') == second
+    assert store.load(second)['sequence'] == 2
+    assert store.create([icon]) == (None, 0)
+
+
+def test_prune_removes_read_only_blobs(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path / 'store'))
+    icon = tmp_path / 'icon.png'
+    for data in (b'one', b'two', b'three'):
+        store.create([write(icon, data)])
+
+    # Windows refuses to delete read-only files, even for their owner
+    remove = os.remove
+
+    def windows_remove(path):
+        if not os.stat(path).st_mode & stat.S_IWRITE:
+            raise PermissionError(f"Access is denied: '{path}'")
+        remove(path)
+    monkeypatch.setattr(icon_snapshot.os, 'remove', windows_remove)
+
+    assert store.prune(keep=1) == (2, 2, len(b'one') + len(b'two'))
+    assert store.usage() == (1, len(b'three'))
+    assert store.load(store.resolve('latest'))['files'][os.path.normpath(str(icon))]['bytes'] == 5
+
+
+def test_restore_copies_writable_files_by_default(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'store'))
+    icon = write(tmp_path / 'icon.png', b'one')
+    name, _ = store.create([icon])
+    write(tmp_path / 'icon.png', b'two')
+
+    assert store.restore(name, backup=False) == (name, 1)
+
+    status = os.stat(icon)
+    assert status.st_nlink == 1
+    assert status.st_mode & stat.S_IWUSR
+    # Writing into the restored file leaves the stored history alone
+    with open(icon, 'wb') as f:
+        f.write(b'edited')
+    assert store.restore(name, backup=False) == (name, 1)
+    assert (tmp_path / 'icon.png').read_bytes() == b'one'
+
+
+def test_restore_replaces_earlier_hard_links(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'store'))
+    icon = write(tmp_path / 'icon.png', b'one')
+    name, _ = store.create([icon])
+    os.remove(icon)
+    store.restore(name, link='hardlink', backup=False)
+    assert os.stat(icon).st_nlink == 2
+
+    store.restore(name, backup=False)
+
+    assert os.stat(icon).st_nlink == 1
+    assert os.stat(icon).st_mode & stat.S_IWUSR
+
+
+def test_restore_rejects_rewritten_blobs(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'store'))
+    icon = write(tmp_path / 'icon.png', b'one')
+    name, _ = store.create([icon])
+    os.remove(icon)
+    store.restore(name, link='hardlink', backup=False)
+
+    # A tool that makes the file writable and rewrites it in place reaches the blob
+    os.chmod(icon, stat.S_IRUSR | stat.S_IWUSR)
+    with open(icon, 'wb') as f:
+        f.write(b'oops')
+
+    with pytest.raises(ValueError, match='bytes changed'):
+        store.restore(name, backup=False)
+    # Snapshotting the original bytes again stores a good blob
+    write(tmp_path / 'other.png', b'one')
+    assert store.add_blob(str(tmp_path / 'other.png'))[1]
+    assert store.restore(name, backup=False) == (name, 1)
+    assert (tmp_path / 'icon.png').read_bytes() == b'one'
@@ -0,0 +1,42 @@
+"""
+Tests for the shared source loader: one decode per run, shared by every
+step, and persisted rasters attached byte-identical to a fresh decode
+"""
+
+import os
+from PIL import Image
+
+import icon_source
+from icon_source import shared_source
+
+
+def save_noise(path):
+    noise = Image.effect_noise((96, 96), 64)
+    Image.merge('RGB', (noise, noise.rotate(90), noise.rotate(180))).save(path, quality=95)
+
+
+def test_steps_share_one_decode(tmp_path):
+    path = str(tmp_path / 'icon.jpg')
+    save_noise(path)
+
+    loader = shared_source(path)
+    images = [shared_source(path).image() for _ in range(3)]
+
+    assert all(image is images[0] for image in images)
+    assert loader.decodes == 1
+
+
+def test_persisted_raster_matches_a_fresh_decode(tmp_path, monkeypatch):
+    path = str(tmp_path / 'icon.jpg')
+    save_noise(path)
+    rasters = str(tmp_path / 'rasters')
+    decoded = shared_source(path, persist_dir=rasters).image()
+    assert os.listdir(rasters)
+
+    # A later run starts with no loaders and attaches to the raster instead of decoding
+    monkeypatch.setattr(icon_source, '_loaders', {})
+    loader = shared_source(path, persist_dir=rasters)
+    attached = loader.image()
+
+    assert loader.decodes == 0 and loader.raster
+    assert attached.tobytes() == decoded.tobytes()
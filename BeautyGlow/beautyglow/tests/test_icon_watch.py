@@ -0,0 +1,106 @@
+"""
+Tests for the warm watch pipeline: rebuilds after source edits, and builds
+that fail without stopping the watcher
+"""
+
+import itertools
+import json
+import os
+import pytest
+from PIL import Image
+
+import icon_watch
+from icon_watch import WarmPipeline
+
+MANIFEST = {
+    'source': 'icon.png',
+    'targets': {'test': [
+        {'path': 'out/square.png', 'size': 64, 'transform': 'pyramid'},
+        {'path': 'out/round.png', 'size': 32, 'transform': 'circular'},
+    ]},
+}
+
+
+# Seconds each save moves the mtime on, so saves differ even on coarse filesystems
+SAVE_STEPS = itertools.count(1)
+
+
+def save_source(path, color):
+    Image.new('RGB', (128, 128), color).save(path)
+    stamp = os.stat(path).st_mtime_ns + next(SAVE_STEPS) * 10 ** 9
+    os.utime(path, ns=(stamp, stamp))
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open('manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(MANIFEST, f)
+    save_source('icon.png', (200, 40, 40))
+    return WarmPipeline(['test'], 'manifest.json')
+
+
+def center(path):
+    with Image.open(path) as image:
+        return image.convert('RGB').getpixel((image.width // 2, image.height // 2))
+
+
+def test_rebuilds_changed_source_and_reuses_old_versions(pipeline):
+    assert pipeline.build()['rendered'] == 2
+    save_source('icon.png', (40, 40, 200))
+    stats = pipeline.build()
+    assert (stats['rendered'], stats['written']) == (2, 2)
+    assert center('out/square.png') == (40, 40, 200)
+
+    # Undoing the edit rewrites the first version's bytes without rendering
+    save_source('icon.png', (200, 40, 40))
+    stats = pipeline.build()
+    assert (stats['rendered'], stats['reused'], stats['written']) == (0, 2, 2)
+    assert center('out/square.png') == (200, 40, 40)
+
+
+def test_truncated_source_fails_the_build_only(pipeline, capsys):
+    pipeline.build()
+    data = open('icon.png', 'rb').read()
+    with open('icon.png', 'wb') as f:
+        f.write(data[:len(data) // 2])
+    stamp = os.stat('icon.png').st_mtime_ns + next(SAVE_STEPS) * 10 ** 9
+    os.utime('icon.png', ns=(stamp, stamp))
+
+    assert pipeline.build() is None
+    assert 'Could not decode the source image' in capsys.readouterr().out
+
+    save_source('icon.png', (40, 200, 40))
+    assert pipeline.build()['written'] == 2
+    assert center('out/square.png') == (40, 200, 40)
+
+
+def test_failed_node_is_not_written(pipeline, monkeypatch):
+    encode_node = icon_watch.encode_node
+
+    def failing_encode(sources, size, transform, label=None):
+        if transform == 'circular':
+            raise OSError('disk full')
+        return encode_node(sources, size, transform, label)
+    monkeypatch.setattr(icon_watch, 'encode_node', failing_encode)
+
+    stats = pipeline.build()
+
+    assert (stats['rendered'], stats['written'], stats['failed']) == (2, 1, 1)
+    assert os.path.exists('out/square.png')
+    assert not os.path.exists('out/round.png')
+
+
+def test_manifest_edit_renders_nodes_whose_levels_changed(pipeline):
+    noise = Image.effect_noise((128, 128), 64)
+    Image.merge('RGB', (noise, noise.rotate(90), noise.rotate(180))).save('icon.png')
+    pipeline.build()
+    round_icon = open('out/round.png', 'rb').read()
+
+    # Without the 64 level the 32 is derived straight from the source
+    with open('manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(dict(MANIFEST, targets={'test': MANIFEST['targets']['test'][1:]}), f)
+    stats = pipeline.build()
+
+    assert (stats['rendered'], stats['reused']) == (1, 0)
+    assert open('out/round.png', 'rb').read() != round_icon
@@ -5,30 +5,24 @@ Ensures crisp, clean logos without blur or flow issues
 """
 
 import os
-import shutil
-from PIL import Image, ImageEnhance
-import glob
+import argparse
+from icon_cache import add_cache_arguments, cache_from_args
+from icon_graph import ENHANCED_SIZES, build_targets
+from icon_parallel import add_parallel_arguments, workers_from_args
+from icon_source import add_source_arguments, persist_dir_from_args, shared_source
+import icon_primitives
+from icon_encode import add_encode_arguments, finish_encoding, use_profile
+from icon_enhance import add_enhance_arguments, use_engine
+from icon_output import add_output_arguments, outputs_from_args
+from icon_trace import add_trace_arguments, finish_tracing, tracing_from_args
+from icon_verify import print_result, verify_files
+from icon_sizes import ANDROID_MIPMAP_SIZES, ANDROID_RES_DIR, SOURCE_IMAGE
 
-# Source logo path
-SOURCE_IMAGE = 'assets/images/beautybglow-icon.jpg'
+# Launcher icon sizes for each density (shared with update_app_icons)
+LAUNCHER_SIZES = ANDROID_MIPMAP_SIZES
 
 # Android directories to update
-ANDROID_DIRS = [
-    'android/app/src/main/res/mipmap-mdpi',
-    'android/app/src/main/res/mipmap-hdpi', 
-    'android/app/src/main/res/mipmap-xhdpi',
-    'android/app/src/main/res/mipmap-xxhdpi',
-    'android/app/src/main/res/mipmap-xxxhdpi',
-]
-
-# Launcher icon sizes for each density
-LAUNCHER_SIZES = {
-    'mipmap-mdpi': 48,
-    'mipmap-hdpi': 72,
-    'mipmap-xhdpi': 96,
-    'mipmap-xxhdpi': 144,
-    'mipmap-xxxhdpi': 192,
-}
+ANDROID_DIRS = [f"{ANDROID_RES_DIR}/{folder}" for folder in LAUNCHER_SIZES]
 
 # Files to update in each directory
 LAUNCHER_FILES = [
@@ -37,148 +31,28 @@ LAUNCHER_FILES = [
     'ic_launcher_background.png',
 ]
 
-def enhance_image_quality(image, size):
-    """Enhance image quality for crisp, clean appearance"""
-    # Resize with high-quality algorithm
-    resized = image.resize((size, size), Image.LANCZOS)
-    
-    # Enhance sharpness
-    enhancer = ImageEnhance.Sharpness(resized)
-    enhanced = enhancer.enhance(1.2)  # Slightly increase sharpness
-    
-    # Enhance contrast slightly
-    contrast_enhancer = ImageEnhance.Contrast(enhanced)
-    enhanced = contrast_enhancer.enhance(1.1)
-    
-    return enhanced
-
-def create_clean_icon(source_img, size, is_foreground=True):
-    """Create a clean, crisp icon at the specified size"""
-    if is_foreground:
-        # For foreground, use the source image with enhancements
-        return enhance_image_quality(source_img, size)
-    else:
-        # For background, create a clean white background
-        background = Image.new('RGBA', (size, size), (255, 255, 255, 255))
-        return background
+# Build graph target with the enhanced launcher icons, splash logos and notification icons
+GRAPH_TARGET = 'clean'
 
-def update_launcher_icons():
-    """Update all launcher icons with clean, crisp logos"""
-    print("🔄 Updating Launcher Icons with Clean Quality...")
+def update_clean_icons(cache=None, workers=1, persist_dir=None, executor='thread'):
+    """Update launcher icons, splash logos and notification icons with clean, crisp logos"""
+    print("🔄 Updating Icons with Clean Quality...")
     
     if not os.path.exists(SOURCE_IMAGE):
         print(f"❌ Source image not found: {SOURCE_IMAGE}")
         return False
     
     try:
-        # Load source image with high quality
-        source_img = Image.open(SOURCE_IMAGE).convert('RGBA')
-        print(f"✅ Loaded source image: {SOURCE_IMAGE}")
-        
-        # Update each density directory
+        print(f"✅ Using source image: {SOURCE_IMAGE}")
         for android_dir in ANDROID_DIRS:
             if not os.path.exists(android_dir):
                 print(f"⚠️ Directory not found: {android_dir}")
-                continue
-                
-            density = os.path.basename(android_dir)
-            size = LAUNCHER_SIZES.get(density, 48)
-            
-            print(f"\n📱 Updating {density} ({size}x{size}) with clean quality...")
-            
-            # Update each launcher file
-            for file_name in LAUNCHER_FILES:
-                file_path = os.path.join(android_dir, file_name)
-                
-                if file_name == 'ic_launcher.png':
-                    # Main launcher icon - use enhanced source image
-                    clean_icon = create_clean_icon(source_img, size, is_foreground=True)
-                    clean_icon.save(file_path, format='PNG', optimize=True, quality=95)
-                    print(f"✓ Updated {file_path} ({size}x{size}) with clean quality")
-                    
-                elif file_name == 'ic_launcher_foreground.png':
-                    # Foreground icon - use enhanced source image
-                    clean_icon = create_clean_icon(source_img, size, is_foreground=True)
-                    clean_icon.save(file_path, format='PNG', optimize=True, quality=95)
-                    print(f"✓ Updated {file_path} ({size}x{size}) with clean quality")
-                    
-                elif file_name == 'ic_launcher_background.png':
-                    # Background icon - create clean white background
-                    clean_background = create_clean_icon(source_img, size, is_foreground=False)
-                    clean_background.save(file_path, format='PNG', optimize=True, quality=95)
-                    print(f"✓ Updated {file_path} ({size}x{size}) with clean background")
         
-        return True
+        return build_targets([GRAPH_TARGET], cache=cache, workers=workers, persist_dir=persist_dir,
+                             executor=executor)
         
     except Exception as e:
-        print(f"❌ Error updating launcher icons: {e}")
-        return False
-
-def update_splash_logos():
-    """Update splash screen logos with clean quality"""
-    print("\n🔄 Updating Splash Screen Logos...")
-    
-    if not os.path.exists(SOURCE_IMAGE):
-        print(f"❌ Source image not found: {SOURCE_IMAGE}")
-        return False
-    
-    try:
-        source_img = Image.open(SOURCE_IMAGE).convert('RGBA')
-        
-        # Splash logo sizes for different densities
-        splash_sizes = {
-            'drawable-mdpi': 24,
-            'drawable-hdpi': 36,
-            'drawable-xhdpi': 48,
-            'drawable-xxhdpi': 72,
-            'drawable-xxxhdpi': 96,
-        }
-        
-        for density, size in splash_sizes.items():
-            logo_path = f"android/app/src/main/res/{density}/logo.png"
-            if os.path.exists(os.path.dirname(logo_path)):
-                # Create clean splash logo
-                clean_logo = create_clean_icon(source_img, size, is_foreground=True)
-                clean_logo.save(logo_path, format='PNG', optimize=True, quality=95)
-                print(f"✓ Updated splash logo: {logo_path} ({size}x{size})")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error updating splash logos: {e}")
-        return False
-
-def update_notification_icons():
-    """Update notification icons with clean quality"""
-    print("\n🔄 Updating Notification Icons...")
-    
-    if not os.path.exists(SOURCE_IMAGE):
-        print(f"❌ Source image not found: {SOURCE_IMAGE}")
-        return False
-    
-    try:
-        source_img = Image.open(SOURCE_IMAGE).convert('RGBA')
-        
-        # Notification icon sizes
-        notification_sizes = {
-            'drawable-hdpi': 36,
-            'drawable-xhdpi': 48,
-            'drawable-xxhdpi': 72,
-            'drawable-xxxhdpi': 96,
-        }
-        
-        for density, size in notification_sizes.items():
-            icon_path = f"android/app/src/main/res/{density}/ic_notification.png"
-            if os.path.exists(os.path.dirname(icon_path)):
-                # Create clean notification icon
-                clean_icon = create_clean_icon(source_img, size, is_foreground=True)
-                clean_icon.save(icon_path, format='PNG', optimize=True, quality=95)
-                print(f"✓ Updated notification icon: {icon_path} ({size}x{size})")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error updating notification icons: {e}")
+        print(f"❌ Error updating clean icons: {e}")
         return False
 
 def verify_clean_icons():
@@ -188,23 +62,21 @@ def verify_clean_icons():
     total_files = 0
     updated_files = 0
     
+    # Every launcher file is written at its density size
+    expectations = {}
     for android_dir in ANDROID_DIRS:
         if not os.path.exists(android_dir):
             continue
             
+        size = LAUNCHER_SIZES.get(os.path.basename(android_dir), 48)
         for file_name in LAUNCHER_FILES:
-            file_path = os.path.join(android_dir, file_name)
-            total_files += 1
-            
-            if os.path.exists(file_path):
-                file_size = os.path.getsize(file_path)
-                if file_size > 1000:  # File should be at least 1KB
-                    updated_files += 1
-                    print(f"✅ {file_path} - {file_size} bytes (clean quality)")
-                else:
-                    print(f"❌ {file_path} - File too small ({file_size} bytes)")
-            else:
-                print(f"⚠️ {file_path} - File not found")
+            expectations[os.path.join(android_dir, file_name)] = ({size}, True)
+    
+    # Read only the PNG headers, all files at once
+    for result in verify_files(expectations):
+        total_files += 1
+        if print_result(result):
+            updated_files += 1
     
     print(f"\n📊 Clean Icon Update Summary:")
     print(f"   Total files: {total_files}")
@@ -213,8 +85,21 @@ def verify_clean_icons():
     
     return updated_files == total_files
 
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Update BeautyGlow icons with clean quality")
+    add_parallel_arguments(parser, jobs=1)
+    add_cache_arguments(parser)
+    add_source_arguments(parser)
+    add_encode_arguments(parser)
+    add_output_arguments(parser)
+    add_enhance_arguments(parser)
+    add_trace_arguments(parser)
+    return parser.parse_args()
+
 def main():
     """Main function to update all icons with clean quality"""
+    args = parse_args()
     print("🎨 BeautyGlow Clean Icon Update Script")
     print("=" * 50)
     
@@ -225,22 +110,28 @@ def main():
         return
     
     try:
-        # Step 1: Update launcher icons with clean quality
-        if not update_launcher_icons():
-            print("❌ Failed to update launcher icons")
+        use_profile(args.profile)
+        use_engine(args.enhance_engine)
+        tracing_from_args(args)
+        outputs = outputs_from_args(args)
+        cache = cache_from_args(args)
+        shared_source(SOURCE_IMAGE, persist_dir=persist_dir_from_args(args), max_size=max(ENHANCED_SIZES))
+        
+        # Launcher icons, splash logos and notification icons, each unique render once
+        if not update_clean_icons(cache, workers_from_args(args), persist_dir_from_args(args),
+                                  args.executor):
+            print("❌ Failed to update clean icons")
             return
         
-        # Step 2: Update splash screen logos
-        if not update_splash_logos():
-            print("❌ Failed to update splash logos")
-            return
-        
-        # Step 3: Update notification icons
-        if not update_notification_icons():
-            print("❌ Failed to update notification icons")
-            return
+        if cache is not None:
+            cache.save()
+            cache.print_summary()
+        outputs.print_summary()
+        icon_primitives.print_summary()
+        finish_encoding(args)
+        finish_tracing(args)
         
-        # Step 4: Verify updates
+        # Verify updates
         if verify_clean_icons():
             print("\n✅ All icons updated with clean quality successfully!")
         else:
@@ -12,10 +12,11 @@ if errorlevel 1 (
     exit /b 1
 )
 
-REM Check if requirements are installed
-echo 📦 Checking dependencies...
-pip show Pillow >nul 2>&1
-if errorlevel 1 (
+echo 🚀 Running icon update script...
+python beautyglow_assets.py icons
+
+REM Exit status 3: Pillow is missing (checked by the command itself)
+if errorlevel 3 if not errorlevel 4 (
     echo 📥 Installing required dependencies...
     pip install -r requirements.txt
     if errorlevel 1 (
@@ -23,11 +24,9 @@ if errorlevel 1 (
         pause
         exit /b 1
     )
+    python beautyglow_assets.py icons
 )
 
-echo 🚀 Running icon update script...
-python update_app_icons.py
-
 if errorlevel 1 (
     echo ❌ Script failed with errors
     pause
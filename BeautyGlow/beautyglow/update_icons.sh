@@ -11,21 +11,23 @@ if ! command -v python3 &> /dev/null; then
     exit 1
 fi
 
-# Check if requirements are installed
-echo "📦 Checking dependencies..."
-if ! python3 -c "import PIL" &> /dev/null; then
+echo "🚀 Running icon update script..."
+python3 beautyglow_assets.py icons
+status=$?
+
+# Exit status 3: Pillow is missing (checked by the command itself, no extra python run)
+if [ $status -eq 3 ]; then
     echo "📥 Installing required dependencies..."
     pip3 install -r requirements.txt
     if [ $? -ne 0 ]; then
         echo "❌ Failed to install dependencies"
         exit 1
     fi
+    python3 beautyglow_assets.py icons
+    status=$?
 fi
 
-echo "🚀 Running icon update script..."
-python3 update_app_icons.py
-
-if [ $? -ne 0 ]; then
+if [ $status -ne 0 ]; then
     echo "❌ Script failed with errors"
     exit 1
 fi
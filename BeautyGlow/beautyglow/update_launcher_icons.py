@@ -5,30 +5,25 @@ Specifically updates all ic_launcher files with the new logo
 """
 
 import os
-import shutil
-from PIL import Image
+import argparse
 import glob
+from icon_cache import add_cache_arguments, cache_from_args
+from icon_graph import build_targets
+from icon_parallel import add_parallel_arguments, default_workers, workers_from_args
+from icon_source import add_source_arguments, persist_dir_from_args, shared_source
+import icon_primitives
+from icon_encode import add_encode_arguments, finish_encoding, use_profile
+from icon_output import add_output_arguments, outputs_from_args
+from icon_snapshot import DEFAULT_STORE_DIR, snapshot_files
+from icon_trace import add_trace_arguments, finish_tracing, tracing_from_args
+from icon_verify import print_result, verify_files
+from icon_sizes import ADAPTIVE_ICON_SIZE, ANDROID_MIPMAP_SIZES, ANDROID_RES_DIR, SOURCE_IMAGE
 
-# Source logo path
-SOURCE_IMAGE = 'assets/images/beautybglow-icon.jpg'
+# Launcher icon sizes for each density (shared with update_app_icons)
+LAUNCHER_SIZES = ANDROID_MIPMAP_SIZES
 
 # Android directories to update
-ANDROID_DIRS = [
-    'android/app/src/main/res/mipmap-mdpi',
-    'android/app/src/main/res/mipmap-hdpi', 
-    'android/app/src/main/res/mipmap-xhdpi',
-    'android/app/src/main/res/mipmap-xxhdpi',
-    'android/app/src/main/res/mipmap-xxxhdpi',
-]
-
-# Launcher icon sizes for each density
-LAUNCHER_SIZES = {
-    'mipmap-mdpi': 48,
-    'mipmap-hdpi': 72,
-    'mipmap-xhdpi': 96,
-    'mipmap-xxhdpi': 144,
-    'mipmap-xxxhdpi': 192,
-}
+ANDROID_DIRS = [f"{ANDROID_RES_DIR}/{folder}" for folder in LAUNCHER_SIZES]
 
 # Files to update in each directory
 LAUNCHER_FILES = [
@@ -37,118 +32,47 @@ LAUNCHER_FILES = [
     'ic_launcher_background.png',
 ]
 
+# Build graph target with the launcher icons and 108px adaptive layers
+GRAPH_TARGET = 'launcher'
+
 def backup_original_files():
-    """Create backup of original files before updating"""
+    """Snapshot the current launcher files before updating
+
+    Each distinct file is stored once in the snapshot store, so unchanged
+    icons cost no copy; restore with `icon_snapshot.py restore latest`.
+    """
     print("📦 Creating backup of original files...")
     
-    backup_dir = "backup_original_icons"
-    if not os.path.exists(backup_dir):
-        os.makedirs(backup_dir)
-    
-    for android_dir in ANDROID_DIRS:
-        if os.path.exists(android_dir):
-            # Create backup subdirectory
-            backup_subdir = os.path.join(backup_dir, os.path.basename(android_dir))
-            if not os.path.exists(backup_subdir):
-                os.makedirs(backup_subdir)
-            
-            # Backup all launcher files
-            for file_name in LAUNCHER_FILES:
-                original_path = os.path.join(android_dir, file_name)
-                backup_path = os.path.join(backup_subdir, file_name)
-                
-                if os.path.exists(original_path):
-                    shutil.copy2(original_path, backup_path)
-                    print(f"✓ Backed up {original_path} -> {backup_path}")
+    paths = [os.path.join(android_dir, file_name)
+             for android_dir in ANDROID_DIRS for file_name in LAUNCHER_FILES]
+    return snapshot_files(paths, label=GRAPH_TARGET)
 
-def update_launcher_icons():
-    """Update all launcher icons with the new logo"""
-    print("\n🔄 Updating Launcher Icons...")
+def update_launcher_icons(cache=None, workers=None, executor='thread'):
+    """Update all launcher icons and adaptive layers with the new logo
+    
+    The adaptive foreground and background are part of the same build graph,
+    so every file is written once at its final size instead of being written
+    at the density size and then overwritten at 108px.
+    """
+    print("\n🔄 Updating Launcher and Adaptive Icons...")
     
     if not os.path.exists(SOURCE_IMAGE):
         print(f"❌ Source image not found: {SOURCE_IMAGE}")
         return False
     
     try:
-        # Load source image
-        source_img = Image.open(SOURCE_IMAGE).convert('RGBA')
-        print(f"✅ Loaded source image: {SOURCE_IMAGE}")
-        
-        # Update each density directory
+        print(f"✅ Using source image: {SOURCE_IMAGE}")
         for android_dir in ANDROID_DIRS:
             if not os.path.exists(android_dir):
                 print(f"⚠️ Directory not found: {android_dir}")
-                continue
-                
-            density = os.path.basename(android_dir)
-            size = LAUNCHER_SIZES.get(density, 48)
-            
-            print(f"\n📱 Updating {density} ({size}x{size})...")
-            
-            # Update each launcher file
-            for file_name in LAUNCHER_FILES:
-                file_path = os.path.join(android_dir, file_name)
-                
-                if file_name == 'ic_launcher.png':
-                    # Main launcher icon - use the source image directly
-                    resized = source_img.resize((size, size), Image.LANCZOS)
-                    resized.save(file_path, format='PNG', optimize=True)
-                    print(f"✓ Updated {file_path} ({size}x{size})")
-                    
-                elif file_name == 'ic_launcher_foreground.png':
-                    # Foreground icon - use source image with transparency
-                    resized = source_img.resize((size, size), Image.LANCZOS)
-                    resized.save(file_path, format='PNG', optimize=True)
-                    print(f"✓ Updated {file_path} ({size}x{size})")
-                    
-                elif file_name == 'ic_launcher_background.png':
-                    # Background icon - create solid background
-                    background = Image.new('RGBA', (size, size), (255, 255, 255, 255))
-                    background.save(file_path, format='PNG', optimize=True)
-                    print(f"✓ Updated {file_path} ({size}x{size})")
         
-        return True
+        return build_targets([GRAPH_TARGET], cache=cache, workers=workers or default_workers(),
+                             executor=executor)
         
     except Exception as e:
         print(f"❌ Error updating launcher icons: {e}")
         return False
 
-def update_adaptive_icons():
-    """Update adaptive icon components"""
-    print("\n🔄 Updating Adaptive Icons...")
-    
-    if not os.path.exists(SOURCE_IMAGE):
-        print(f"❌ Source image not found: {SOURCE_IMAGE}")
-        return False
-    
-    try:
-        source_img = Image.open(SOURCE_IMAGE).convert('RGBA')
-        
-        # Adaptive icon foreground size (108dp)
-        foreground_size = 108
-        
-        for android_dir in ANDROID_DIRS:
-            if not os.path.exists(android_dir):
-                continue
-                
-            # Update foreground
-            foreground_path = os.path.join(android_dir, 'ic_launcher_foreground.png')
-            foreground = source_img.resize((foreground_size, foreground_size), Image.LANCZOS)
-            foreground.save(foreground_path, format='PNG', optimize=True)
-            print(f"✓ Updated adaptive foreground: {foreground_path}")
-            
-            # Update background
-            background_path = os.path.join(android_dir, 'ic_launcher_background.png')
-            background = Image.new('RGBA', (foreground_size, foreground_size), (255, 255, 255, 255))
-            background.save(background_path, format='PNG', optimize=True)
-            print(f"✓ Updated adaptive background: {background_path}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error updating adaptive icons: {e}")
-        return False
-
 def verify_updates():
     """Verify that all launcher icons have been updated"""
     print("\n🔍 Verifying Updates...")
@@ -156,24 +80,22 @@ def verify_updates():
     total_files = 0
     updated_files = 0
     
+    # ic_launcher is density-sized; the adaptive layers are rewritten at 108px
+    expectations = {}
     for android_dir in ANDROID_DIRS:
         if not os.path.exists(android_dir):
             continue
             
+        size = LAUNCHER_SIZES.get(os.path.basename(android_dir), 48)
         for file_name in LAUNCHER_FILES:
-            file_path = os.path.join(android_dir, file_name)
-            total_files += 1
-            
-            if os.path.exists(file_path):
-                # Check file size to ensure it's not empty
-                file_size = os.path.getsize(file_path)
-                if file_size > 1000:  # File should be at least 1KB
-                    updated_files += 1
-                    print(f"✅ {file_path} - {file_size} bytes")
-                else:
-                    print(f"❌ {file_path} - File too small ({file_size} bytes)")
-            else:
-                print(f"⚠️ {file_path} - File not found")
+            expected = size if file_name == 'ic_launcher.png' else ADAPTIVE_ICON_SIZE
+            expectations[os.path.join(android_dir, file_name)] = ({expected}, True)
+    
+    # Read only the PNG headers, all files at once
+    for result in verify_files(expectations):
+        total_files += 1
+        if print_result(result):
+            updated_files += 1
     
     print(f"\n📊 Update Summary:")
     print(f"   Total files: {total_files}")
@@ -202,8 +124,20 @@ def clean_old_icons():
             except Exception as e:
                 print(f"⚠️ Could not remove {old_file}: {e}")
 
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Update BeautyGlow launcher icons")
+    add_parallel_arguments(parser)
+    add_cache_arguments(parser)
+    add_source_arguments(parser)
+    add_encode_arguments(parser)
+    add_output_arguments(parser)
+    add_trace_arguments(parser)
+    return parser.parse_args()
+
 def main():
     """Main function to update all launcher icons"""
+    args = parse_args()
     print("🎨 BeautyGlow Launcher Icon Update Script")
     print("=" * 50)
     
@@ -214,23 +148,34 @@ def main():
         return
     
     try:
+        tracing_from_args(args)
+        outputs = outputs_from_args(args)
+        
         # Step 1: Backup original files
         backup_original_files()
         
         # Step 2: Clean old icons
         clean_old_icons()
         
-        # Step 3: Update launcher icons
-        if not update_launcher_icons():
+        use_profile(args.profile)
+        cache = cache_from_args(args)
+        shared_source(SOURCE_IMAGE, persist_dir=persist_dir_from_args(args),
+                      max_size=max(max(LAUNCHER_SIZES.values()), ADAPTIVE_ICON_SIZE))
+        
+        # Step 3: Update launcher icons and adaptive layers, each file once
+        if not update_launcher_icons(cache, workers_from_args(args), args.executor):
             print("❌ Failed to update launcher icons")
             return
         
-        # Step 4: Update adaptive icons
-        if not update_adaptive_icons():
-            print("❌ Failed to update adaptive icons")
-            return
+        if cache is not None:
+            cache.save()
+            cache.print_summary()
+        outputs.print_summary()
+        icon_primitives.print_summary()
+        finish_encoding(args)
+        finish_tracing(args)
         
-        # Step 5: Verify updates
+        # Step 4: Verify updates
         if verify_updates():
             print("\n✅ All launcher icons updated successfully!")
         else:
@@ -239,7 +184,7 @@ def main():
         print("\n📋 Summary of updates:")
         print("   • Android launcher icons (all densities)")
         print("   • Adaptive icon foreground and background")
-        print("   • Backup created in 'backup_original_icons' folder")
+        print(f"   • Backup snapshot in '{DEFAULT_STORE_DIR}' (icon_snapshot.py restore latest)")
         
         print("\n💡 Next steps:")
         print("   1. Clean and rebuild your Flutter project")